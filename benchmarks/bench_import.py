@@ -0,0 +1,27 @@
+"""
+Import time of the package in a fresh interpreter: python benchmarks/bench_import.py
+"""
+import os
+import subprocess
+import sys
+import time
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # imported from the checkout, no need to install
+
+
+def bench(name: str, code: str, repeat: int = 10) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        t = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], check=True, cwd=ROOT)
+        best = min(best, time.perf_counter() - t)
+    return best
+
+
+if __name__ == '__main__':
+    base = bench('interpreter', 'pass')
+    for name, code in (('import pytoniq_core', 'import pytoniq_core'),
+                       ('Cell + Address', 'from pytoniq_core import Cell, Address'),
+                       ('everything', 'import pytoniq_core.tlb, pytoniq_core.tl, pytoniq_core.proof, pytoniq_core.crypto.ciphers')):
+        print(f'{name:<20} {(bench(name, code) - base) * 1000:8.1f} ms')
@@ -0,0 +1,27 @@
+"""
+Wallets created and derived per second, one by one vs batch APIs: python benchmarks/bench_mnemonic.py [count]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # repo root, no need to install the package
+
+from pytoniq_core.crypto.keys import mnemonic_new, mnemonic_to_wallet_key, mnemonic_new_many, \
+    mnemonic_to_wallet_key_many
+
+
+def bench(name: str, func, count: int):
+    t = time.perf_counter()
+    result = func(count)
+    elapsed = time.perf_counter() - t
+    print(f'{name:<28} {count / elapsed:8.1f} wallets/s')
+    return result
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    mnemonics = bench('mnemonic_new', lambda n: [mnemonic_new() for _ in range(n)], count)
+    bench('mnemonic_new_many', mnemonic_new_many, count)
+    bench('mnemonic_to_wallet_key', lambda n: [mnemonic_to_wallet_key(i) for i in mnemonics[:n]], count)
+    bench('mnemonic_to_wallet_key_many', lambda n: mnemonic_to_wallet_key_many(mnemonics[:n]), count)
@@ -0,0 +1,50 @@
+"""
+ed25519 verification throughput, per-call VerifyKey vs cached keys vs verify_many: python benchmarks/bench_verify.py
+"""
+import os
+import sys
+import time
+
+from nacl.signing import VerifyKey, exc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # repo root, no need to install the package
+
+from pytoniq_core.crypto.signature import Signer, verify_sign, verify_many
+
+
+def items(count: int = 5000, keys: int = 100):
+    signers = [Signer(i.to_bytes(32, 'big')) for i in range(keys)]  # e.g. validator set
+    result = []
+    for i in range(count):
+        signer = signers[i % keys]
+        message = i.to_bytes(36, 'big')
+        result.append((signer.public_key, message, signer.sign(message)))
+    return result
+
+
+def verify_uncached(public_key: bytes, signed_message: bytes, signature: bytes):
+    # verify_sign before the key cache
+    key = VerifyKey(public_key)
+    try:
+        key.verify(signed_message, signature)
+        return True
+    except exc.BadSignatureError:
+        return False
+
+
+def bench(name: str, func, data, repeat: int = 3):
+    best = float('inf')
+    for _ in range(repeat):
+        t = time.perf_counter()
+        func(data)
+        best = min(best, time.perf_counter() - t)
+    print(f'{name:<16} {len(data) / best:10.0f} signatures/s')
+    return best
+
+
+if __name__ == '__main__':
+    data = items()
+    base = bench('per call', lambda d: [verify_uncached(*i) for i in d], data)
+    bench('cached key', lambda d: [verify_sign(*i) for i in d], data)
+    best = bench('verify_many', verify_many, data)
+    print(f'verify_many speedup x{base / best:.2f}')
@@ -0,0 +1,45 @@
+"""
+VmStack codec on get-method sized results: python benchmarks/bench_vm_stack.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # repo root, no need to install the package
+
+from pytoniq_core.tlb.vm_stack import VmStack, VmTuple
+
+
+def deep_stack():
+    return [VmTuple([i, i * 2 ** 70, None]) for i in range(255)]  # max stack depth of get-method result
+
+
+def wide_tuples():
+    return [VmTuple([VmTuple([VmTuple(list(range(j * 40 + k * 8, j * 40 + k * 8 + 8))) for k in range(5)])
+                     for j in range(250)])]  # 10k ints in tuples nested 3 levels
+
+
+def lisp_list():
+    result = VmTuple([0])
+    for i in range(1, 1000):  # ~ max cell depth
+        result = VmTuple([i, result])
+    return [result]
+
+
+def bench(name: str, make_stack, repeat: int = 5):
+    ser = des = float('inf')
+    for _ in range(repeat):
+        stack = make_stack()
+        t = time.perf_counter()
+        cell = VmStack.serialize(stack)
+        ser = min(ser, time.perf_counter() - t)
+        t = time.perf_counter()
+        VmStack.deserialize(cell.begin_parse())
+        des = min(des, time.perf_counter() - t)
+    print(f'{name:<12} serialize {ser * 1000:8.2f} ms   deserialize {des * 1000:8.2f} ms')
+
+
+if __name__ == '__main__':
+    bench('deep_stack', deep_stack)
+    bench('wide_tuples', wide_tuples)
+    bench('lisp_list', lisp_list)
@@ -0,0 +1,305 @@
+"""
+Offline benchmark suite over bundled fixtures (benchmarks/fixtures), reports ops/s and bytes/s of hot paths
+and compares them with a saved baseline:
+    python benchmarks/suite.py --save     # run and store results as the baseline (benchmarks/baseline.json)
+    python benchmarks/suite.py            # run and flag cases slower than the baseline by more than --threshold
+    python benchmarks/suite.py -k boc -k tlb.Block  # run only cases containing any of the substrings
+Exit code is 1 if any case regressed, so the suite can guard performance work.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import timeit
+import typing
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # repo root, no need to install the package
+
+from pytoniq_core.boc import Address, Builder, Cell, CellTypes, HashMap
+from pytoniq_core.boc.deserialize import Boc
+from pytoniq_core.proof import check_account_proof
+from pytoniq_core.proof.merkle_update import prune
+from pytoniq_core.tl import BlockIdExt, TlGenerator
+from pytoniq_core.tlb import Account, Block, ShardStateUnsplit, Transaction, VmStack
+
+import synthetic
+
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+
+class Case(typing.NamedTuple):
+    name: str
+    setup: typing.Callable[[], typing.Tuple[typing.Callable[[], typing.Any], int]]  # -> (one operation, its bytes)
+
+
+def fixture(name: str) -> bytes:
+    with open(os.path.join(FIXTURES, name), 'rb') as f:
+        return f.read()
+
+
+def merkle_proof(cell: Cell) -> Cell:
+    return Builder(type_=CellTypes.merkle_proof).store_uint(CellTypes.merkle_proof, 8) \
+        .store_bytes(cell.get_hash(0)).store_uint(cell.get_depth(0), 16).store_ref(cell).end_cell()
+
+
+def prune_except(root: Cell, keep: typing.Callable[[Cell], bool]) -> Cell:
+    """
+    :return: root with every subtree without kept cells replaced by a pruned branch, like in a liteserver proof
+    """
+    on_path = {}
+
+    def visit(cell: Cell) -> bool:
+        if cell.hash not in on_path:
+            on_path[cell.hash] = any([visit(r) for r in cell.refs]) or keep(cell)
+        return on_path[cell.hash]
+
+    def build(cell: Cell) -> Cell:
+        if not on_path[cell.hash]:
+            return prune(cell)
+        return Cell(cell.bits, [build(r) for r in cell.refs], cell.type_)
+
+    visit(root)
+    return build(root)
+
+
+def multi_root_boc(roots: typing.List[Cell]) -> bytes:
+    """
+    Cell.to_boc() writes one root, liteserver proofs have several.
+    """
+    indexed = {}
+    for root in roots:
+        root.order(indexed)
+    indexes = {j: i for i, j in enumerate(indexed)}
+    size = (len(indexes).bit_length() + 7) // 8
+    payload = b''.join(cell.serialize(indexes, size) for cell in indexes)
+    offset_size = (len(payload).bit_length() + 7) // 8
+    return b'\xb5\xee\x9cr' + bytes([size, offset_size]) + len(indexes).to_bytes(size, 'big') + \
+        len(roots).to_bytes(size, 'big') + bytes(size) + len(payload).to_bytes(offset_size, 'big') + \
+        b''.join(indexes[root].to_bytes(size, 'big') for root in roots) + payload
+
+
+def account_proof(account_cell: Cell, accounts: int = 10000) -> typing.Tuple[bytes, BlockIdExt, Address]:
+    """
+    There is no real account state proof among the fixtures, so a liteserver-like one is built:
+    synthetic shard state with the account and `accounts` others, pruned except for the path to the account,
+    and a block header proof with MERKLE_UPDATE to this state.
+    """
+    address = Account.deserialize(account_cell.begin_parse()).addr
+    state = synthetic.shard_state(accounts, known=[account_cell])
+    leaf = Builder().store_uint(0, 64).end_cell()  # stands for the previous state
+    update = Builder(type_=CellTypes.merkle_update).store_uint(CellTypes.merkle_update, 8) \
+        .store_bytes(leaf.hash).store_bytes(state.hash).store_uint(0, 16).store_uint(state.get_depth(0), 16) \
+        .store_ref(prune(leaf)).store_ref(prune(state)).end_cell()
+    # only state_update is left in block header proofs
+    header = Builder().store_uint(0x11ef55aa, 32).store_int(-239, 32) \
+        .store_ref(prune(Builder().store_uint(1, 32).end_cell())) \
+        .store_ref(prune(Builder().store_uint(2, 32).end_cell())) \
+        .store_ref(update) \
+        .store_ref(prune(Builder().store_uint(3, 32).end_cell())).end_cell()
+
+    # lookup visits the ShardAccount leaf, but not the account itself
+    state_proof = prune_except(state, lambda c: any(r.hash == account_cell.hash for r in c.refs))
+    proof = multi_root_boc([merkle_proof(header), merkle_proof(state_proof)])
+    return proof, BlockIdExt(0, 2 ** 63, 1, header.get_hash(0), bytes(32)), address
+
+
+def boc_cases() -> typing.List[Case]:
+    block = fixture('block.boc')
+    root = Cell.one_from_boc(block)
+    return [
+        Case('boc.Boc.deserialize', lambda: (lambda: Boc(block).deserialize(), len(block))),
+        Case('boc.Cell.to_boc', lambda: (root.to_boc, len(block))),
+    ]
+
+
+def slice_cases() -> typing.List[Case]:
+    def load(cell: Cell, method: str, count: int, *args):
+        def op():
+            cs = cell.begin_parse()
+            for _ in range(count):
+                getattr(cs, method)(*args)
+        return op, len(cell.data)
+
+    address = Address('EQBvW8Z5huBkMJYdnfAEM5JqTNkuWX3diqYENkWsIL0XggGG')
+    uints = Builder().store_bits('1' * 960).end_cell()
+    coins = Builder()
+    for i in range(7):
+        coins.store_coins(10 ** 9 * i + 1)
+    addresses = Builder().store_address(address).store_address(address).store_address(address).end_cell()
+    return [
+        Case('slice.load_uint', lambda: load(uints, 'load_uint', 15, 64)),
+        Case('slice.load_bytes', lambda: load(uints, 'load_bytes', 3, 40)),
+        Case('slice.load_coins', lambda: load(coins.end_cell(), 'load_coins', 7)),
+        Case('slice.load_address', lambda: load(addresses, 'load_address', 3)),
+    ]
+
+
+def builder_cases() -> typing.List[Case]:
+    def store(method: str, count: int, size: int, *args):
+        def op():
+            builder = Builder()
+            for _ in range(count):
+                getattr(builder, method)(*args)
+        return op, size
+
+    def end_cell():
+        builder = Builder().store_bytes(bytes(range(127))).store_ref(Cell.empty())
+        return builder.end_cell, 127
+
+    address = Address('EQBvW8Z5huBkMJYdnfAEM5JqTNkuWX3diqYENkWsIL0XggGG')
+    return [
+        Case('builder.store_uint', lambda: store('store_uint', 15, 120, 2 ** 63 + 1, 64)),
+        Case('builder.store_bytes', lambda: store('store_bytes', 3, 120, bytes(range(40)))),
+        Case('builder.store_coins', lambda: store('store_coins', 7, 119, 10 ** 9 * 7 + 1)),
+        Case('builder.store_address', lambda: store('store_address', 3, 100, address)),
+        Case('builder.end_cell', end_cell),
+    ]
+
+
+def hashmap_cases(keys: int = 1000) -> typing.List[Case]:
+    def make():
+        hashmap = HashMap(256, value_serializer=lambda src, dest: dest.store_uint(src, 32))
+        for i in range(keys):
+            hashmap.set_int_key(int.from_bytes(hashlib.sha256(i.to_bytes(4, 'big')).digest(), 'big'), i)
+        return hashmap
+
+    def serialize():
+        hashmap = make()
+        return hashmap.serialize, len(hashmap.serialize().to_boc())
+
+    def parse():
+        root = make().serialize()
+        return lambda: HashMap.parse(root.begin_parse(), 256), len(root.to_boc())
+
+    return [
+        Case('hashmap.HashMap.serialize', serialize),
+        Case('hashmap.HashMap.parse', parse),
+    ]
+
+
+def tl_cases() -> typing.List[Case]:
+    def make():
+        schemas = TlGenerator.with_default_schemas().generate()
+        packet = fixture('adnl_packet.bin')
+        return schemas, packet, schemas.deserialize(packet)[0]
+
+    def serialize():
+        schemas, packet, data = make()
+        schema = schemas.get_by_name(data['@type'])
+        return lambda: schemas.serialize(schema, data), len(packet)
+
+    def deserialize():
+        schemas, packet, _ = make()
+        return lambda: schemas.deserialize(packet), len(packet)
+
+    return [
+        Case('tl.TlSchemas.serialize', serialize),
+        Case('tl.TlSchemas.deserialize', deserialize),
+    ]
+
+
+def tlb_cases() -> typing.List[Case]:
+    def deserialize(scheme, name: str):
+        data = fixture(name)
+        cell = Cell.one_from_boc(data)
+        return lambda: scheme.deserialize(cell.begin_parse()), len(data)
+
+    return [
+        Case('tlb.Transaction.deserialize', lambda: deserialize(Transaction, 'transaction.boc')),
+        Case('tlb.Block.deserialize', lambda: deserialize(Block, 'block.boc')),
+        Case('tlb.Account.deserialize', lambda: deserialize(Account, 'account.boc')),
+    ]
+
+
+def proof_cases() -> typing.List[Case]:
+    def check():
+        account = Cell.one_from_boc(fixture('account.boc'))
+        proof, block, address = account_proof(account)
+        return lambda: check_account_proof(proof, block, address, account), len(proof)
+
+    return [
+        Case('proof.check_account_proof', check),
+    ]
+
+
+def synthetic_cases() -> typing.List[Case]:
+    def deserialize(scheme, make):
+        data = make().to_boc()
+        cell = Cell.one_from_boc(data)
+        return lambda: scheme.deserialize(cell.begin_parse()), len(data)
+
+    return [
+        Case('synthetic.ShardStateUnsplit.deserialize', lambda: deserialize(ShardStateUnsplit, lambda: synthetic.shard_state(2000))),
+        Case('synthetic.Block.deserialize', lambda: deserialize(Block, lambda: synthetic.block(500))),
+        Case('synthetic.VmStack.deserialize', lambda: deserialize(VmStack, synthetic.vm_stack)),
+    ]
+
+
+def all_cases() -> typing.List[Case]:
+    return boc_cases() + slice_cases() + builder_cases() + hashmap_cases() + tl_cases() + tlb_cases() + \
+        proof_cases() + synthetic_cases()
+
+
+def measure(func: typing.Callable, repeat: int = 5) -> float:
+    """
+    :return: best ops/s of repeat runs, each run lasting at least 0.2 s
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return number / min(timer.repeat(repeat, number))
+
+
+def run(cases: typing.List[Case], baseline: dict, threshold: float, repeat: int = 5) -> typing.Tuple[dict, list]:
+    """
+    :return: ({case name: ops/s}, [names of cases slower than baseline by more than threshold])
+    """
+    results = {}
+    regressions = []
+    print(f'{"case":<40} {"ops/s":>12} {"MB/s":>9} {"baseline":>12} {"change":>8}')
+    for case in cases:
+        func, size = case.setup()
+        ops = results[case.name] = measure(func, repeat)
+        line = f'{case.name:<40} {ops:12.1f} {ops * size / 1e6:9.2f}'
+        base = baseline.get(case.name)
+        if base:
+            change = ops / base - 1
+            line += f' {base:12.1f} {change:+8.1%}'
+            if change < -threshold:
+                regressions.append(case.name)
+                line += '  REGRESSION'
+        print(line, flush=True)
+    return results, regressions
+
+
+def main(argv: typing.Optional[typing.List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='pytoniq-core benchmark suite')
+    parser.add_argument('-k', action='append', default=[], help='run only cases with the substring in name')
+    parser.add_argument('--baseline', default=BASELINE, help='baseline file')
+    parser.add_argument('--save', action='store_true', help='store results to the baseline file')
+    parser.add_argument('--threshold', type=float, default=0.2, help='relative slowdown reported as regression')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    cases = [i for i in all_cases() if not args.k or any(k in i.name for k in args.k)]
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    results, regressions = run(cases, {} if args.save else baseline, args.threshold, args.repeat)
+
+    if args.save:
+        baseline.update(results)
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f'baseline saved to {args.baseline}')
+    if regressions:
+        print(f'{len(regressions)} regressions: {", ".join(regressions)}')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
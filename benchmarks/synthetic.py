@@ -0,0 +1,268 @@
+"""
+Deterministic synthetic fixtures at configurable scale: shard states, blocks and VmStack results,
+built with the library's own Builder, HashMap, HashMapAug and TL-B classes (same arguments give the same cells):
+    python benchmarks/synthetic.py --accounts 100000 --transactions 5000 --stack-depth 255 -o /tmp/fixtures
+writes shard_state.boc, block.boc and vm_stack.boc to the directory and checks they are decoded by the TL-B schemes.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import typing
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # repo root, no need to install the package
+
+from pytoniq_core.boc import Address, Builder, Cell, CellTypes, HashMapAug
+from pytoniq_core.proof.merkle_update import prune
+from pytoniq_core.tlb import Account, Block, CurrencyCollection, ExternalMsgInfo, MessageAny, ShardAccount, \
+    ShardStateUnsplit, StateInit, StorageInfo, VmStack, VmTuple
+from pytoniq_core.tlb.account import AccountState, AccountStorage, StorageExtraInfo, StorageUsed
+from pytoniq_core.tlb.block import DepthBalanceInfo
+from pytoniq_core.tlb.transaction import ImportFees
+
+
+GLOBAL_ID = -239
+GEN_UTIME = 1700000000
+
+
+def _cell_from(rng: random.Random, bits: int, refs: typing.Sequence[Cell] = ()) -> Cell:
+    builder = Builder().store_uint(rng.getrandbits(bits), bits)
+    for ref in refs:
+        builder.store_ref(ref)
+    return builder.end_cell()
+
+
+def wallet_code(seed: int = 0) -> Cell:
+    """
+    :return: contract code shared by all accounts, 4 cells about wallet v4 size
+    """
+    rng = random.Random(seed)
+    return _cell_from(rng, 1000, [_cell_from(rng, 1016, [_cell_from(rng, 800)]), _cell_from(rng, 600)])
+
+
+def currency_sum(a: CurrencyCollection, b: CurrencyCollection) -> CurrencyCollection:
+    return CurrencyCollection(a.grams + b.grams)
+
+
+def account(address: Address, balance: int, last_trans_lt: int, code: Cell, rng: random.Random) -> Account:
+    data = Builder().store_uint(rng.getrandbits(32), 32).store_uint(698983191, 32) \
+        .store_bytes(rng.getrandbits(256).to_bytes(32, 'big')).store_bit(0).end_cell()
+    storage = AccountStorage(last_trans_lt, CurrencyCollection(balance),
+                             AccountState('account_active', state_init=StateInit(code=code, data=data)))
+    return Account(address, StorageInfo(StorageUsed(5, 4000), StorageExtraInfo('storage_extra_none'), GEN_UTIME, None),
+                   storage)
+
+
+def shard_accounts(accounts: int, workchain: int = 0, seed: int = 0,
+                   known: typing.Iterable[Cell] = ()) -> typing.Tuple[HashMapAug, typing.List[int]]:
+    """
+    ShardAccounts dictionary of wallet-like accounts.
+    :param known: Account cells to put into the dictionary at their own addresses
+    :return: dictionary (serialize_e() to get the cell) and account ids
+    """
+    rng = random.Random(seed)
+    code = wallet_code(seed)
+    result = HashMapAug(256, value_serializer=lambda src, dest: dest.store_cell(src.serialize()),
+                        extra_serializer=lambda src, dest: dest.store_cell(src.serialize()),
+                        aggregate=lambda a, b: DepthBalanceInfo(0, currency_sum(a.balance, b.balance)))
+    ids = []
+    for _ in range(accounts):
+        account_id = rng.getrandbits(256)
+        balance = rng.getrandbits(40)
+        lt = rng.getrandbits(44)
+        acc = account(Address((workchain, account_id.to_bytes(32, 'big'))), balance, lt, code, rng)
+        result.set(account_id, ShardAccount(acc, rng.getrandbits(256).to_bytes(32, 'big'), lt),
+                   DepthBalanceInfo(0, CurrencyCollection(balance)))
+        ids.append(account_id)
+    for cell in known:
+        acc = Account.deserialize(cell.begin_parse())
+        account_id = int.from_bytes(acc.addr.hash_part, 'big')
+        result.set(account_id, _RawShardAccount(cell), DepthBalanceInfo(0, acc.storage.balance))
+        ids.append(account_id)
+    return result, ids
+
+
+class _RawShardAccount:
+    """
+    ShardAccount of an existing Account cell, serialize() keeps the cell as is.
+    """
+
+    def __init__(self, account_cell: Cell):
+        self.account_cell = account_cell
+
+    def serialize(self) -> Cell:
+        return Builder().store_ref(self.account_cell).store_bytes(bytes(32)).store_uint(0, 64).end_cell()
+
+
+def shard_state(accounts: int = 1000, workchain: int = 0, seed: int = 0, seqno: int = 1,
+                known: typing.Iterable[Cell] = ()) -> Cell:
+    """
+    :return: ShardStateUnsplit cell of the whole-workchain shard with `accounts` accounts (and known ones)
+    """
+    accounts_dict, _ = shard_accounts(accounts, workchain, seed, known)
+    total = accounts_dict.extra.balance if accounts_dict.map else CurrencyCollection(0)
+    # overload_history, underload_history, total_balance, total_validator_fees, libraries, master_ref
+    ref = Builder().store_uint(0, 64).store_uint(0, 64).store_cell(total.serialize()) \
+        .store_cell(CurrencyCollection(0).serialize()).store_bit(0).store_bit(0).end_cell()
+    return _shard_state_header(workchain, seqno) \
+        .store_ref(Cell.empty()).store_bit(0) \
+        .store_ref(accounts_dict.serialize_e(DepthBalanceInfo(0, CurrencyCollection(0)))) \
+        .store_ref(ref).store_bit(0).end_cell()
+
+
+def _shard_state_header(workchain: int, seqno: int) -> Builder:
+    return Builder().store_bytes(b'\x90#\xaf\xe2').store_int(GLOBAL_ID, 32) \
+        .store_uint(0, 2).store_uint(0, 6).store_int(workchain, 32).store_uint(0, 64) \
+        .store_uint(seqno, 32).store_uint(0, 32).store_uint(GEN_UTIME, 32).store_uint(seqno * 10 ** 6, 64) \
+        .store_uint(0, 32)
+
+
+def _ext_blk_ref(builder: Builder, rng: random.Random, seqno: int) -> Builder:
+    return builder.store_uint(seqno * 10 ** 6, 64).store_uint(seqno, 32) \
+        .store_bytes(rng.getrandbits(256).to_bytes(32, 'big')).store_bytes(rng.getrandbits(256).to_bytes(32, 'big'))
+
+
+def transaction(account_id: int, lt: int, prev_hash: bytes, prev_lt: int, in_msg: Cell, fees: int,
+                rng: random.Random) -> Cell:
+    """
+    :return: ordinary transaction of a wallet processing an external message, without out messages
+    """
+    old_state, new_state = rng.getrandbits(256).to_bytes(32, 'big'), rng.getrandbits(256).to_bytes(32, 'big')
+    gas_used = rng.randrange(3000, 10000)
+    compute = Builder().store_var_uint(gas_used, 3).store_var_uint(10000, 3).store_bit(1).store_var_uint(10000, 2) \
+        .store_int(0, 8).store_int(0, 32).store_bit(0).store_uint(gas_used // 26, 32) \
+        .store_bytes(old_state).store_bytes(new_state).end_cell()
+    description = Builder().store_uint(0, 4).store_bool(False) \
+        .store_bit(1).store_coins(rng.randrange(1, 1000)).store_bit(0).store_bit(0) \
+        .store_bit(0) \
+        .store_bit(1).store_bool(True).store_bool(True).store_bool(False).store_coins(fees).store_ref(compute) \
+        .store_bit(0).store_bool(False).store_bit(0).store_bool(False).end_cell()
+    messages = Builder().store_maybe_ref(in_msg).store_dict(None).end_cell()
+    return Builder().store_bits('0111').store_uint(account_id, 256).store_uint(lt, 64) \
+        .store_bytes(prev_hash).store_uint(prev_lt, 64).store_uint(GEN_UTIME, 32).store_uint(0, 15) \
+        .store_bits('10').store_bits('10') \
+        .store_ref(messages) \
+        .store_cell(CurrencyCollection(fees).serialize()) \
+        .store_ref(Builder().store_bytes(b'\x72').store_bytes(old_state).store_bytes(new_state).end_cell()) \
+        .store_ref(description).end_cell()
+
+
+def block(transactions: int = 1000, accounts: typing.Optional[int] = None, workchain: int = 0, seed: int = 0,
+          seqno: int = 1) -> Cell:
+    """
+    :param transactions: number of transactions, all of them are imported external messages
+    :param accounts: number of accounts sending them (transactions // 4 by default)
+    :return: shard Block cell with account_blocks and in_msg_descr filled, state_update sides are pruned
+    """
+    rng = random.Random(seed)
+    accounts = accounts or max(1, transactions // 4)
+    account_ids = [rng.getrandbits(256) for _ in range(accounts)]
+    start_lt = seqno * 10 ** 6
+
+    in_msg_descr = HashMapAug(256, value_serializer=lambda src, dest: dest.store_bits('000').store_ref(src[0]).store_ref(src[1]),
+                              extra_serializer=lambda src, dest: dest.store_cell(src.serialize()),
+                              aggregate=lambda a, b: ImportFees(a.fees_collected + b.fees_collected,
+                                                                currency_sum(a.value_imported, b.value_imported)))
+    account_txs: typing.Dict[int, typing.Dict[int, typing.Tuple[Cell, CurrencyCollection]]] = {}
+    last: typing.Dict[int, typing.Tuple[bytes, int]] = {}
+    for n in range(transactions):
+        account_id = account_ids[n % accounts]
+        lt = start_lt + n + 1
+        body = Builder().store_bytes(rng.getrandbits(512).to_bytes(64, 'big')).store_uint(698983191, 32) \
+            .store_uint(GEN_UTIME + 60, 32).store_uint(n // accounts, 32).end_cell()
+        msg = MessageAny(ExternalMsgInfo(None, Address((workchain, account_id.to_bytes(32, 'big'))), 0), None, body).serialize()
+        fees = rng.randrange(10 ** 6, 10 ** 7)
+        prev_hash, prev_lt = last.get(account_id, (rng.getrandbits(256).to_bytes(32, 'big'), start_lt - 1))
+        tx = transaction(account_id, lt, prev_hash, prev_lt, msg, fees, rng)
+        last[account_id] = tx.hash, lt
+        account_txs.setdefault(account_id, {})[lt] = tx, CurrencyCollection(fees)
+        in_msg_descr.set(int.from_bytes(msg.hash, 'big'), (msg, tx), ImportFees(fees, CurrencyCollection(0)))
+
+    account_blocks = HashMapAug(256, value_serializer=lambda src, dest: dest.store_cell(src),
+                                extra_serializer=lambda src, dest: dest.store_cell(src.serialize()),
+                                aggregate=currency_sum)
+    for account_id, txs in account_txs.items():
+        txs_dict = HashMapAug(64, value_serializer=lambda src, dest: dest.store_ref(src),
+                              extra_serializer=lambda src, dest: dest.store_cell(src.serialize()),
+                              aggregate=currency_sum, map_=txs)
+        state_update = Builder().store_bytes(b'\x72').store_bytes(rng.getrandbits(256).to_bytes(32, 'big')) \
+            .store_bytes(rng.getrandbits(256).to_bytes(32, 'big')).end_cell()
+        account_block = Builder().store_uint(5, 4).store_uint(account_id, 256) \
+            .store_cell(txs_dict.serialize()).store_ref(state_update).end_cell()
+        account_blocks.set(account_id, account_block, txs_dict.extra)
+
+    zero = CurrencyCollection(0).serialize()
+    extra = Builder().store_bytes(b'J3\xf6\xfd') \
+        .store_ref(in_msg_descr.serialize_e(ImportFees(0, CurrencyCollection(0)))) \
+        .store_ref(Builder().store_bit(0).store_cell(zero).end_cell()) \
+        .store_ref(account_blocks.serialize_e(CurrencyCollection(0))) \
+        .store_bytes(rng.getrandbits(256).to_bytes(32, 'big')).store_bytes(rng.getrandbits(256).to_bytes(32, 'big')) \
+        .store_bit(0).end_cell()
+
+    info = Builder().store_bytes(b'\x9b\xc7\xa9\x87').store_uint(0, 32) \
+        .store_bit(1).store_bit(0).store_bit(0).store_bit(0).store_bool(False).store_bool(False).store_bool(False) \
+        .store_bit(0).store_uint(0, 8).store_uint(seqno, 32).store_uint(0, 32) \
+        .store_uint(0, 2).store_uint(0, 6).store_int(workchain, 32).store_uint(0, 64) \
+        .store_uint(GEN_UTIME, 32).store_uint(start_lt, 64).store_uint(start_lt + transactions + 1, 64) \
+        .store_uint(0, 32).store_uint(0, 32).store_uint(0, 32).store_uint(0, 32) \
+        .store_ref(_ext_blk_ref(Builder(), rng, seqno).end_cell()) \
+        .store_ref(_ext_blk_ref(Builder(), rng, seqno - 1).end_cell()).end_cell()
+
+    fees = account_blocks.extra if account_blocks.map else CurrencyCollection(0)
+    value_flow = Builder().store_bytes(b'\xb8\xe4\x8d\xfb') \
+        .store_ref(Builder().store_cell(zero).store_cell(zero).store_cell(zero).store_cell(zero).end_cell()) \
+        .store_ref(Builder().store_cell(zero).store_cell(zero).store_cell(zero).store_cell(zero).end_cell()) \
+        .store_cell(fees.serialize()).end_cell()
+
+    old_state = _shard_state_header(workchain, seqno - 1).end_cell()
+    new_state = _shard_state_header(workchain, seqno).end_cell()
+    state_update = Builder(type_=CellTypes.merkle_update).store_uint(CellTypes.merkle_update, 8).store_bytes(old_state.hash).store_bytes(new_state.hash) \
+        .store_uint(0, 16).store_uint(0, 16).store_ref(prune(old_state)).store_ref(prune(new_state)).end_cell()
+
+    return Builder().store_bytes(b'\x11\xefU\xaa').store_int(GLOBAL_ID, 32) \
+        .store_ref(info).store_ref(value_flow).store_ref(state_update).store_ref(extra).end_cell()
+
+
+def vm_stack(depth: int = 255, list_length: int = 200, seed: int = 0) -> Cell:
+    """
+    :param depth: stack entries, tuples of ints, big ints and cells
+    :param list_length: length of a lisp-style list (nested pairs) on the top of the stack,
+        each item adds 2 to the cell depth and Cell.to_boc() is recursive, so keep it below ~450
+    :return: VmStack cell like in a get-method result
+    """
+    rng = random.Random(seed)
+    values = [VmTuple([i, rng.getrandbits(200), _cell_from(rng, 267), None]) for i in range(depth)]
+    lisp_list = VmTuple([0])
+    for i in range(1, list_length):
+        lisp_list = VmTuple([rng.getrandbits(32), lisp_list])
+    return VmStack.serialize(values + [lisp_list])
+
+
+def main(argv: typing.Optional[typing.List[str]] = None):
+    parser = argparse.ArgumentParser(description='generate synthetic fixtures')
+    parser.add_argument('-o', '--output', default='.', help='output directory')
+    parser.add_argument('--accounts', type=int, default=100000, help='shard state accounts')
+    parser.add_argument('--transactions', type=int, default=5000, help='block transactions')
+    parser.add_argument('--stack-depth', type=int, default=255, help='VmStack entries')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.output, exist_ok=True)
+    fixtures = [
+        ('shard_state.boc', lambda: shard_state(args.accounts, seed=args.seed), ShardStateUnsplit.deserialize),
+        ('block.boc', lambda: block(args.transactions, seed=args.seed), Block.deserialize),
+        ('vm_stack.boc', lambda: vm_stack(args.stack_depth, seed=args.seed), VmStack.deserialize),
+    ]
+    for name, make, check in fixtures:
+        t = time.perf_counter()
+        boc = make().to_boc()
+        path = os.path.join(args.output, name)
+        with open(path, 'wb') as f:
+            f.write(boc)
+        check(Cell.one_from_boc(boc).begin_parse())
+        print(f'{path}: {len(boc)} bytes in {time.perf_counter() - t:.1f} s')
+
+
+if __name__ == '__main__':
+    main()
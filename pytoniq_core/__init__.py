@@ -1,5 +1,51 @@
+import typing
+from importlib import import_module as _import_module
+
 from .boc import *
-from .crypto import *
-from .proof import *
-from .tl import *
-from.tlb import *
+
+if typing.TYPE_CHECKING:
+    from .crypto import *
+    from .instrumentation import *
+    from .proof import *
+    from .tl import *
+    from .tlb import *
+
+# heavy subpackages (crypto backends, TL generator, TL-B schemes) are imported on the first access of their names
+_lazy_names = {
+    'crypto': (),
+    'instrumentation': ('InstrumentationStats', 'instrument'),
+    'proof': ('MerkleUpdateError', 'ProofError', 'PrunedBranchError', 'StateNavigator', 'apply_merkle_update',
+              'calculate_node_id_short', 'check_account_proof', 'check_block_header_proof', 'check_block_signatures',
+              'check_proof', 'check_shard_proof', 'compute_validator_set', 'create_merkle_update'),
+    'tl': ('BlockId', 'BlockIdExt', 'TlClassGenerator', 'TlError', 'TlGenerator', 'TlObject', 'TlRegistrator',
+           'TlSchema', 'TlSchemas', 'TlTraceEvent', 'log_trace'),
+    'tlb': ('Account', 'AccountError', 'AccountState', 'AccountStorage', 'Block', 'BlockError', 'BlockExtra',
+            'BlockInfo', 'ConfigError', 'ConfigParam', 'CurrencyCollection', 'ExternalMsgInfo', 'ExternalOutMsgInfo',
+            'ExtraCurrencyCollection', 'FeeError', 'FeeEstimator', 'HashUpdate', 'InMsg', 'InternalMsgInfo',
+            'McStateExtra', 'MerkleUpdate', 'MessageAny', 'NftItemData', 'OutMsg', 'ShardAccount', 'ShardAccounts',
+            'ShardDescr', 'ShardError', 'ShardIdent', 'ShardState', 'ShardStateUnsplit', 'ShardTopology',
+            'SimpleAccount', 'SimpleAccountState', 'StateInit', 'StorageInfo', 'TlbError', 'TlbScheme',
+            'TrActionPhase', 'TrBouncePhase', 'TrComputePhase', 'TrCreditPhase', 'TrStoragePhase', 'Transaction',
+            'TransactionDescr', 'TransactionError', 'TransactionOrdinary', 'TransactionStorage', 'TransactionTickTock',
+            'ValueFlow', 'VmCellSlice', 'VmCont', 'VmControlData', 'VmError', 'VmSaveList', 'VmStack', 'VmStackList',
+            'VmStackValue', 'VmTuple', 'VmTupleRef', 'WalletMessage', 'WalletV3Data', 'WalletV4Data',
+            'deserialize_shard_hashes'),
+}
+_lazy_attrs = {name: module for module, names in _lazy_names.items() for name in names}
+
+__all__ = [name for name in globals() if not name.startswith('_') and name != 'typing'] + list(_lazy_attrs)
+
+
+def __getattr__(name: str):
+    if name in _lazy_names:
+        return _import_module(f'.{name}', __name__)
+    module = _lazy_attrs.get(name)
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(_import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_attrs))
@@ -5,6 +5,8 @@ from .exotic import CellTypes
 from .hashmap import *
 from .address import Address, AddressError, ExternalAddress
 from .tvm_bitarray import TvmBitarray
+from .deserialize import Boc, BocReader, BocError, BocIncompleteError
+from .storage_stat import CellStorageStat, compute_storage_stat
 
 
 def begin_cell():
@@ -9,11 +9,21 @@ from .tvm_bitarray import bitarray, TvmBitarray
 from .utils import bytes_to_uint
 from ..crypto.crc import crc32c
 
+if typing.TYPE_CHECKING:
+    from concurrent.futures import Executor
+
 
 class BocError(Exception):
     pass
 
 
+class BocIncompleteError(BocError):
+    """
+    Data ends before the end of the boc
+    """
+    pass
+
+
 # https://github.com/ton-blockchain/ton/blob/24dc184a2ea67f9c47042b4104bbb4d82289fac1/crypto/tl/boc.tlb#L25
 SERIALIZED_BOC_IDX_CRC32C = b'\xac\xc3\xa7('  # LEAN_BOC_MAGIC_PREFIX_CRC acc3a728
 SERIALIZED_BOC_IDX_PREFIX = b'h\xffe\xf3'  # LEAN_BOC_MAGIC_PREFIX 68ff65f3
@@ -98,11 +108,13 @@ class Boc:
         pass
 
     @staticmethod
-    def deserialize_boc_header(data: bytes):
-        # TODO: check if this implementation is really faster than bytes slicing
+    def _deserialize_boc_prefix(data: bytes) -> typing.Tuple[dict, int]:
+        """
+        :return: header without cells data and offset of cells data
+        """
         data_len = len(data)
         if data_len < 4:
-            raise BocError(f'not enough bytes to deserialize boc header: {data}')
+            raise BocIncompleteError(f'not enough bytes to deserialize boc header: {bytes(data)}')
         result = {
             'has_idx': True,
             'hash_crc32': None,
@@ -118,21 +130,24 @@ class Boc:
             'index': None,
             'cells_data': None,
         }
-        if data[:4] == SERIALIZED_BOC_PREFIX:
+        prefix = bytes(data[:4])
+        if prefix == SERIALIZED_BOC_PREFIX:
+            if data_len < 5:
+                raise BocIncompleteError(f'can\'t parse boc header: {prefix}')
             flags_byte = data[4]
             result['has_idx'] = flags_byte & 128
             result['hash_crc32'] = flags_byte & 64
             result['has_cache_bits'] = flags_byte & 32
             result['flags'] = (flags_byte & 16) * 2 + (flags_byte & 8)
             result['size_bytes'] = flags_byte % 8
-        elif data[:4] == SERIALIZED_BOC_IDX_PREFIX:
+        elif prefix == SERIALIZED_BOC_IDX_PREFIX:
             result['hash_crc32'] = 0
-        elif data[:4] == SERIALIZED_BOC_IDX_CRC32C:
+        elif prefix == SERIALIZED_BOC_IDX_CRC32C:
             result['hash_crc32'] = 1
         else:
-            raise BocError(f'unknown boc prefix: {data[:4]}')
+            raise BocError(f'unknown boc prefix: {prefix}')
         if data_len - 5 < 1 + 5 * result['size_bytes']:
-            raise BocError(f'can\'t parse boc header: {data[:4]}')
+            raise BocIncompleteError(f'can\'t parse boc header: {prefix}')
         offset_bytes = data[5]
         result['offset_bytes'] = offset_bytes
         size_bytes = result['size_bytes']
@@ -142,40 +157,56 @@ class Boc:
             = [bytes_to_uint(data[i: i + size_bytes]) for i in range(6, end, size_bytes)]
 
         i = end + result['offset_bytes']
+        if data_len < i:
+            raise BocIncompleteError(f'can\'t parse boc header: {prefix}')
         result['tot_cells_size'] = bytes_to_uint(data[end: i])
 
         if data_len - i < result['roots_num'] * size_bytes:
-            raise Exception("Not enough bytes for encoding root cells hashes")
+            raise BocIncompleteError("Not enough bytes for encoding root cells hashes")
         end = i + result['roots_num'] * size_bytes
         result['root_list'] = [bytes_to_uint(data[j: j + size_bytes]) for j in range(i, end,  size_bytes)]
         i = end
         if result['has_idx']:
             if data_len - i < offset_bytes * result['cells_num']:
-                raise BocError("Not enough bytes for index encoding")
+                raise BocIncompleteError("Not enough bytes for index encoding")
             end = i + result['cells_num'] * offset_bytes
             result['index'] = [bytes_to_uint(data[j: j + offset_bytes]) for j in range(i, end,  offset_bytes)]
             i = end
+        return result, i
 
-        if data_len - i < result['tot_cells_size']:
-            raise BocError("Not enough bytes for cells data")
-
-        end = i + result['tot_cells_size']
-        result['cells_data'] = data[i: end]
-        i = end
-
-        if result['hash_crc32']:
+    @staticmethod
+    def _check_boc_end(data: bytes, header: dict, i: int) -> None:
+        """
+        Checks crc32c and that there are no bytes after the boc
+        :param i: offset of the cells data end
+        """
+        data_len = len(data)
+        if header['hash_crc32']:
             if data_len - i < 4:
-                raise BocError("Not enough bytes for crc32c hashsum")
+                raise BocIncompleteError("Not enough bytes for crc32c hashsum")
             if crc32c(data[: i]) != data[i: i + 4]:
                 raise BocError("Crc32c hashsum mismatch")
             i += 4
         if data_len - i:  # != 0
             raise BocError("Too many bytes in boc")
+
+    @staticmethod
+    def deserialize_boc_header(data: bytes):
+        result, i = Boc._deserialize_boc_prefix(data)
+
+        if len(data) - i < result['tot_cells_size']:
+            raise BocIncompleteError("Not enough bytes for cells data")
+
+        end = i + result['tot_cells_size']
+        result['cells_data'] = data[i: end]
+        Boc._check_boc_end(data, result, end)
         return result
 
     @staticmethod
     def deserialize_cell(data: bytes, ref_index_size: int) -> typing.Tuple[dict, int]:
         data_len = len(data)
+        if data_len < 2:
+            raise BocIncompleteError('Not enough bytes to encode cell data')
         refs_descriptor = data[0]
         level = refs_descriptor >> 5
         total_refs = refs_descriptor & 7
@@ -192,7 +223,7 @@ class Boc:
         i = 2
 
         if data_len - i < hashes_size + depth_size + data_size + ref_index_size * total_refs:
-            raise BocError('Not enough bytes to encode cell data')
+            raise BocIncompleteError('Not enough bytes to encode cell data')
 
         if has_hashes:
             i += hashes_size + depth_size
@@ -225,34 +256,206 @@ class Boc:
 
         return cell, i
 
-    def deserialize(self, cls: type = None):
+    @staticmethod
+    def _link_cells(header: dict, cells_array: typing.List[dict], cls: type,
+                    chunk_cells: int = 0) -> typing.Generator[None, None, list]:
+        """
+        Creates cls objects from deserialized cells, yields after every chunk_cells cells (never if 0)
+        :return: root cells
+        """
+        n = 0
+        for ci in reversed(range(header['cells_num'])):
+            c = cells_array[ci]
+            refs = []
+            for ri in range(len(c['refs'])):
+                r = c['refs'][ri]
+                if r < ci:
+                    raise Exception('Topological order is broken')
+                refs.append(cells_array[r]['result'])
+            cells_array[ci]['result'] = cls(cells_array[ci]['bits'], refs, cells_array[ci]['type'])
+            n += 1
+            if n == chunk_cells:
+                n = 0
+                yield
+
+        root_cells = []
+        for ri in header['root_list']:
+            root_cells.append(cells_array[ri]['result'])
+
+        return root_cells
+
+    def _deserialize(self, cls: type, chunk_cells: int = 0) -> typing.Generator[None, None, list]:
         if not cls:
             from .cell import Cell
             cls = Cell
 
         header = self.deserialize_boc_header(self.data)
-        cells_data = header['cells_data']
+        cells_data = memoryview(header['cells_data'])  # slices of memoryview are not copied
         cells_array = []
 
         i = 0
+        n = 0
 
         for ci in range(header['cells_num']):
             cell, j = self.deserialize_cell(cells_data[i:], header['size_bytes'])
             i += j
             cells_array.append(cell)
+            n += 1
+            if n == chunk_cells:
+                n = 0
+                yield
 
-        for ci in reversed(range(header['cells_num'])):
-            c = cells_array[ci]
-            refs = []
-            for ri in range(len(c['refs'])):
-                r = c['refs'][ri]
-                if r < ci:
-                    raise Exception('Topological order is broken')
-                refs.append(cells_array[r]['result'])
-            cells_array[ci]['result'] = cls(cells_array[ci]['bits'], refs, cells_array[ci]['type'])
+        return (yield from self._link_cells(header, cells_array, cls, chunk_cells))
 
-        root_cells = []
-        for ri in header['root_list']:
-            root_cells.append(cells_array[ri]['result'])
+    def deserialize(self, cls: type = None):
+        return _run(self._deserialize(cls))
 
-        return root_cells
+    async def deserialize_async(self, cls: type = None, chunk_cells: int = 1000,
+                                executor: typing.Optional["Executor"] = None) -> list:
+        """
+        Deserializes boc without blocking the event loop for long:
+            cells = await Boc(data).deserialize_async()
+
+        :param chunk_cells: control is returned to the event loop after every chunk_cells cells are parsed, must be positive
+        :param executor: ThreadPoolExecutor or ProcessPoolExecutor to deserialize boc in instead of the event loop thread,
+            chunk_cells is not used then. Cells (and cls) must be picklable for ProcessPoolExecutor.
+        :return: root cells
+        """
+        import asyncio
+        if executor is not None:
+            return await asyncio.get_running_loop().run_in_executor(executor, _deserialize_boc, self.data, cls)
+        _check_chunk_cells(chunk_cells)
+        return await _run_async(self._deserialize(cls, chunk_cells))
+
+
+class BocReader:
+    """
+    Incremental boc deserialization from chunks of bytes, e.g. as they arrive from a socket:
+        reader = BocReader()
+        while not reader.complete:
+            reader.feed(await stream.read(65536))
+        cells = await reader.deserialize_async()
+
+    Cells are parsed as soon as their bytes are fed, so only cells creation and hashing are left for deserialize.
+    Once feed raised an error the reader is failed: all later calls raise BocError, use a new reader for the next boc.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._header: typing.Optional[dict] = None
+        self._cells: typing.List[dict] = []
+        self._pos = 0  # offset of the next cell to parse in the buffer
+        self._end = 0  # offset of the cells data end
+        self._size: typing.Optional[int] = None  # total boc size
+        self._error: typing.Optional[Exception] = None  # error raised by feed
+        self.complete = False
+
+    @property
+    def missing(self) -> typing.Optional[int]:
+        """
+        :return: number of bytes left to feed or None if the header is not fed yet
+        """
+        if self._size is None:
+            return None
+        return self._size - len(self._buffer)
+
+    def feed(self, chunk: bytes) -> bool:
+        """
+        :param chunk: next bytes of the boc
+        :return: True if the whole boc is fed
+        """
+        self._check_failed()
+        if self.complete:
+            raise BocError("Too many bytes in boc")
+        try:
+            return self._feed(chunk)
+        except Exception as e:
+            self._error = e
+            raise
+
+    def _feed(self, chunk: bytes) -> bool:
+        self._buffer += chunk
+        with memoryview(self._buffer) as data:
+            if self._header is None:
+                try:
+                    self._header, self._pos = Boc._deserialize_boc_prefix(data)
+                except BocIncompleteError:
+                    return False
+                self._end = self._pos + self._header['tot_cells_size']
+                self._size = self._end + (4 if self._header['hash_crc32'] else 0)
+
+            cells_data = data[:min(len(data), self._end)]
+            size_bytes = self._header['size_bytes']
+            while len(self._cells) < self._header['cells_num']:
+                try:
+                    cell, j = Boc.deserialize_cell(cells_data[self._pos:], size_bytes)
+                except BocIncompleteError:
+                    break
+                self._pos += j
+                self._cells.append(cell)
+
+            if len(data) < self._size:
+                return False
+            if len(self._cells) < self._header['cells_num']:
+                raise BocIncompleteError('Not enough bytes for cells data')
+            Boc._check_boc_end(data, self._header, self._end)
+        self.complete = True
+        return True
+
+    def _check_failed(self):
+        if self._error is not None:
+            raise BocError(f'reader failed on a previous feed: {self._error}') from self._error
+
+    def _check_complete(self):
+        self._check_failed()
+        if not self.complete:
+            raise BocIncompleteError(f'boc is not fed completely, {self.missing} bytes are missing')
+
+    def deserialize(self, cls: type = None) -> list:
+        """
+        :return: root cells
+        """
+        self._check_complete()
+        if not cls:
+            from .cell import Cell
+            cls = Cell
+        return _run(Boc._link_cells(self._header, self._cells, cls))
+
+    async def deserialize_async(self, cls: type = None, chunk_cells: int = 1000) -> list:
+        """
+        :param chunk_cells: control is returned to the event loop after every chunk_cells cells are created, must be positive
+        :return: root cells
+        """
+        _check_chunk_cells(chunk_cells)
+        self._check_complete()
+        if not cls:
+            from .cell import Cell
+            cls = Cell
+        return await _run_async(Boc._link_cells(self._header, self._cells, cls, chunk_cells))
+
+
+def _run(steps: typing.Generator[None, None, typing.Any]) -> typing.Any:
+    while True:
+        try:
+            next(steps)
+        except StopIteration as e:
+            return e.value
+
+
+def _check_chunk_cells(chunk_cells: int) -> None:
+    if chunk_cells < 1:
+        raise BocError(f'chunk_cells must be positive, got {chunk_cells}')
+
+
+async def _run_async(steps: typing.Generator[None, None, typing.Any]) -> typing.Any:
+    import asyncio
+    while True:
+        try:
+            next(steps)
+        except StopIteration as e:
+            return e.value
+        await asyncio.sleep(0)
+
+
+def _deserialize_boc(data: bytes, cls: typing.Optional[type]) -> list:
+    return Boc(data).deserialize(cls)
@@ -1 +1,5 @@
-from .hashmap import DictError, Key, HashMap
\ No newline at end of file
+from .hashmap import DictError, Key, HashMap
+from .edit import dict_get, dict_set, dict_delete
+from .cursor import DictCursor
+from .diff import dict_diff
+from .aug import HashMapAug
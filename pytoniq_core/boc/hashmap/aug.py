@@ -0,0 +1,261 @@
+import bisect
+import typing
+
+from ..cell import Cell
+from ..builder import Builder
+
+from .hashmap import DictError
+from .edit import key_to_bits, parse_node
+from .utils import write_label
+
+
+class HashMapAug:
+    """
+    ahm_edge#_ {n:#} {X:Type} {Y:Type} {l:#} {m:#} label:(HmLabel ~l n) {n = (~m) + l}
+        node:(HashmapAugNode m X Y) = HashmapAug n X Y;
+    ahmn_leaf#_ {X:Type} {Y:Type} extra:Y value:X = HashmapAugNode 0 X Y;
+    ahmn_fork#_ {n:#} {X:Type} {Y:Type} left:^(HashmapAug n X Y) right:^(HashmapAug n X Y) extra:Y
+        = HashmapAugNode (n + 1) X Y;
+    ahme_empty$0 {n:#} {X:Type} {Y:Type} extra:Y = HashmapAugE n X Y;
+    ahme_root$1 {n:#} {X:Type} {Y:Type} root:^(HashmapAug n X Y) extra:Y = HashmapAugE n X Y;
+
+    Leaf extras are given with values, fork extras are computed bottom-up with aggregate(left_extra, right_extra).
+    The tree is built once on the first serialize(), after that set() and delete() rebuild only cells
+    on the path to the key and recompute their extras, all other cells and extras are reused.
+
+    Usage:
+        accounts = HashMapAug(256, value_serializer=lambda src, dest: dest.store_cell(src.serialize()),
+                              extra_serializer=lambda src, dest: dest.store_cell(src.serialize()),
+                              aggregate=lambda a, b: DepthBalanceInfo(0, CurrencyCollection(a.balance.grams + b.balance.grams)))
+        accounts.set(address_int, shard_account, DepthBalanceInfo(0, shard_account.account.storage.balance))
+        accounts.serialize_e(empty_extra)  # HashmapAugE cell
+        accounts.set(address_int, changed_account, new_extra)  # path to the key is rebuilt
+    """
+
+    def __init__(self,
+                 key_size: int,
+                 value_serializer: typing.Optional[typing.Callable] = None,
+                 extra_serializer: typing.Optional[typing.Callable] = None,
+                 aggregate: typing.Optional[typing.Callable] = None,
+                 extra_deserializer: typing.Optional[typing.Callable] = None,
+                 map_: typing.Optional[dict] = None,
+                 ):
+        """
+        :param value_serializer: (value, builder) -> None, by default values are Cells stored inline
+        :param extra_serializer: (extra, builder) -> None
+        :param aggregate: (left_extra, right_extra) -> fork extra
+        :param extra_deserializer: Slice -> extra, needed only to update dictionaries loaded with from_cell()
+        :param map_: {int key: (value, extra)}
+        """
+        self.size = key_size
+        if map_ is None:
+            map_ = {}
+        self.map = map_
+        self.value_serializer = value_serializer or (lambda src, dest: dest.store_cell(src))
+        self.extra_serializer = extra_serializer
+        self.aggregate = aggregate
+        self.extra_deserializer = extra_deserializer
+        self._root: typing.Optional[Cell] = None
+        self._built = False
+        self._extras: typing.Dict[bytes, typing.Any] = {}  # {node cell hash: extra}
+        self._extras_live = 0  # size of _extras after the last _compact()
+
+    @classmethod
+    def from_cell(cls, root: Cell, key_size: int, extra_deserializer: typing.Callable, **kwargs) -> "HashMapAug":
+        """
+        Wraps existing HashmapAug root to update it with set() / delete(),
+        extras of untouched subtrees are read from the cells with extra_deserializer.
+        .map of the result holds only keys set after loading.
+        """
+        result = cls(key_size, extra_deserializer=extra_deserializer, **kwargs)
+        result._root = root
+        result._built = True
+        return result
+
+    def _node(self, label: str, m: int, extra, value=None, refs: typing.Sequence[Cell] = (),
+              content=None) -> Cell:
+        builder = Builder()
+        write_label(label, m, builder)
+        if content is not None:  # rest of an existing node after its label
+            builder.store_slice(content)
+        else:
+            for ref in refs:
+                builder.store_ref(ref)
+            self.extra_serializer(extra, builder)
+            if not refs:
+                self.value_serializer(value, builder)
+        cell = builder.end_cell()
+        self._extras[cell.hash] = extra
+        return cell
+
+    def _fork(self, label: str, m: int, left: Cell, right: Cell) -> Cell:
+        child_m = m - len(label) - 1
+        extra = self.aggregate(self.get_extra(left, child_m), self.get_extra(right, child_m))
+        return self._node(label, m, extra, refs=(left, right))
+
+    def get_extra(self, cell: Cell, m: int):
+        """
+        :param cell: HashmapAug node cell
+        :param m: key length at the node
+        """
+        if cell.hash in self._extras:
+            return self._extras[cell.hash]
+        if self.extra_deserializer is None:
+            raise DictError('extra_deserializer is required to read extras of existing cells')
+        label, cs = parse_node(cell, m)
+        if m > len(label):  # fork, extra goes after the children refs
+            cs.load_ref()
+            cs.load_ref()
+        extra = self._extras[cell.hash] = self.extra_deserializer(cs)
+        return extra
+
+    def _build(self) -> typing.Optional[Cell]:
+        items = sorted(self.map.items())
+        if not items:
+            return None
+        for key, _ in (items[0], items[-1]):
+            key_to_bits(key, self.size)  # range check
+        keys = [i[0] for i in items]
+        results: typing.List[Cell] = []
+        stack: list = [(0, len(items), self.size, None)]
+        while stack:
+            lo, hi, m, fork = stack.pop()
+            if fork is not None:
+                right = results.pop()
+                results.append(self._fork(fork, m, results.pop(), right))
+                continue
+            mask = (1 << m) - 1
+            first = keys[lo] & mask
+            if hi - lo == 1:
+                value, extra = items[lo][1]
+                results.append(self._node(format(first, f'0{m}b') if m else '', m, extra, value))
+                continue
+            p = (first ^ (keys[hi - 1] & mask)).bit_length()  # key bits left after the fork
+            label = format(first >> p, f'0{m - p}b') if m - p else ''
+            split = bisect.bisect_left(keys, ((keys[lo] >> (p - 1)) | 1) << (p - 1), lo, hi)
+            stack.append((lo, hi, m, label))
+            stack.append((split, hi, p - 1, None))
+            stack.append((lo, split, p - 1, None))
+        return results[0]
+
+    def _rebuild(self, node: Cell, path: list) -> Cell:
+        for label, m, bit, sibling in reversed(path):
+            node = self._fork(label, m, *((sibling, node) if bit else (node, sibling)))
+        if len(self._extras) > 4 * self._extras_live + 1024:
+            self._compact(node)
+        return node
+
+    def _compact(self, root: typing.Optional[Cell]) -> None:
+        """
+        Drops extras of cells replaced by set() / delete(). Parents of cached cells are cached too
+        (they are created here), so only cached cells reachable from the root are walked.
+        """
+        extras = {}
+        stack = [(root, self.size)] if root is not None and root.hash in self._extras else []
+        while stack:
+            cell, m = stack.pop()
+            extras[cell.hash] = self._extras[cell.hash]
+            label, cs = parse_node(cell, m)
+            if m > len(label):
+                for ref in cs.refs[:2]:
+                    if ref.hash in self._extras:
+                        stack.append((ref, m - len(label) - 1))
+        self._extras = extras
+        self._extras_live = len(extras)
+
+    def set(self, key: int, value, extra) -> "HashMapAug":
+        self.map[key] = (value, extra)
+        if not self._built:
+            return self
+        bits = key_to_bits(key, self.size)
+        if self._root is None:
+            self._root = self._node(bits, self.size, extra, value)
+            return self
+        path = []  # (label, m, bit, sibling) of forks on the way
+        cell, pos, m = self._root, 0, self.size
+        while True:
+            label, cs = parse_node(cell, m)
+            l = len(label)
+            common = 0
+            while common < l and label[common] == bits[pos + common]:
+                common += 1
+            if common < l:  # key diverges inside the label, split the edge
+                child_m = m - common - 1
+                old_extra = self.get_extra(cell, m)
+                old = self._node(label[common + 1:], child_m, old_extra, content=cs)
+                new = self._node(bits[pos + common + 1:], child_m, extra, value)
+                node = self._fork(label[:common], m, *((old, new) if bits[pos + common] == '1' else (new, old)))
+                break
+            if m == l:  # leaf with the same key
+                node = self._node(label, m, extra, value)
+                break
+            bit = int(bits[pos + l])
+            path.append((label, m, bit, cs.refs[1 - bit]))
+            cell = cs.refs[bit]
+            pos += l + 1
+            m -= l + 1
+        self._root = self._rebuild(node, path)
+        return self
+
+    def delete(self, key: int) -> "HashMapAug":
+        self.map.pop(key, None)
+        if not self._built or self._root is None:
+            return self
+        bits = key_to_bits(key, self.size)
+        path = []
+        cell, pos, m = self._root, 0, self.size
+        while True:
+            label, cs = parse_node(cell, m)
+            l = len(label)
+            if bits[pos:pos + l] != label:
+                return self
+            if m == l:
+                break
+            bit = int(bits[pos + l])
+            path.append((label, m, bit, cs.refs[1 - bit]))
+            cell = cs.refs[bit]
+            pos += l + 1
+            m -= l + 1
+        if not path:
+            self._root = None
+            return self
+        # the fork disappears, its label is joined with the remaining child's one
+        label, m, bit, sibling = path.pop()
+        sibling_m = m - len(label) - 1
+        sibling_label, sibling_cs = parse_node(sibling, sibling_m)
+        node = self._node(label + str(1 - bit) + sibling_label, m, self.get_extra(sibling, sibling_m),
+                          content=sibling_cs)
+        self._root = self._rebuild(node, path)
+        return self
+
+    @property
+    def extra(self):
+        """
+        :return: aggregated extra of all leaves or None if the dictionary is empty
+        """
+        root = self.serialize()
+        return self.get_extra(root, self.size) if root is not None else None
+
+    def serialize(self) -> typing.Optional[Cell]:
+        """
+        :return: HashmapAug root cell or None if the dictionary is empty
+        """
+        if not self._built:
+            self._root = self._build()
+            self._built = True
+        return self._root
+
+    def serialize_e(self, empty_extra=None) -> Cell:
+        """
+        :param empty_extra: extra to store if the dictionary is empty
+        :return: HashmapAugE cell, store it with Builder.store_cell()
+        """
+        root = self.serialize()
+        builder = Builder()
+        if root is None:
+            builder.store_bit_int(0)
+            self.extra_serializer(empty_extra, builder)
+        else:
+            builder.store_bit_int(1).store_ref(root)
+            self.extra_serializer(self.get_extra(root, self.size), builder)
+        return builder.end_cell()
@@ -0,0 +1,87 @@
+import typing
+
+from .. import Slice
+from ..cell import Cell
+
+from .edit import parse_node
+
+
+class DictCursor:
+    """
+    Ordered traversal of a dictionary cell (Hashmap or HashmapAug root) without parsing it whole.
+    Only cells whose key ranges intersect the requested one are visited, results are yielded lazily.
+    Keys are unsigned ints, values are Slices positioned right after the leaf label
+    (for HashmapAug they start with the extra).
+
+    Usage:
+        cursor = DictCursor(dict_cell, 32)
+        cursor.min() -> (key, Slice) or None
+        cursor.next(key) -> first item with key greater than given
+        for key, value in cursor.range(100, 200): ...  # 100 <= key < 200
+        for key, value in cursor.prefix(0b101, 3): ...
+    """
+
+    def __init__(self, root: typing.Optional[Cell], key_len: int):
+        self.root = root
+        self.key_len = key_len
+
+    def range(self, lo: typing.Optional[int] = None, hi: typing.Optional[int] = None,
+              reverse: bool = False) -> typing.Iterator[typing.Tuple[int, Slice]]:
+        """
+        :return: iterator over items with lo <= key < hi in ascending (or descending if reverse) order
+        """
+        if self.root is None:
+            return
+        if lo is None:
+            lo = 0
+        if hi is None:
+            hi = 1 << self.key_len
+        first, second = (1, 0) if not reverse else (0, 1)  # pushed to stack in this order
+        stack = [(self.root, 0, self.key_len)]  # (cell, key prefix, remaining key length)
+        while stack:
+            cell, prefix, m = stack.pop()
+            label, cs = parse_node(cell, m)
+            if label:
+                prefix = (prefix << len(label)) | int(label, 2)
+            m -= len(label)
+            if hi <= prefix << m or ((prefix + 1) << m) <= lo:
+                continue
+            if m == 0:
+                yield prefix, cs
+                continue
+            m -= 1
+            for bit in (first, second):
+                child = (prefix << 1) | bit
+                if child << m < hi and lo < (child + 1) << m:
+                    stack.append((cs.refs[bit], child, m))
+
+    def __iter__(self):
+        return self.range()
+
+    def _first(self, iterator: typing.Iterator) -> typing.Optional[typing.Tuple[int, Slice]]:
+        return next(iterator, None)
+
+    def min(self) -> typing.Optional[typing.Tuple[int, Slice]]:
+        return self._first(self.range())
+
+    def max(self) -> typing.Optional[typing.Tuple[int, Slice]]:
+        return self._first(self.range(reverse=True))
+
+    def next(self, key: int, inclusive: bool = False) -> typing.Optional[typing.Tuple[int, Slice]]:
+        """
+        :return: item with the smallest key greater than (or equal to if inclusive) given one
+        """
+        return self._first(self.range(key if inclusive else key + 1))
+
+    def prev(self, key: int, inclusive: bool = False) -> typing.Optional[typing.Tuple[int, Slice]]:
+        """
+        :return: item with the largest key less than (or equal to if inclusive) given one
+        """
+        return self._first(self.range(hi=key + 1 if inclusive else key, reverse=True))
+
+    def prefix(self, prefix: int, prefix_len: int, reverse: bool = False) -> typing.Iterator[typing.Tuple[int, Slice]]:
+        """
+        :return: iterator over items whose keys start with prefix_len bits of prefix
+        """
+        shift = self.key_len - prefix_len
+        return self.range(prefix << shift, (prefix + 1) << shift, reverse)
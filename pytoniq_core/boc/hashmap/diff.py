@@ -0,0 +1,109 @@
+import typing
+
+from .. import Slice
+from ..cell import Cell
+
+from .edit import parse_node
+
+
+DiffItem = typing.Tuple[int, typing.Optional[Slice], typing.Optional[Slice]]
+
+
+class _Node(typing.NamedTuple):
+    """
+    Dictionary node with part of its label possibly consumed.
+    """
+    cell: Cell
+    label: str  # remaining label bits
+    cs: Slice  # node content after the label
+    m: int  # key bits left after the label
+    prefix: int  # key bits before the remaining label
+
+
+def _node(cell: Cell, m: int, prefix: int) -> _Node:
+    label, cs = parse_node(cell, m)
+    return _Node(cell, label, cs, m - len(label), prefix)
+
+
+def _advance(node: _Node, n: int) -> _Node:
+    return node._replace(label=node.label[n:], prefix=(node.prefix << n) | int(node.label[:n], 2))
+
+
+def _items(node: _Node) -> typing.Iterator[typing.Tuple[int, Slice]]:
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        prefix = node.prefix
+        if node.label:
+            prefix = (prefix << len(node.label)) | int(node.label, 2)
+        if node.m == 0:
+            yield prefix, node.cs
+            continue
+        for bit in (1, 0):
+            stack.append(_node(node.cs.refs[bit], node.m - 1, (prefix << 1) | bit))
+
+
+def _same_value(a: Slice, b: Slice) -> bool:
+    if a.bits != b.bits:
+        return False
+    a_refs, b_refs = a.refs[a.ref_offset:], b.refs[b.ref_offset:]
+    return len(a_refs) == len(b_refs) and all(i.hash == j.hash for i, j in zip(a_refs, b_refs))
+
+
+def dict_diff(old_root: typing.Optional[Cell], new_root: typing.Optional[Cell], key_len: int) -> typing.Iterator[DiffItem]:
+    """
+    Walks two dictionary cells together skipping subtrees with equal hashes,
+    so the cost is proportional to the changed part, not to the dictionaries size.
+    :return: iterator over (key, old value, new value) in ascending key order;
+        old value is None for added keys, new value is None for removed ones
+    """
+    stack: typing.List[typing.Tuple[typing.Optional[_Node], typing.Optional[_Node]]] = []
+    if old_root is not None or new_root is not None:
+        stack.append((_node(old_root, key_len, 0) if old_root is not None else None,
+                      _node(new_root, key_len, 0) if new_root is not None else None))
+    while stack:
+        a, b = stack.pop()
+        if a is None:
+            yield from ((k, None, v) for k, v in _items(b))
+            continue
+        if b is None:
+            yield from ((k, v, None) for k, v in _items(a))
+            continue
+        if a.label == b.label and a.cell.hash == b.cell.hash:
+            continue
+        if a.label and b.label:
+            common = 0
+            while common < len(a.label) and common < len(b.label) and a.label[common] == b.label[common]:
+                common += 1
+            if common:
+                stack.append((_advance(a, common), _advance(b, common)))
+            elif a.label[0] == '0':  # disjoint subtrees
+                stack.append((None, b))
+                stack.append((a, None))
+            else:
+                stack.append((a, None))
+                stack.append((None, b))
+            continue
+        if a.label or b.label:  # one of them is a fork here
+            fork, edge = (b, a) if a.label else (a, b)
+            bit = int(edge.label[0])
+            prefix = (fork.prefix << 1) | bit
+            child = _node(fork.cs.refs[bit], fork.m - 1, prefix)
+            other = _node(fork.cs.refs[1 - bit], fork.m - 1, prefix ^ 1)
+            pairs = [(_advance(edge, 1), child), (None, other)]
+            if fork is a:
+                pairs = [(j, i) for i, j in pairs]
+            if bit:
+                pairs.reverse()
+            stack.extend(reversed(pairs))
+            continue
+        if a.m == 0:  # leaves
+            if not _same_value(a.cs, b.cs):
+                yield a.prefix, a.cs, b.cs
+            continue
+        for bit in (1, 0):  # forks
+            a_child, b_child = a.cs.refs[bit], b.cs.refs[bit]
+            if a_child.hash == b_child.hash:
+                continue
+            prefix = (a.prefix << 1) | bit
+            stack.append((_node(a_child, a.m - 1, prefix), _node(b_child, b.m - 1, prefix)))
@@ -0,0 +1,139 @@
+import typing
+
+from .. import Slice, CellTypes
+from ..cell import Cell
+from ..builder import Builder
+
+from .hashmap import DictError
+from .parse import deserialize_hml
+from .utils import write_label
+
+
+Value = typing.Union[Cell, Slice, Builder]
+
+
+def key_to_bits(key: int, key_len: int) -> str:
+    if key < 0 or key.bit_length() > key_len:
+        raise DictError(f'key {key} does not fit in {key_len} bits')
+    return format(key, f'0{key_len}b') if key_len else ''
+
+
+def build_node(label: str, m: int, content: typing.Optional[Value] = None, refs: typing.Sequence[Cell] = ()) -> Cell:
+    """
+    :param label: edge label bits
+    :param m: remaining key length at the node (before the label)
+    :param content: leaf value or rest of an existing node after its label
+    :param refs: fork children
+    """
+    builder = Builder()
+    write_label(label, m, builder)
+    if isinstance(content, Slice):
+        builder.store_slice(content)
+    elif isinstance(content, Cell):
+        builder.store_cell(content)
+    elif isinstance(content, Builder):
+        builder.store_cell(content.end_cell())
+    for ref in refs:
+        builder.store_ref(ref)
+    return builder.end_cell()
+
+
+def parse_node(cell: Cell, m: int) -> typing.Tuple[str, Slice]:
+    if cell.type_ != CellTypes.ordinary:
+        raise DictError(f'can not walk dictionary through exotic cell {cell.hash.hex()}')
+    cs = cell.begin_parse()
+    _, label = deserialize_hml(cs, m)
+    return label.to01(), cs
+
+
+def _rebuild(node: Cell, path: list) -> Cell:
+    for label, m, bit, sibling in reversed(path):
+        node = build_node(label, m, refs=(sibling, node) if bit else (node, sibling))
+    return node
+
+
+def dict_get(root: typing.Optional[Cell], key: int, key_len: int) -> typing.Optional[Slice]:
+    """
+    :return: value Slice of the key or None
+    """
+    if root is None:
+        return None
+    bits = key_to_bits(key, key_len)
+    cell, pos, m = root, 0, key_len
+    while True:
+        label, cs = parse_node(cell, m)
+        if bits[pos:pos + len(label)] != label:
+            return None
+        pos += len(label)
+        m -= len(label)
+        if m == 0:
+            return cs
+        cell = cs.refs[int(bits[pos])]
+        pos += 1
+        m -= 1
+
+
+def dict_set(root: typing.Optional[Cell], key: int, key_len: int, value: Value) -> Cell:
+    """
+    Persistent set: returns new dictionary root, the old one stays valid.
+    Only cells on the path to the key are rebuilt, other subtrees are reused as is.
+    :param root: dictionary root cell (Hashmap, not HashmapE) or None for an empty dictionary
+    :param value: leaf value
+    """
+    bits = key_to_bits(key, key_len)
+    if root is None:
+        return build_node(bits, key_len, value)
+    path = []  # (label, m, bit, sibling) of forks on the way
+    cell, pos, m = root, 0, key_len
+    while True:
+        label, cs = parse_node(cell, m)
+        l = len(label)
+        common = 0
+        while common < l and label[common] == bits[pos + common]:
+            common += 1
+        if common < l:  # key diverges inside the label, split the edge
+            child_m = m - common - 1
+            old = build_node(label[common + 1:], child_m, cs)
+            new = build_node(bits[pos + common + 1:], child_m, value)
+            node = build_node(label[:common], m, refs=(old, new) if bits[pos + common] == '1' else (new, old))
+            break
+        if m == l:  # leaf with the same key
+            node = build_node(label, m, value)
+            break
+        bit = int(bits[pos + l])
+        path.append((label, m, bit, cs.refs[1 - bit]))
+        cell = cs.refs[bit]
+        pos += l + 1
+        m -= l + 1
+    return _rebuild(node, path)
+
+
+def dict_delete(root: typing.Optional[Cell], key: int, key_len: int) -> typing.Optional[Cell]:
+    """
+    Persistent delete: returns new dictionary root or None if the dictionary became empty.
+    If there is no such key the same root is returned.
+    """
+    if root is None:
+        return None
+    bits = key_to_bits(key, key_len)
+    path = []
+    cell, pos, m = root, 0, key_len
+    while True:
+        label, cs = parse_node(cell, m)
+        l = len(label)
+        if bits[pos:pos + l] != label:
+            return root
+        if m == l:
+            break
+        bit = int(bits[pos + l])
+        path.append((label, m, bit, cs.refs[1 - bit]))
+        cell = cs.refs[bit]
+        pos += l + 1
+        m -= l + 1
+    if not path:
+        return None
+    # the fork disappears, its label is joined with the remaining child's one
+    label, m, bit, sibling = path.pop()
+    sibling_label, sibling_cs = parse_node(sibling, m - len(label) - 1)
+    node = build_node(label + str(1 - bit) + sibling_label, m, sibling_cs)
+    return _rebuild(node, path)
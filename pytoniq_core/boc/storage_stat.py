@@ -0,0 +1,110 @@
+import typing
+
+from .cell import Cell
+
+
+class CellStorageStat:
+    """
+    Counts unique cells and bits of cell trees, shared subtrees are counted once.
+    Every unique cell keeps the number of references to it, so trees can be removed or replaced incrementally:
+    only cells that appear or disappear are visited.
+
+    Usage:
+        stat = CellStorageStat()
+        stat.add(root)
+        stat.cells, stat.bits
+        stat.replace(root, new_root)  # e.g. after one account changed in a state
+    """
+
+    def __init__(self, limit: typing.Optional[int] = None, bits_limit: typing.Optional[int] = None):
+        """
+        :param limit: max number of cells, add() stops counting and returns False when it is exceeded
+        :param bits_limit: max number of bits, same as limit
+        """
+        self.cells = 0
+        self.bits = 0
+        self.limit = limit
+        self.bits_limit = bits_limit
+        self.limit_exceeded = False
+        self._refs: typing.Dict[bytes, int] = {}  # {cell hash: references count}
+
+    def add(self, cell: Cell) -> bool:
+        """
+        :return: False if limit was exceeded, counting stops then and the stat must not be updated further
+        """
+        return self._add(cell, True)
+
+    def _add(self, cell: Cell, check_limits: bool) -> bool:
+        refs = self._refs
+        stack = [cell]
+        while stack:
+            c = stack.pop()
+            h = c.hash
+            count = refs.get(h, 0)
+            refs[h] = count + 1
+            if count:
+                continue
+            self.cells += 1
+            self.bits += len(c.bits)
+            if check_limits and self._exceeded():
+                self.limit_exceeded = True
+                return False
+            stack.extend(c.refs)
+        return True
+
+    def _exceeded(self) -> bool:
+        return (self.limit is not None and self.cells > self.limit) or \
+            (self.bits_limit is not None and self.bits > self.bits_limit)
+
+    def remove(self, cell: Cell) -> None:
+        refs = self._refs
+        stack = [cell]
+        while stack:
+            c = stack.pop()
+            h = c.hash
+            count = refs.get(h)
+            if count is None:
+                raise KeyError(f'cell {h.hex()} was not added')
+            if count > 1:
+                refs[h] = count - 1
+                continue
+            del refs[h]
+            self.cells -= 1
+            self.bits -= len(c.bits)
+            stack.extend(c.refs)
+
+    def replace(self, old: Cell, new: Cell) -> bool:
+        """
+        Replaces tree old with tree new, subtrees they share are not visited.
+        Limits are checked after the replacement, so only the new tree counts against them.
+        :return: False if limit was exceeded, the stat is left unchanged then
+        """
+        self._add(new, False)
+        self.remove(old)
+        if self._exceeded():
+            self._add(old, False)  # counts are restored exactly as add and remove are inverse
+            self.remove(new)
+            return False
+        return True
+
+    def __contains__(self, cell: Cell) -> bool:
+        return cell.hash in self._refs
+
+    def __repr__(self):
+        return f'<CellStorageStat cells={self.cells} bits={self.bits}>'
+
+
+def compute_storage_stat(cell: Cell, limit: typing.Optional[int] = None, bits_limit: typing.Optional[int] = None,
+                         skip_root: bool = False) -> CellStorageStat:
+    """
+    :param cell: root of the tree
+    :param limit: max cells to count, check .limit_exceeded of the result
+    :param bits_limit: max bits to count
+    :param skip_root: do not count the root cell (e.g. for message forward fees)
+    :return: CellStorageStat with .cells and .bits of unique cells
+    """
+    stat = CellStorageStat(limit, bits_limit)
+    for root in (cell.refs if skip_root else (cell,)):
+        if not stat.add(root):
+            break
+    return stat
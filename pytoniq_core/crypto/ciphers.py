@@ -68,16 +68,65 @@ class AdnlChannel:
             self.dec_key = self.channel_shared
         self.client_aes_key_id = get_key_aes_id(self.enc_key)
         self.server_aes_key_id = get_key_aes_id(self.dec_key)
+        # AES key and IV of a packet are key[0:16] + checksum[16:32] and checksum[0:4] + key[20:32]
+        self._enc_parts = (self.enc_key[0:16], self.enc_key[20:32])
+        self._dec_parts = (self.dec_key[0:16], self.dec_key[20:32])
+
+    @staticmethod
+    def _cipher(parts: typing.Tuple[bytes, bytes], checksum) -> typing.Any:
+        return AES.new(parts[0] + checksum[16:32], AES.MODE_CTR, initial_value=checksum[0:4] + parts[1], nonce=b'')
 
     def encrypt(self, data: bytes) -> bytes:
-        checksum = hashlib.sha256(data).digest()
-        enc_cipher = create_aes_ctr_sipher_from_key_n_data(self.enc_key, checksum)
-        data = aes_ctr_encrypt(enc_cipher, data)
-        return self.client_aes_key_id + checksum + data
+        out = bytearray(64 + len(data))
+        self.encrypt_into(data, out)
+        return bytes(out)
 
     def decrypt(self, encrypted_data: bytes, checksum: bytes) -> bytes:
-        dec_cipher = create_aes_ctr_sipher_from_key_n_data(self.dec_key, checksum)
-        return aes_ctr_decrypt(dec_cipher, encrypted_data)
+        return self._cipher(self._dec_parts, checksum).decrypt(encrypted_data)
+
+    def encrypt_into(self, data: typing.Union[bytes, bytearray, memoryview], out: typing.Union[bytearray, memoryview],
+                     offset: int = 0) -> int:
+        """
+        Writes packet key_id + checksum + encrypted data into out without intermediate copies.
+        :return: number of bytes written (64 + len(data))
+        """
+        out = memoryview(out)
+        size = 64 + len(data)
+        if len(out) - offset < size:
+            raise ValueError(f'buffer is too small: {size} bytes needed at {offset}')
+        checksum = hashlib.sha256(data).digest()
+        out[offset: offset + 32] = self.client_aes_key_id
+        out[offset + 32: offset + 64] = checksum
+        self._cipher(self._enc_parts, checksum).encrypt(data, output=out[offset + 64: offset + size])
+        return size
+
+    def decrypt_into(self, encrypted_data: typing.Union[bytes, bytearray, memoryview], checksum: bytes,
+                     out: typing.Union[bytearray, memoryview], offset: int = 0) -> int:
+        """
+        :return: number of bytes written (len(encrypted_data))
+        """
+        size = len(encrypted_data)
+        self._cipher(self._dec_parts, checksum).decrypt(encrypted_data, output=memoryview(out)[offset: offset + size])
+        return size
+
+    def encrypt_many(self, packets: typing.Sequence[typing.Union[bytes, bytearray, memoryview]],
+                     out: typing.Optional[bytearray] = None) -> typing.List[memoryview]:
+        """
+        Encrypts packets one after another into a single buffer.
+        :param out: buffer to reuse, a new one is allocated if it is missing or too small
+        :return: views of the encrypted packets in the buffer
+        """
+        total = sum(64 + len(i) for i in packets)
+        if out is None or len(out) < total:
+            out = bytearray(total)
+        view = memoryview(out)
+        result = []
+        offset = 0
+        for data in packets:
+            size = self.encrypt_into(data, view, offset)
+            result.append(view[offset: offset + size])
+            offset += size
+        return result
 
 
 def get_random(bytes_size: int) -> bytes:
@@ -122,4 +171,4 @@ def get_shared_key(private_key: bytes, public_key: bytes) -> bytes:
 
 
 def get_signature(private_key: ed25519Private, message: bytes) -> bytes:
-    return ed25519Private(seed=private_key.encode()).sign(message)[:64]
+    return private_key.sign(message).signature
@@ -2,7 +2,8 @@ import hashlib
 import os
 import hmac
 import math
-from typing import List, Optional, Tuple
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Callable, List, Optional, Tuple
 
 
 from nacl.bindings import crypto_sign_seed_keypair, crypto_sign_ed25519_sk_to_pk
@@ -92,3 +93,55 @@ def mnemonic_new(words_count: int = 24, password: Optional[str] = None) -> List[
 
     return mnemo_arr
 
+
+def _run_chunks(func: Callable[[list], list], items: list, workers: Optional[int],
+                executor: Optional[Executor] = None) -> list:
+    """
+    Applies func to chunks of items in a process pool, PBKDF2 rounds are CPU bound.
+    Without executor a new ProcessPoolExecutor is started and shut down on every call, which takes
+    tens of milliseconds per worker, pass a long-lived executor to batch APIs called repeatedly.
+    """
+    if executor is None:
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers <= 1 or len(items) <= 1:
+            return func(items)
+        with ProcessPoolExecutor(workers) as pool:
+            return _run_chunks(func, items, workers, pool)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    size = -(-len(items) // (workers * 4))
+    result = []
+    for part in executor.map(func, [items[i: i + size] for i in range(0, len(items), size)]):
+        result.extend(part)
+    return result
+
+
+def _mnemonic_new_chunk(args: list) -> List[List[str]]:
+    return [mnemonic_new(words_count, password) for words_count, password in args]
+
+
+def mnemonic_new_many(count: int, words_count: int = 24, password: Optional[str] = None, workers: Optional[int] = None,
+                      executor: Optional[Executor] = None) -> List[List[str]]:
+    """
+    Same as mnemonic_new() for a batch, generated in a process pool.
+    :param workers: number of processes, os.cpu_count() by default, 1 to run in the current process
+    :param executor: pool to use instead of starting a new ProcessPoolExecutor
+    """
+    return _run_chunks(_mnemonic_new_chunk, [(words_count, password)] * count, workers, executor)
+
+
+def _wallet_key_chunk(args: list) -> List[Tuple[bytes, bytes]]:
+    return [mnemonic_to_wallet_key(mnemo_words, password) for mnemo_words, password in args]
+
+
+def mnemonic_to_wallet_key_many(mnemonics: List[List[str]], password: Optional[str] = None,
+                                workers: Optional[int] = None,
+                                executor: Optional[Executor] = None) -> List[Tuple[bytes, bytes]]:
+    """
+    Same as mnemonic_to_wallet_key() for a batch, derived in a process pool.
+    :param workers: number of processes, os.cpu_count() by default, 1 to run in the current process
+    :param executor: pool to use instead of starting a new ProcessPoolExecutor
+    :rtype: [(bytes(public_key), bytes(secret_key)), ...]
+    """
+    return _run_chunks(_wallet_key_chunk, [(list(i), password) for i in mnemonics], workers, executor)
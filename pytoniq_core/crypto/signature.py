@@ -1,10 +1,54 @@
-from nacl.signing import VerifyKey, exc, SignedMessage
-from nacl.bindings import crypto_sign, crypto_sign_BYTES
+import functools
+import os
+import typing
+from concurrent.futures import Executor, ThreadPoolExecutor
+
+from nacl.signing import VerifyKey, exc
+from nacl.bindings import crypto_sign, crypto_sign_open, crypto_sign_BYTES, crypto_sign_seed_keypair, \
+    crypto_sign_SEEDBYTES, crypto_sign_SECRETKEYBYTES
 import nacl.encoding
 
 
+min_batch = 64  # smaller batches are processed in the calling thread
+_executor: typing.Optional[ThreadPoolExecutor] = None
+
+
+def _get_executor() -> typing.Optional[Executor]:
+    global _executor
+    if _executor is None and (os.cpu_count() or 1) > 1:
+        _executor = ThreadPoolExecutor(os.cpu_count(), thread_name_prefix='pytoniq-crypto')
+    return _executor
+
+
+def run_batch(func: typing.Callable[[list], list], items: typing.Sequence, executor: typing.Optional[Executor] = None) -> list:
+    """
+    Applies func to chunks of items on a thread pool, libsodium releases the GIL so chunks run in parallel.
+    :param func: takes a list of items and returns a list of results
+    :return: results in the order of items
+    """
+    items = list(items)
+    if executor is None:
+        executor = _get_executor()
+    if executor is None or len(items) < min_batch:
+        return func(items)
+    chunks = (os.cpu_count() or 1) * 4
+    size = -(-len(items) // chunks)
+    result = []
+    for part in executor.map(func, [items[i: i + size] for i in range(0, len(items), size)]):
+        result.extend(part)
+    return result
+
+
+@functools.lru_cache(maxsize=4096)
+def get_verify_key(public_key: bytes) -> VerifyKey:
+    """
+    :return: checked VerifyKey, the same validator / wallet keys are met again and again so they are LRU cached
+    """
+    return VerifyKey(public_key)
+
+
 def verify_sign(public_key: bytes, signed_message: bytes, signature: bytes):
-    key = VerifyKey(public_key)
+    key = get_verify_key(public_key)
     try:
         key.verify(signed_message, signature)
         return True
@@ -12,13 +56,61 @@ def verify_sign(public_key: bytes, signed_message: bytes, signature: bytes):
         return False
 
 
+def _verify_chunk(items: list) -> typing.List[bool]:
+    result = []
+    for public_key, message, signature in items:
+        try:
+            crypto_sign_open(signature + message, bytes(get_verify_key(public_key)))
+            result.append(len(signature) == crypto_sign_BYTES)
+        except (exc.BadSignatureError, exc.ValueError):
+            result.append(False)
+    return result
+
+
+def verify_many(items: typing.Iterable[typing.Tuple[bytes, bytes, bytes]],
+                executor: typing.Optional[Executor] = None) -> typing.List[bool]:
+    """
+    :param items: (public_key, message, signature) triples
+    :param executor: pool to use, by default a shared thread pool (if there are several CPUs)
+    :return: True for each valid signature, False otherwise
+    """
+    return run_batch(_verify_chunk, items, executor)
+
+
 def sign_message(message: bytes,
                  signing_key,
                  encoder: nacl.encoding.Encoder = nacl.encoding.RawEncoder, ) -> bytes:
-    raw_signed = crypto_sign(message, signing_key)
+    return encoder.encode(crypto_sign(message, signing_key)[:crypto_sign_BYTES])
+
+
+class Signer:
+    """
+    Keeps the expanded ed25519 secret key, so the key pair is derived from the seed only once.
+
+    Usage:
+        signer = Signer(private_key)  # 32 bytes seed or 64 bytes secret key (e.g. from mnemonic_to_private_key)
+        signer.sign(body.hash)
+        signer.sign_many([body.hash for body in bodies])  # -> [signature, ...]
+    """
+
+    def __init__(self, private_key: bytes):
+        if len(private_key) == crypto_sign_SEEDBYTES:
+            self.public_key, self._secret_key = crypto_sign_seed_keypair(private_key)
+        elif len(private_key) == crypto_sign_SECRETKEYBYTES:
+            self.public_key, self._secret_key = private_key[32:], private_key
+        else:
+            raise ValueError(f'private key must be {crypto_sign_SEEDBYTES} or {crypto_sign_SECRETKEYBYTES} bytes long')
+
+    def sign(self, message: bytes) -> bytes:
+        return crypto_sign(message, self._secret_key)[:crypto_sign_BYTES]
 
-    signature = encoder.encode(raw_signed[:crypto_sign_BYTES])
-    message = encoder.encode(raw_signed[crypto_sign_BYTES:])
-    signed = encoder.encode(raw_signed)
+    def _sign_chunk(self, messages: list) -> list:
+        secret_key = self._secret_key
+        return [crypto_sign(m, secret_key)[:crypto_sign_BYTES] for m in messages]
 
-    return SignedMessage._from_parts(signature, message, signed).signature
+    def sign_many(self, messages: typing.Iterable[bytes], executor: typing.Optional[Executor] = None) -> typing.List[bytes]:
+        """
+        :param executor: pool to use, by default a shared thread pool (if there are several CPUs)
+        :return: signatures in the order of messages
+        """
+        return run_batch(self._sign_chunk, messages, executor)
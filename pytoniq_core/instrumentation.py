@@ -0,0 +1,184 @@
+import contextlib
+import sys
+import threading
+import time
+import typing
+
+
+_lock = threading.Lock()
+_active = 0  # number of entered instrument() blocks
+_patches: typing.List[typing.Tuple[object, str, typing.Any]] = []  # (owner, attribute, original)
+
+_counters = {'cells': 0, 'hashes': 0, 'bits_copied': 0, 'dict_nodes': 0, 'tl_objects': 0}
+_tlb: typing.Dict[str, typing.List[float]] = {}  # {class name: [calls, seconds]}
+_tlb_depth: typing.Dict[str, int] = {}  # nesting of deserialize calls of the class, only the outer one is timed
+
+
+class InstrumentationStats:
+    """
+    Counters collected since the instrument() block was entered:
+        cells - Cell objects constructed
+        hashes - SHA-256 cell hashes computed
+        bits_copied - bits copied by TvmBitarray extend / frombytes and Slice.preload_bits
+        dict_nodes - dictionary nodes parsed
+        tl_objects - TL objects decoded
+        tlb - {TlbScheme class name: (deserialize calls, seconds)}, nested calls of other classes are included
+    """
+
+    def __init__(self):
+        self._start = self._current()
+        self._final: typing.Optional[dict] = None
+
+    @staticmethod
+    def _current() -> dict:
+        result = dict(_counters)
+        result['tlb'] = {k: tuple(v) for k, v in _tlb.items()}
+        return result
+
+    def snapshot(self) -> dict:
+        """
+        :return: counters since the block start, frozen when the block exits
+        """
+        if self._final is not None:
+            return self._final
+        current = self._current()
+        result = {k: current[k] - self._start[k] for k in _counters}
+        start_tlb = self._start['tlb']
+        tlb = {}
+        for name, (calls, seconds) in current['tlb'].items():
+            start_calls, start_seconds = start_tlb.get(name, (0, 0.0))
+            if calls > start_calls:
+                tlb[name] = (calls - start_calls, seconds - start_seconds)
+        result['tlb'] = tlb
+        return result
+
+    def _freeze(self):
+        self._final = self.snapshot()
+
+    def __repr__(self):
+        return f'<InstrumentationStats {self.snapshot()}>'
+
+
+def _patch(owner: object, name: str, wrapper: typing.Callable[[typing.Any], typing.Any]) -> None:
+    original = owner.__dict__[name]
+    _patches.append((owner, name, original))
+    setattr(owner, name, wrapper(original))
+
+
+def _patch_function(func: typing.Callable, wrapper: typing.Callable[[typing.Callable], typing.Callable]) -> None:
+    """
+    Replaces the function in every pytoniq_core module it is imported to.
+    """
+    wrapped = wrapper(func)
+    for module_name, module in list(sys.modules.items()):
+        if module_name.split('.')[0] == 'pytoniq_core' and module is not None:
+            for name, value in list(vars(module).items()):
+                if value is func:
+                    _patches.append((module, name, func))
+                    setattr(module, name, wrapped)
+
+
+def _counting(key: str, amount: typing.Optional[typing.Callable] = None):
+    def wrapper(func):
+        def wrapped(*args, **kwargs):
+            _counters[key] += 1 if amount is None else amount(*args)
+            return func(*args, **kwargs)
+        return wrapped
+    return wrapper
+
+
+def _counting_hashes(func):
+    def wrapped(self):
+        result = func(self)
+        _counters['hashes'] += len(self._hashes)
+        return result
+    return wrapped
+
+
+def _timing(name: str):
+    def wrapper(method):
+        func = method.__func__
+
+        def wrapped(cls, *args, **kwargs):
+            depth = _tlb_depth.get(name, 0)
+            _tlb_depth[name] = depth + 1
+            t = time.perf_counter()
+            try:
+                return func(cls, *args, **kwargs)
+            finally:
+                _tlb_depth[name] = depth
+                stat = _tlb.setdefault(name, [0, 0.0])
+                stat[0] += 1
+                if not depth:
+                    stat[1] += time.perf_counter() - t
+        return classmethod(wrapped)
+    return wrapper
+
+
+def _tlb_classes(base: type) -> typing.Iterator[type]:
+    stack = list(base.__subclasses__())
+    seen = set()
+    while stack:
+        cls = stack.pop()
+        if cls in seen:
+            continue
+        seen.add(cls)
+        stack.extend(cls.__subclasses__())
+        yield cls
+
+
+def _install() -> None:
+    from .boc.cell import Cell
+    from .boc.slice import Slice
+    from .boc.tvm_bitarray import TvmBitarray
+    from .boc.hashmap import parse, edit
+    from .tl.generator import TlSchemas
+    from .tlb.tlb import TlbScheme
+    from . import tlb  # all schemes are subclassed on import
+
+    _patch(Cell, '__init__', _counting('cells'))
+    _patch(Cell, 'calculate_hashes', _counting_hashes)
+    _patch(TvmBitarray, 'extend', _counting('bits_copied', lambda self, x: len(x)))
+    _patch(TvmBitarray, 'frombytes', _counting('bits_copied', lambda self, a: len(a) * 8))
+    _patch(Slice, 'preload_bits', _counting('bits_copied', lambda self, length: length))
+    _patch(TlSchemas, '_deserialize_fields', _counting('tl_objects'))
+    for func in (parse.parse, parse.parse_aug, edit.parse_node):
+        _patch_function(func, _counting('dict_nodes'))
+    for cls in _tlb_classes(TlbScheme):
+        if isinstance(cls.__dict__.get('deserialize'), classmethod):
+            _patch(cls, 'deserialize', _timing(cls.__name__))
+
+
+def _uninstall() -> None:
+    while _patches:
+        owner, name, original = _patches.pop()
+        setattr(owner, name, original)
+
+
+@contextlib.contextmanager
+def instrument() -> typing.Iterator[InstrumentationStats]:
+    """
+    Counts hot path operations inside the block:
+        with instrument() as stats:
+            block = Block.deserialize(Cell.one_from_boc(block_boc).begin_parse())  # 9882 bytes masterchain block
+        stats.snapshot()  # {'cells': 316, 'hashes': 481, 'bits_copied': 95208, 'dict_nodes': 302, 'tl_objects': 0,
+                          #  'tlb': {'Block': (1, 0.0064), 'MerkleUpdate': (1, 0.0041), 'ShardState': (2, 0.0041), ...}}
+
+    Counted functions are wrapped when the first block is entered and restored when the last one exits,
+    so there is no overhead outside of instrument() blocks. Blocks may be nested, counters are process-wide:
+    operations of other threads running at the same time are counted too.
+    """
+    global _active
+    with _lock:
+        if not _active:
+            _install()
+        _active += 1
+    stats = InstrumentationStats()
+    try:
+        yield stats
+    finally:
+        stats._freeze()
+        with _lock:
+            _active -= 1
+            if not _active:
+                _uninstall()
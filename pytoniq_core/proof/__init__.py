@@ -1 +1,3 @@
-from .check_proof import ProofError, check_proof, check_block_header_proof, check_shard_proof, check_account_proof, check_block_signatures, compute_validator_set, calculate_node_id_short
\ No newline at end of file
+from .check_proof import ProofError, check_proof, check_block_header_proof, check_shard_proof, check_account_proof, check_block_signatures, compute_validator_set, calculate_node_id_short
+from .navigator import StateNavigator, PrunedBranchError
+from .merkle_update import MerkleUpdateError, apply_merkle_update, create_merkle_update
@@ -5,7 +5,7 @@ import typing
 from ..tlb.block import Block, ShardStateUnsplit
 from ..tlb.config import ValidatorDescr, CatchainConfig, ValidatorSet
 from ..tl.block import BlockId, BlockIdExt
-from ..crypto.signature import verify_sign
+from ..crypto.signature import verify_many
 from ..boc.tvm_bitarray import TvmBitarray
 from ..boc.exotic import CellTypes
 from ..boc.cell import Cell
@@ -130,22 +130,20 @@ def check_block_signatures(nodes: typing.List[ValidatorDescr], signatures: typin
         node_map[calculate_node_id_short(node.public_key.pubkey)] = node
 
     to_sign = b'pn\x0b\xc5' + blk.root_hash + blk.file_hash  # bytes.fromhex('c50b6e70')[::-1] - magic
-    i = 0
+    to_verify = []
     for sig in signatures:
         node = node_map.get(bytes.fromhex(sig['node_id_short']))
         node: ValidatorDescr
-        i += 1
 
         if node is None:
             raise ProofError('cannot find node_id_short in validator list')
 
-        result = verify_sign(public_key=node.public_key.pubkey, signed_message=to_sign, signature=sig['signature'])
-
-        if not result:
-            raise ProofError('invalid signature!')
-
+        to_verify.append((node.public_key.pubkey, to_sign, sig['signature']))
         signed_weight += node.weight
 
+    if not all(verify_many(to_verify)):
+        raise ProofError('invalid signature!')
+
     if signed_weight * 3 >= total_weight * 2:  # >= 2/3
         return
 
@@ -0,0 +1,151 @@
+import heapq
+import typing
+
+from .check_proof import ProofError
+from ..boc.cell import Cell
+from ..boc.builder import Builder
+from ..boc.exotic import CellTypes
+
+
+class MerkleUpdateError(ProofError):
+    pass
+
+
+def prune(cell: Cell) -> Cell:
+    """
+    :return: level 1 pruned branch standing for the level 0 cell
+    """
+    return Builder(type_=CellTypes.pruned_branch) \
+        .store_uint(1, 8) \
+        .store_uint(1, 8) \
+        .store_bytes(cell.get_hash(0)) \
+        .store_uint(cell.get_depth(0), 16) \
+        .end_cell()
+
+
+def _known_cells(old_side: Cell, old_root: Cell) -> typing.Dict[bytes, Cell]:
+    """
+    Walks the old side of an update together with the real old state.
+    :return: {hash: cell} of old state cells the update may refer to: visited ones and those pruned in the old side
+    """
+    known = {}
+    stack = [(old_side, old_root)]
+    while stack:
+        u, o = stack.pop()
+        h = o.hash
+        if h in known:
+            continue
+        known[h] = o
+        if u.type_ == CellTypes.pruned_branch:
+            continue
+        if len(u.refs) != len(o.refs) or u.bits != o.bits:
+            raise MerkleUpdateError(f'old state does not match update at cell {h.hex()}')
+        stack.extend(zip(u.refs, o.refs))
+    return known
+
+
+def _rebuild(root: Cell, replace: typing.Callable[[Cell], typing.Optional[Cell]]) -> Cell:
+    """
+    Rebuilds tree bottom-up without recursion.
+    :param replace: returns a cell to put instead of the given one or None to rebuild it from its rebuilt refs
+    """
+    built: typing.Dict[bytes, Cell] = {}
+    stack = [(root, False)]
+    while stack:
+        cell, ready = stack.pop()
+        h = cell.hash
+        if h in built:
+            continue
+        if not ready:
+            new = replace(cell)
+            if new is not None:
+                built[h] = new
+                continue
+            stack.append((cell, True))
+            stack.extend((r, False) for r in cell.refs if r.hash not in built)
+            continue
+        refs = [built[r.hash] for r in cell.refs]
+        if all(i is j for i, j in zip(refs, cell.refs)):
+            built[h] = cell
+        else:
+            built[h] = Cell(cell.bits, refs, cell.type_)
+    return built[root.hash]
+
+
+def apply_merkle_update(update: Cell, old_root: Cell) -> Cell:
+    """
+    Materializes the new state from the old one, e.g. from Block.state_update.
+    Subtrees unchanged by the update are taken from old_root as is, only cells present in the update are rebuilt.
+    :param update: MERKLE_UPDATE cell
+    :param old_root: full (or at least covering the update) old state root
+    :return: new state root, its hash is checked against new_hash of the update
+    """
+    if update.type_ != CellTypes.merkle_update:
+        raise MerkleUpdateError('not a merkle update cell')
+    cs = update.begin_parse()
+    cs.skip_bits(8)
+    old_hash = cs.load_bytes(32)
+    new_hash = cs.load_bytes(32)
+    old_side, new_side = update.refs
+    if old_side.get_hash(0) != old_hash:
+        raise MerkleUpdateError('old side hash mismatch')
+    if new_side.get_hash(0) != new_hash:
+        raise MerkleUpdateError('new side hash mismatch')
+    if old_root.hash != old_hash:
+        raise MerkleUpdateError(f'update is for state {old_hash.hex()}, got {old_root.hash.hex()}')
+
+    known = _known_cells(old_side, old_root)
+
+    def replace(cell: Cell) -> typing.Optional[Cell]:
+        if cell.level_mask.mask == 0:  # nothing pruned inside
+            return cell
+        if cell.type_ == CellTypes.pruned_branch and cell.level_mask.mask & 1:
+            result = known.get(cell.get_hash(0))
+            if result is None:
+                raise MerkleUpdateError(f'update refers to unknown old cell {cell.get_hash(0).hex()}')
+            return result
+        return None
+
+    result = _rebuild(new_side, replace)
+    if result.hash != new_hash:
+        raise MerkleUpdateError(f'new state hash mismatch: expected {new_hash.hex()}, got {result.hash.hex()}')
+    return result
+
+
+def create_merkle_update(old_root: Cell, new_root: Cell) -> Cell:
+    """
+    Builds MERKLE_UPDATE cell turning old_root into new_root.
+    Both trees are expanded together from the deepest cells down, a cell is not expanded if a cell with the same hash
+    is already reachable in the other tree, so the cost is proportional to the changed part.
+    Both states must be of level 0 (not contain pruned branches themselves).
+    """
+    if old_root.level_mask.mask or new_root.level_mask.mask:
+        raise MerkleUpdateError('states must not contain pruned branches')
+    # a cell is reached only through cells of greater depth, so when a cell is popped
+    # all cells of the same depth are already reached in both trees
+    reached = ({old_root.hash}, {new_root.hash})  # by side: 0 - old, 1 - new
+    expanded = (set(), set())
+    queue = [(-old_root.get_depth(0), 0, 0, old_root), (-new_root.get_depth(0), 1, 1, new_root)]
+    counter = 2
+    while queue:
+        _, _, side, cell = heapq.heappop(queue)
+        h = cell.hash
+        if h in expanded[side] or h in reached[1 - side]:
+            continue
+        expanded[side].add(h)
+        for r in cell.refs:
+            reached[side].add(r.hash)
+            heapq.heappush(queue, (-r.get_depth(0), counter, side, r))
+            counter += 1
+
+    old_side = _rebuild(old_root, lambda c: None if c.hash in expanded[0] else prune(c))
+    new_side = _rebuild(new_root, lambda c: None if c.hash in expanded[1] else prune(c))
+    return Builder(type_=CellTypes.merkle_update) \
+        .store_uint(CellTypes.merkle_update, 8) \
+        .store_bytes(old_root.hash) \
+        .store_bytes(new_root.hash) \
+        .store_uint(old_root.get_depth(0), 16) \
+        .store_uint(new_root.get_depth(0), 16) \
+        .store_ref(old_side) \
+        .store_ref(new_side) \
+        .end_cell()
@@ -0,0 +1,208 @@
+import typing
+
+from bitarray.util import ba2int
+
+from .check_proof import ProofError
+from ..boc.cell import Cell
+from ..boc.slice import Slice
+from ..boc.address import Address
+from ..boc.exotic import CellTypes
+from ..boc.hashmap.parse import deserialize_hml
+from ..tlb.account import ShardAccount
+from ..tlb.block import DepthBalanceInfo, ShardDescr
+
+
+class PrunedBranchError(ProofError):
+    """
+    Raised when a lookup hits a pruned branch.
+    .hash and .depth are the level 0 hash and depth of the missing subtree,
+    so exactly that piece can be requested from a liteserver.
+    """
+
+    def __init__(self, path: tuple, cell: Cell, key_prefix: typing.Optional[str] = None):
+        self.path = path
+        self.cell = cell
+        self.key_prefix = key_prefix  # dictionary key bits consumed before the pruned node
+        self.hash = cell.get_hash(0)
+        self.depth = cell.get_depth(0)
+        text = f'pruned branch {self.hash.hex()} at {" -> ".join(str(i) for i in path)}'
+        if key_prefix is not None:
+            text += f' (key prefix {key_prefix or "<root>"})'
+        super().__init__(text)
+
+
+class StateNavigator:
+    """
+    Lazy navigator over ShardStateUnsplit cells that may contain pruned branches (e.g. from proofs).
+    Nothing is deserialized until a path is resolved, and only cells on that path are touched.
+
+    Usage:
+        nav = StateNavigator(state_proof_cell)
+        nav.resolve('accounts', address)  # -> ShardAccount or None
+        nav.resolve('custom', 'shard_hashes', 0)  # -> [ShardDescr, ...]
+        nav.resolve('custom', 'config', 34)  # -> Cell or None
+
+    If some cell on the path is pruned, PrunedBranchError is raised.
+    """
+
+    def __init__(self, root: Cell):
+        if root.type_ == CellTypes.merkle_proof:
+            root = root[0]
+        self.root = root
+
+    @staticmethod
+    def check(cell: Cell, path: tuple, key_prefix: typing.Optional[str] = None) -> Cell:
+        if cell.type_ == CellTypes.pruned_branch:
+            raise PrunedBranchError(path, cell, key_prefix)
+        return cell
+
+    @classmethod
+    def lookup(cls, cell: Cell, key: int, key_len: int, path: tuple) -> typing.Optional[Slice]:
+        """
+        :return: Slice of the leaf value found by walking the Patricia labels, or None if there is no such key
+        """
+        n = key_len
+        prefix = ''
+        while True:
+            cs = cls.check(cell, path, prefix).begin_parse()
+            l, label = deserialize_hml(cs, n)
+            if l:
+                if ba2int(label, signed=False) != (key >> (n - l)) & ((1 << l) - 1):
+                    return None
+                prefix += label.to01()
+            n -= l
+            if n == 0:
+                return cs
+            n -= 1
+            bit = (key >> n) & 1
+            prefix += str(bit)
+            cell = cs.refs[bit]
+
+    def _state(self) -> Slice:
+        path = ('state',)
+        cs = self.check(self.root, path).begin_parse()
+        tag = cs.load_bytes(4)
+        if tag != b'\x90#\xaf\xe2':
+            raise ProofError(f'expected ShardStateUnsplit, got prefix tag: {tag}')
+        return cs
+
+    def accounts(self) -> typing.Optional[Cell]:
+        """
+        :return: root cell of ShardAccounts HashmapAug or None if there are no accounts
+        """
+        path = ('accounts',)
+        cs = self.check(self._state().refs[1], path).begin_parse()
+        return cs.load_ref() if cs.load_bit() else None
+
+    def get_account(self, key: typing.Union[int, bytes, Address]) -> typing.Optional[ShardAccount]:
+        if isinstance(key, Address):
+            key = key.hash_part
+        if isinstance(key, bytes):
+            key = int.from_bytes(key, 'big')
+        path = ('accounts', key)
+        dict_root = self.accounts()
+        if dict_root is None:
+            return None
+        leaf = self.lookup(dict_root, key, 256, path)
+        if leaf is None:
+            return None
+        DepthBalanceInfo.deserialize(leaf)  # extra
+        account_ref = leaf.preload_ref()
+        if account_ref.type_ == CellTypes.pruned_branch:
+            # the account itself is usually pruned in proofs, keep the cell to check its hash
+            cell = leaf.to_cell()
+            leaf.load_ref()
+            return ShardAccount(None, leaf.load_bytes(32), leaf.load_uint(64), cell)
+        return ShardAccount.deserialize(leaf)
+
+    def custom(self) -> typing.Optional[Cell]:
+        """
+        :return: McStateExtra cell or None for non masterchain states
+        """
+        cs = self._state()
+        cs.skip_bits(32 + 104 + 32 * 3 + 64 + 32)  # global_id, shard_id, seq_no, vert_seq_no, gen_utime, gen_lt, min_ref_mc_seqno
+        cs.skip_bits(1)  # before_split
+        if not cs.load_bit():
+            return None
+        return self.check(cs.refs[3], ('custom',))
+
+    def _custom_slice(self) -> typing.Optional[Slice]:
+        custom = self.custom()
+        if custom is None:
+            return None
+        cs = custom.begin_parse()
+        tag = cs.load_bytes(2)
+        if tag != b'\xcc&':
+            raise ProofError(f'expected McStateExtra, got prefix tag: {tag}')
+        return cs
+
+    def shard_hashes(self) -> typing.Optional[Cell]:
+        path = ('custom', 'shard_hashes')
+        cs = self._custom_slice()
+        if cs is None or not cs.load_bit():
+            return None
+        return self.check(cs.load_ref(), path)
+
+    def get_shard_descrs(self, workchain: int) -> typing.Optional[typing.List[ShardDescr]]:
+        path = ('custom', 'shard_hashes', workchain)
+        dict_root = self.shard_hashes()
+        if dict_root is None:
+            return None
+        leaf = self.lookup(dict_root, workchain & 0xFFFFFFFF, 32, path)
+        if leaf is None:
+            return None
+        result = []
+        stack = [(leaf.load_ref(), '')]
+        while stack:  # BinTree in left to right order
+            cell, shard_prefix = stack.pop()
+            cs = self.check(cell, path, shard_prefix).begin_parse()
+            if cs.load_bit():
+                stack.append((cs.refs[1], shard_prefix + '1'))
+                stack.append((cs.refs[0], shard_prefix + '0'))
+            else:
+                result.append(ShardDescr.deserialize(cs))
+        return result
+
+    def config(self) -> typing.Optional[Cell]:
+        path = ('custom', 'config')
+        cs = self._custom_slice()
+        if cs is None:
+            return None
+        if cs.load_bit():
+            cs.load_ref()  # shard_hashes
+        cs.skip_bits(256)  # config_addr
+        return self.check(cs.load_ref(), path)
+
+    def get_config_param(self, param: int) -> typing.Optional[Cell]:
+        path = ('custom', 'config', param)
+        dict_root = self.config()
+        if dict_root is None:
+            return None
+        leaf = self.lookup(dict_root, param & 0xFFFFFFFF, 32, path)
+        if leaf is None:
+            return None
+        return self.check(leaf.load_ref(), path)
+
+    def resolve(self, *path):
+        """
+        :param path: ('accounts',), ('accounts', key), ('custom',), ('custom', 'shard_hashes'[, wc]), ('custom', 'config'[, param])
+        """
+        if path[:1] == ('accounts',):
+            if len(path) == 1:
+                return self.accounts()
+            if len(path) == 2:
+                return self.get_account(path[1])
+        elif path[:1] == ('custom',):
+            if len(path) == 1:
+                return self.custom()
+            if path[1] == 'shard_hashes':
+                if len(path) == 2:
+                    return self.shard_hashes()
+                if len(path) == 3:
+                    return self.get_shard_descrs(path[2])
+            elif path[1] == 'config':
+                if len(path) == 2:
+                    return self.config()
+                if len(path) == 3:
+                    return self.get_config_param(path[2])
+        raise ProofError(f'unknown state path: {path}')
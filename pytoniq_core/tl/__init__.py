@@ -1,2 +1,3 @@
 from .block import BlockId, BlockIdExt
-from .generator import TlGenerator, TlSchema, TlError, TlSchemas, TlRegistrator
\ No newline at end of file
+from .generator import TlGenerator, TlSchema, TlError, TlSchemas, TlRegistrator, TlTraceEvent, log_trace
+from .classes import TlClassGenerator, TlObject
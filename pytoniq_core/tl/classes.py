@@ -0,0 +1,367 @@
+import keyword
+import types
+import typing
+
+from .generator import TlSchemas, TlSchema, TlError, TL_INT, TL_HEX, TL_BOOL, TL_BYTES, TL_STRING, TL_VECTOR, TL_BARE, \
+    TL_BOXED, BOOL_TRUE, BOOL_FALSE
+
+
+BOOL_MAP = {BOOL_TRUE: True, BOOL_FALSE: False}
+
+# pseudo schemas from tl files describing built-in types, they are handled by the codec itself
+BUILTIN_NAMES = {'int', 'long', 'double', 'string', 'object', 'function', 'bytes', 'true', 'boolTrue', 'boolFalse',
+                 'vector', 'int128', 'int256'}
+
+PY_TYPES = {TL_INT: 'int', TL_HEX: 'bytes', TL_BOOL: 'bool', TL_BYTES: 'bytes', TL_STRING: 'str', TL_VECTOR: 'list',
+            TL_BOXED: 'TlObject'}
+
+
+def read_bytes(data: memoryview, i: int) -> typing.Tuple[bytes, int]:
+    if data[i] == 0xFE:
+        byte_len = int.from_bytes(data[i + 1:i + 4], 'little')
+        attach_len = 4
+    else:
+        byte_len = data[i]
+        attach_len = 1
+    i += attach_len
+    value = bytes(data[i:i + byte_len])
+    i += byte_len
+    if (byte_len + attach_len) % 4:
+        i += 4 - (byte_len + attach_len) % 4
+    return value, i
+
+
+def read_string(data: memoryview, i: int) -> typing.Tuple[str, int]:
+    value, i = read_bytes(data, i)
+    return value.decode(), i
+
+
+def write_bytes(buf: bytearray, value: typing.Union[bytes, str]) -> None:
+    if isinstance(value, str):
+        value = value.encode()
+    bytes_len = len(value)
+    if bytes_len <= 253:
+        buf.append(bytes_len)
+        attach_len = 1
+    else:
+        buf += b'\xFE' + bytes_len.to_bytes(length=3, byteorder='little')
+        attach_len = 4
+    buf += value
+    if (bytes_len + attach_len) % 4:
+        buf += b'\x00' * (4 - (bytes_len + attach_len) % 4)
+
+
+class TlObject:
+    """
+    Base class for generated TL classes, see TlClassGenerator.
+    Subclasses define __slots__ with schema fields and precompiled _encode / _decode methods.
+    """
+    __slots__ = ()
+
+    TL_NAME: str = None
+    TL_CLASS: str = None
+    TL_ID: bytes = None  # little endian, as on the wire
+    TL_FIELDS: typing.Tuple[typing.Tuple[str, str], ...] = ()  # ((tl field name, attribute name), ...)
+    TL_HEX_FIELDS: typing.FrozenSet[str] = frozenset()  # int128 / int256 attributes, they are hex strings in dicts
+
+    def _encode(self, buf: bytearray) -> None:
+        raise NotImplementedError
+
+    def _encode_boxed(self, buf: bytearray) -> None:
+        buf += self.TL_ID
+        self._encode(buf)
+
+    @classmethod
+    def _decode(cls, data: memoryview, i: int) -> typing.Tuple["TlObject", int]:
+        raise NotImplementedError
+
+    def serialize(self, boxed: bool = True) -> bytes:
+        buf = bytearray()
+        if boxed:
+            self._encode_boxed(buf)
+        else:
+            self._encode(buf)
+        return bytes(buf)
+
+    @classmethod
+    def deserialize(cls, data: bytes, boxed: bool = True) -> typing.Tuple["TlObject", int]:
+        """
+        :return: (object, bytes consumed)
+        """
+        data = memoryview(data)
+        if not boxed:
+            return cls._decode(data, 0)
+        if bytes(data[:4]) != cls.TL_ID:
+            raise TlError(f'expected {cls.TL_NAME} id {cls.TL_ID[::-1].hex()}, got {bytes(data[:4])[::-1].hex()}')
+        return cls._decode(data, 4)
+
+    @staticmethod
+    def _to_dict_value(value, is_hex: bool):
+        if isinstance(value, TlObject):
+            return value.to_dict()
+        if isinstance(value, list):
+            return [TlObject._to_dict_value(i, is_hex) for i in value]
+        if is_hex:
+            return value.hex()
+        return value
+
+    def to_dict(self) -> dict:
+        """
+        :return: dict like TlSchemas.deserialize returns without auto deserialization, but every nested object has '@type'
+        """
+        result = {'@type': self.TL_NAME}
+        for field, attr in self.TL_FIELDS:
+            value = getattr(self, attr)
+            if value is None:
+                continue
+            result[field] = self._to_dict_value(value, attr in self.TL_HEX_FIELDS)
+        return result
+
+    def __eq__(self, other):
+        if type(self) is not type(other):
+            return False
+        return all(getattr(self, attr) == getattr(other, attr) for _, attr in self.TL_FIELDS)
+
+    def __repr__(self):
+        return f'<TL {self.TL_NAME} ' + ', '.join(f'{attr}={getattr(self, attr)!r}' for _, attr in self.TL_FIELDS) + '>'
+
+
+class TlClassGenerator:
+    """
+    Generates slotted python classes with precompiled encode / decode from TL schemas.
+
+    Usage:
+        classes = TlClassGenerator(TlGenerator.with_default_schemas().generate()).build()
+        block, _ = classes.deserialize(data)
+        block.id.seqno
+        classes.liteServer_getMasterchainInfo().serialize()
+
+    Classes are named after schemas with dots replaced by underscores, fields that are python keywords or "self" get
+    "_" suffix.
+    Generated source can be saved with .write() and imported as a regular module to skip the generation at runtime.
+    """
+
+    def __init__(self, schemas: TlSchemas):
+        self._schemas = schemas
+
+    @staticmethod
+    def class_name(schema: TlSchema) -> str:
+        return schema.name.replace('.', '_')
+
+    @staticmethod
+    def attr_name(field: str) -> str:
+        return field + '_' if keyword.iskeyword(field) or field == 'self' else field
+
+    def _supported(self, entry: tuple) -> bool:
+        op, _, arg = entry
+        if op == TL_VECTOR:
+            return self._supported(arg)
+        if op == TL_BARE:
+            return arg.name not in BUILTIN_NAMES
+        if op == TL_BOXED:
+            return arg is not None
+        return True
+
+    def _compile(self, schema: TlSchema) -> typing.Optional[list]:
+        if schema.name in BUILTIN_NAMES:
+            return None
+        try:
+            plan = self._schemas.get_plan(schema)
+        except (TlError, IndexError):
+            return None
+        for field, op, byte_len, arg, _, _ in plan:
+            if not field.isidentifier() or not self._supported((op, byte_len, arg)):
+                return None
+        return plan
+
+    def _dependencies(self, entry: tuple) -> typing.List[TlSchema]:
+        op, _, arg = entry
+        if op == TL_VECTOR:
+            return self._dependencies(arg)
+        if op == TL_BARE:
+            return [arg]
+        if op == TL_BOXED:
+            return list(arg)
+        return []
+
+    def select(self, names: typing.Optional[typing.Iterable[str]] = None) -> typing.Dict[str, list]:
+        """
+        :param names: schema names to generate classes for, with all schemas they depend on. None for all
+        :return: {schema name: plan} for schemas which can be generated
+        """
+        if names is None:
+            names = self._schemas.name_map.keys()
+        result = {}
+        stack = list(names)
+        while stack:
+            name = stack.pop()
+            if name in result:
+                continue
+            schema = self._schemas.get_by_name(name)
+            if schema is None:
+                raise TlError(f'unknown TL schema: {name}')
+            plan = self._compile(schema)
+            if plan is None:
+                continue
+            result[name] = plan
+            for field, op, byte_len, arg, _, _ in plan:
+                stack.extend(i.name for i in self._dependencies((op, byte_len, arg)))
+        # drop schemas referring to unsupported ones
+        changed = True
+        while changed:
+            changed = False
+            for name, plan in list(result.items()):
+                for field, op, byte_len, arg, _, _ in plan:
+                    if any(i.name not in result for i in self._dependencies((op, byte_len, arg))
+                           if i.name not in BUILTIN_NAMES):
+                        del result[name]
+                        changed = True
+                        break
+        return result
+
+    def _decode_lines(self, entry: tuple, target: str, indent: str, depth: int = 0) -> typing.List[str]:
+        op, byte_len, arg = entry
+        if op == TL_INT:
+            return [f"{indent}{target} = from_bytes(data[i:i + {byte_len}], 'little', signed=True)",
+                    f'{indent}i += {byte_len}']
+        if op == TL_HEX:
+            return [f'{indent}{target} = bytes(data[i:i + {byte_len}])', f'{indent}i += {byte_len}']
+        if op == TL_BOOL:
+            return [f'{indent}{target} = BOOL_MAP.get(bytes(data[i:i + 4]))', f'{indent}i += 4']
+        if op == TL_BYTES:
+            return [f'{indent}{target}, i = read_bytes(data, i)']
+        if op == TL_STRING:
+            return [f'{indent}{target}, i = read_string(data, i)']
+        if op == TL_VECTOR:
+            item = f'item{depth}'
+            return [f"{indent}length = from_bytes(data[i:i + 4], 'little')",
+                    f'{indent}i += 4',
+                    f'{indent}{target} = []',
+                    f'{indent}for _ in range(length):',
+                    *self._decode_lines(arg, item, indent + '    ', depth + 1),
+                    f'{indent}    {target}.append({item})']
+        if op == TL_BARE:
+            return [f'{indent}{target}, i = {self.class_name(arg)}._decode(data, i)']
+        return [f'{indent}{target}, i = decode_boxed(data, i)']
+
+    def _encode_lines(self, entry: tuple, expr: str, indent: str, depth: int = 0) -> typing.List[str]:
+        op, byte_len, arg = entry
+        if op == TL_INT:
+            return [f"{indent}buf += {expr}.to_bytes({byte_len}, 'little', signed=True)"]
+        if op == TL_HEX:
+            return [f'{indent}buf += {expr}']
+        if op == TL_BOOL:
+            return [f'{indent}buf += BOOL_TRUE if {expr} else BOOL_FALSE']
+        if op == TL_BYTES or op == TL_STRING:
+            return [f'{indent}write_bytes(buf, {expr})']
+        if op == TL_VECTOR:
+            item = f'item{depth}'
+            return [f"{indent}buf += len({expr}).to_bytes(4, 'little')",
+                    f'{indent}for {item} in {expr}:',
+                    *self._encode_lines(arg, item, indent + '    ', depth + 1)]
+        if op == TL_BARE:
+            return [f'{indent}{expr}._encode(buf)']
+        return [f'{indent}{expr}._encode_boxed(buf)']
+
+    def _py_type(self, entry: tuple) -> str:
+        op, _, arg = entry
+        if op == TL_BARE:
+            return f'"{self.class_name(arg)}"'
+        if op == TL_VECTOR:
+            return f'typing.List[{self._py_type(arg)}]'
+        return PY_TYPES[op]
+
+    def _class_source(self, schema: TlSchema, plan: list) -> typing.List[str]:
+        attrs = [self.attr_name(i[0]) for i in plan]
+        tl_args = ' '.join(f'{k}:{v}' for k, v in schema.args.items())
+        lines = [f'class {self.class_name(schema)}(TlObject):',
+                 '    """',
+                 f'    {schema.name}#{schema.id.hex()} {tl_args + " " if tl_args else ""}= {schema.class_name};',
+                 '    """',
+                 f'    __slots__ = ({"".join(repr(i) + ", " for i in attrs)})',
+                 f'    TL_NAME = {schema.name!r}',
+                 f'    TL_CLASS = {schema.class_name!r}',
+                 f'    TL_ID = {schema.little_id()!r}',
+                 f'    TL_FIELDS = ({"".join(repr((i[0], a)) + ", " for i, a in zip(plan, attrs))})']
+        hex_attrs = [a for i, a in zip(plan, attrs) if i[1] == TL_HEX or (i[1] == TL_VECTOR and i[3][0] == TL_HEX)]
+        if hex_attrs:
+            lines.append(f'    TL_HEX_FIELDS = frozenset({hex_attrs!r})')
+        lines.append('')
+
+        params = ''.join(f', {a}: typing.Optional[{self._py_type(i[1:4])}] = None' for i, a in zip(plan, attrs))
+        lines.append(f'    def __init__(self{params}):')
+        lines.extend(f'        self.{a} = {a}' for a in attrs)
+        if not attrs:
+            lines.append('        pass')
+        lines.append('')
+
+        lines.append('    def _encode(self, buf: bytearray) -> None:')
+        body = []
+        for (field, op, byte_len, arg, flag_field, flag_bit), attr in zip(plan, attrs):
+            indent = '        '
+            if flag_field is not None:
+                body.append(f'{indent}if self.{attr} is not None:')
+                indent += '    '
+            body.extend(self._encode_lines((op, byte_len, arg), f'self.{attr}', indent))
+        lines.extend(body or ['        pass'])
+        lines.append('')
+
+        lines.append('    @classmethod')
+        lines.append(f'    def _decode(cls, data: memoryview, i: int) -> typing.Tuple["{self.class_name(schema)}", int]:')
+        lines.append('        self = cls.__new__(cls)')
+        for (field, op, byte_len, arg, flag_field, flag_bit), attr in zip(plan, attrs):
+            indent = '        '
+            if flag_field is not None:
+                lines.append(f'        if (self.{self.attr_name(flag_field)} >> {flag_bit}) & 1:')
+                indent += '    '
+            lines.extend(self._decode_lines((op, byte_len, arg), f'self.{attr}', indent))
+            if flag_field is not None:
+                lines.append('        else:')
+                lines.append(f'            self.{attr} = None')
+        lines.append('        return self, i')
+        return lines
+
+    def generate_source(self, names: typing.Optional[typing.Iterable[str]] = None) -> str:
+        selected = self.select(names)
+        lines = ['# generated by pytoniq_core.tl.classes.TlClassGenerator, do not edit',
+                 'import typing',
+                 '',
+                 'from pytoniq_core.tl.classes import TlObject, TlError, BOOL_MAP, BOOL_TRUE, BOOL_FALSE, '
+                 'read_bytes, read_string, write_bytes',
+                 '',
+                 'from_bytes = int.from_bytes',
+                 '', '']
+        for name in sorted(selected):
+            lines.extend(self._class_source(self._schemas.get_by_name(name), selected[name]))
+            lines.extend(['', ''])
+        lines.append('BY_ID: typing.Dict[bytes, typing.Type[TlObject]] = {')
+        lines.extend(f'    {self._schemas.get_by_name(name).little_id()!r}: {self.class_name(self._schemas.get_by_name(name))},'
+                     for name in sorted(selected))
+        lines.append('}')
+        lines.append('BY_NAME: typing.Dict[str, typing.Type[TlObject]] = {i.TL_NAME: i for i in BY_ID.values()}')
+        lines.extend(['', '',
+                      'def decode_boxed(data: memoryview, i: int) -> typing.Tuple[TlObject, int]:',
+                      '    cls = BY_ID.get(bytes(data[i:i + 4]))',
+                      '    if cls is None:',
+                      "        raise TlError(f'unknown TL id: {bytes(data[i:i + 4])[::-1].hex()}')",
+                      '    return cls._decode(data, i + 4)',
+                      '', '',
+                      'def deserialize(data: bytes) -> typing.Tuple[TlObject, int]:',
+                      '    """',
+                      '    :return: (object of the boxed TL type in data, bytes consumed)',
+                      '    """',
+                      '    return decode_boxed(memoryview(data), 0)',
+                      ''])
+        return '\n'.join(lines)
+
+    def write(self, path: str, names: typing.Optional[typing.Iterable[str]] = None) -> None:
+        with open(path, 'w') as f:
+            f.write(self.generate_source(names))
+
+    def build(self, names: typing.Optional[typing.Iterable[str]] = None) -> types.ModuleType:
+        """
+        :return: module object with generated classes, BY_ID, BY_NAME and deserialize()
+        """
+        module = types.ModuleType('pytoniq_core.tl.generated')
+        exec(compile(self.generate_source(names), '<tl classes>', 'exec'), module.__dict__)
+        return module
@@ -1,5 +1,9 @@
+import hashlib
+import json
 import logging
 import re
+import threading
+import time
 import zlib
 import typing
 import os
@@ -7,11 +11,40 @@ import os
 
 logger = logging.getLogger(name='TL')
 
+# compiled field plan opcodes
+TL_INT = 0
+TL_HEX = 1
+TL_BOOL = 2
+TL_BYTES = 3
+TL_STRING = 4
+TL_VECTOR = 5
+TL_BARE = 6
+TL_BOXED = 7
+
+BOOL_TRUE = b'\xb5ur\x99'
+BOOL_FALSE = b'7\x97y\xbc'
+NOT_SET = object()
+
 
 class TlError(Exception):
     pass
 
 
+class TlTraceEvent(typing.NamedTuple):
+    op: str  # 'serialize' or 'deserialize'
+    schema: typing.Optional[str]  # None for objects deserialized by args
+    size: int  # bytes including TL id of boxed objects
+    seconds: float  # including nested objects
+    depth: int  # 0 for top-level objects
+
+
+def log_trace(event: TlTraceEvent) -> None:
+    """
+    Trace hook writing events to the TL logger with level 5: schemas.set_trace(log_trace)
+    """
+    logger.log(5, '%s %s: %d bytes in %.6f s', event.op, event.schema, event.size, event.seconds)
+
+
 class TlSchema:
 
     def __init__(self, id: typing.Optional[bytes], name: typing.Optional[str], class_name: typing.Optional[str], args: dict) -> None:
@@ -19,6 +52,7 @@ class TlSchema:
         self._name: str = name
         self._class_name: str = class_name
         self._args: typing.Dict[str, str] = args  # {'param_name': 'param_type'}
+        self.plan: typing.Optional[typing.List[tuple]] = None  # compiled by TlSchemas.get_plan()
 
     @property
     def id(self) -> bytes:
@@ -84,6 +118,7 @@ class TlSchemas:
         self.name_map: typing.Dict[str, TlSchema] = {}
         self.class_name_map: typing.Dict[str, typing.List[TlSchema]] = {}
         self.generate_map()
+        self._types: typing.Dict[str, tuple] = {}  # compiled types cache
 
         self._auto_deserialize = auto_deserialize
 
@@ -92,6 +127,10 @@ class TlSchemas:
         #  schemas and their fields not to auto deserialize. In ADNL some schemes (like adnl.message.part or rldp ones)
         #  are not supposed to be auto deserialized, because it may cause some errors.
 
+        self._plan_names: typing.Dict[int, str] = {}  # {id(plan): schema name} to name traced bare objects
+        self._trace: typing.Optional[typing.Callable[[TlTraceEvent], None]] = None
+        self._trace_local = threading.local()  # depth of nested traced objects in the current thread
+
     def get_by_id(self, tl_id: typing.Union[bytes, int], byteorder: typing.Literal['little', 'big'] = 'big') -> TlSchema:
         """
         :param tl_id: id of TL schema
@@ -126,70 +165,134 @@ class TlSchemas:
                 continue
             self.id_map[schema.id] = schema
             self.name_map[schema.name] = schema
-            self.class_name_map[schema.class_name] = self.class_name_map.get(schema.class_name, []) + [schema]
+            self.class_name_map.setdefault(schema.class_name, []).append(schema)
 
     def set_default_untouchables(self):
         self.untouchables['adnl.message.part'] = {'data'}
         self.untouchables['overlay.broadcastFec'] = {'data'}
 
-    def serialize_field(self, type_: str, value):
-        logger.log(level=5, msg=f'serializing {type_} with value {value}')
-        result = b''
-        if type_ in self.base_types:
-            byte_len = self.base_types.get(type_)
-            if byte_len:
-                if isinstance(value, bool):
-                    if value:
-                        result += b'\xb5ur\x99'  # booltrue
-                    else:
-                        result += b'7\x97y\xbc'  # boolfalse
-                elif isinstance(value, bytes):
-                    result += value[:byte_len][::-1] + b'\x00' * max(0, byte_len - len(value))
-                elif isinstance(value, int):
-                    result += value.to_bytes(length=byte_len, byteorder='little', signed=True)
-                elif isinstance(value, str):
-                    result += bytes.fromhex(value)
-            else:
-                if type_ == 'bytes':
-                    if isinstance(value, dict) and '@type' in value:
-                        value = self.serialize(schema=self.get_by_name(value['@type']), data=value, boxed=True)
-                    if isinstance(value, bytes):
-                        temp = b''
-                        bytes_len = len(value)
-                        if bytes_len <= 253:
-                            temp += bytes_len.to_bytes(length=1, byteorder='little')
-                        else:
-                            temp += b'\xFE' + bytes_len.to_bytes(length=3, byteorder='little')
-                        temp += value
-                        if len(temp) % 4:
-                            temp += (4 - len(temp) % 4) * b'\x00'
-                        result += temp
+    def compile_type(self, type_: str) -> tuple:
+        """
+        Resolves TL type string once.
+        :return: (opcode, byte_len, arg) where arg is subtype entry for vectors, TlSchema for bare types
+            and list of TlSchemas for boxed ones
+        """
+        entry = self._types.get(type_)
+        if entry is not None:
+            return entry
+        if type_ == 'Bool':
+            entry = (TL_BOOL, 4, None)
+        elif type_ in ('#', 'int', 'long'):
+            entry = (TL_INT, self.base_types[type_], None)
+        elif type_ in ('int128', 'int256'):
+            entry = (TL_HEX, self.base_types[type_], None)
+        elif type_ == 'bytes':
+            entry = (TL_BYTES, None, None)
+        elif type_ == 'string':
+            entry = (TL_STRING, None, None)
+        elif type_.startswith('('):
+            subtype = type_.split()[1][:-1]
+            if 'vector' not in type_:
+                raise TlError(f'unsupported TL type: {type_}')
+            entry = (TL_VECTOR, None, self.compile_type(subtype))
         else:
-            schemas = self.get_by_class_name(type_)
-            if schemas:  # implicit
-                if len(schemas) == 1:
-                    result += self.serialize(schemas[0], value, boxed=True)
-                else:
-                    if isinstance(value, bytes):
-                        result += value  # can specify implicit scheme value already serialized
-                    elif isinstance(value, dict) and '@type' in value:
-                        result += self.serialize(schema=self.get_by_name(value['@type']), data=value, boxed=True)
-                    else:
-                        raise TlError(f'Unknown value provided for implicit schemes {schemas}: {value}')
-            else:  # explicit
-                if type_.startswith('('):
-                    subtype = type_.split()[1][:-1]
-                    if 'vector' in type_:
-                        temp = len(value).to_bytes(4, 'little', signed=False)
-                        for v in value:
-                            temp += self.serialize_field(subtype, v)
-                        result += temp
+            schema = self.get_by_name(type_)
+            if schema is not None:
+                entry = (TL_BARE, None, schema)
+            else:
+                entry = (TL_BOXED, None, self.get_by_class_name(type_))
+        self._types[type_] = entry
+        return entry
+
+    def compile_args(self, args: typing.Dict[str, str]) -> typing.List[tuple]:
+        """
+        :return: field plan - list of (field, opcode, byte_len, arg, flag_field, flag_bit)
+        """
+        plan = []
+        for field, type_ in args.items():
+            flag_field, flag_bit = None, None
+            if '?' in type_:
+                condition, type_ = type_.split('?')
+                flag_field, flag_bit = condition.split('.')
+                flag_bit = int(flag_bit)
+            plan.append((field, *self.compile_type(type_), flag_field, flag_bit))
+        return plan
+
+    def get_plan(self, schema: TlSchema) -> typing.List[tuple]:
+        if schema.plan is None:
+            schema.plan = self.compile_args(schema.args)
+            self._plan_names[id(schema.plan)] = schema.name
+        return schema.plan
+
+    def _serialize_value(self, result: bytearray, entry: tuple, value) -> None:
+        op, byte_len, arg = entry
+        if op == TL_INT:
+            if isinstance(value, bool):
+                result += BOOL_TRUE if value else BOOL_FALSE
+            elif isinstance(value, int):
+                result += value.to_bytes(length=byte_len, byteorder='little', signed=True)
+            elif isinstance(value, bytes):
+                result += value[:byte_len][::-1] + b'\x00' * max(0, byte_len - len(value))
+            elif isinstance(value, str):
+                result += bytes.fromhex(value)
+        elif op == TL_BOOL or op == TL_HEX:
+            if isinstance(value, bool):
+                result += BOOL_TRUE if value else BOOL_FALSE
+            elif isinstance(value, str):
+                result += bytes.fromhex(value)
+            elif isinstance(value, bytes):
+                result += value[:byte_len][::-1] + b'\x00' * max(0, byte_len - len(value))
+            elif isinstance(value, int):
+                result += value.to_bytes(length=byte_len, byteorder='little', signed=True)
+        elif op == TL_BYTES or op == TL_STRING:
+            if isinstance(value, dict) and '@type' in value:
+                value = self.serialize(schema=self.get_by_name(value['@type']), data=value, boxed=True)
+            elif isinstance(value, str):
+                value = value.encode()
+            if isinstance(value, (bytes, bytearray, memoryview)):
+                bytes_len = len(value)
+                if bytes_len <= 253:
+                    result.append(bytes_len)
+                    attach_len = 1
                 else:
-                    result += self.serialize(self.get_by_name(type_), value, boxed=False)
-        return result
+                    result += b'\xFE' + bytes_len.to_bytes(length=3, byteorder='little')
+                    attach_len = 4
+                result += value
+                if (bytes_len + attach_len) % 4:
+                    result += b'\x00' * (4 - (bytes_len + attach_len) % 4)
+        elif op == TL_VECTOR:
+            result += len(value).to_bytes(4, 'little', signed=False)
+            for v in value:
+                self._serialize_value(result, arg, v)
+        elif op == TL_BARE:
+            self._serialize_schema(result, arg, value, False)
+        else:  # TL_BOXED
+            if arg and len(arg) == 1:
+                self._serialize_schema(result, arg[0], value, True)
+            elif isinstance(value, bytes):
+                result += value  # can specify implicit scheme value already serialized
+            elif isinstance(value, dict) and '@type' in value:
+                self._serialize_schema(result, self.get_by_name(value['@type']), value, True)
+            else:
+                raise TlError(f'Unknown value provided for implicit schemes {arg}: {value}')
+
+    def _serialize_schema(self, result: bytearray, schema: TlSchema, data: dict, boxed: bool) -> None:
+        if boxed:
+            result += schema.little_id()
+        for field, op, byte_len, arg, flag_field, flag_bit in self.get_plan(schema):
+            value = data.get(field)
+            if flag_field is not None and value is None:
+                continue
+            if value is None and field not in data:
+                raise KeyError(field)
+            self._serialize_value(result, (op, byte_len, arg), value)
+
+    def serialize_field(self, type_: str, value):
+        result = bytearray()
+        self._serialize_value(result, self.compile_type(type_), value)
+        return bytes(result)
 
     def serialize(self, schema: typing.Union[TlSchema, str], data: dict, boxed: bool = True) -> bytes:
-        logger.log(level=5, msg=f'serializing schema {schema}')
         # https://core.telegram.org/mtproto/serialize
         """
         :param schema: TlSchema object
@@ -199,119 +302,166 @@ class TlSchemas:
         """
         if isinstance(schema, str):
             schema = self.get_by_name(schema)
-        if boxed:
-            result = schema.little_id()
-        else:
-            result = b''
-        for field, type_ in schema.args.items():
-            if 'mode' in type_ or 'flags' in type_:
-                type_ = type_.split('?')[1]
-                if data.get(field) is None:
-                    continue
-            value = data[field]
-            result += self.serialize_field(type_, value)
-        logger.log(level=5, msg=f'serialization result for schema {schema} is {result.hex()}')
+        result = bytearray()
+        self._serialize_schema(result, schema, data, boxed)
+        return bytes(result)
+
+    def _deserialize_bytes(self, data: memoryview, schema: typing.Optional[TlSchema], field: str, zero_copy: bool):
+        if ((not self._auto_deserialize) or
+                (schema is not None and
+                 schema.name in self.untouchables
+                 and field in self.untouchables[schema.name])):
+            return data if zero_copy else bytes(data)
+        byte_len = len(data)
+        temp, j = self._deserialize_boxed(data, 0, zero_copy)
+        if j >= byte_len:
+            return temp
+        result = [temp]
+        while j < byte_len:
+            temp, jj = self._deserialize_boxed(data, j, zero_copy)
+            if jj == j:
+                return data if zero_copy else bytes(data)
+            j = jj
+            result.append(temp)
         return result
 
-    def deserialize(self, data: bytes, boxed: bool = True, args=None) -> typing.Tuple[typing.Union[dict, bytes], int]:
-        i = 0
-        result = {}
-        schema = None
-        if boxed:
-            schema = self.get_by_id(data[i:i + 4], 'little')
-            if not schema:  # is None
-                return data, len(data)
-            result['@type'] = schema.name
-                # return {'bytes': data}, len(data)
+    def _deserialize_value(self, data: memoryview, i: int, entry: tuple, schema: typing.Optional[TlSchema],
+                           field: str, zero_copy: bool):
+        """
+        :return: (value, new offset); value is NOT_SET if the field must be omitted
+        """
+        op, byte_len, arg = entry
+        if op == TL_INT:
+            return int.from_bytes(data[i:i + byte_len], 'little', signed=True), i + byte_len
+        if op == TL_HEX:
+            return data[i:i + byte_len].hex(), i + byte_len
+        if op == TL_BOOL:
+            tag = data[i:i + 4]
+            if tag == BOOL_TRUE:
+                return True, i + 4
+            if tag == BOOL_FALSE:
+                return False, i + 4
+            return NOT_SET, i + 4
+        if op == TL_BYTES or op == TL_STRING:
+            if data[i] == 0xFE:
+                # b'\xFE' means data len took more than one byte
+                byte_len = int.from_bytes(data[i + 1:i + 4], 'little')
+                attach_len = 4
+            else:
+                byte_len = data[i]
+                attach_len = 1
+            i += attach_len
+            value = data[i:i + byte_len]
+            if op == TL_STRING:
+                value = str(value, 'utf-8')
+            else:
+                value = self._deserialize_bytes(value, schema, field, zero_copy)
+            i += byte_len
+            if (byte_len + attach_len) % 4:
+                i += 4 - (byte_len + attach_len) % 4
+            return value, i
+        if op == TL_VECTOR:
+            length = int.from_bytes(data[i:i + 4], 'little', signed=False)
             i += 4
-            args = schema.args
-        logger.log(level=5, msg=f'deserializing schema with args {args}')
-        for field, type_ in args.items():
-            if '?' in type_:
-                index = int(type_[type_.find('.') + 1: type_.find('?')])
-                mask = bin(result.get('mode', result.get('flags'))).replace('0b', '')[::-1]
-                if index >= len(mask):
-                    continue
-                if mask[index] == '0':
-                    continue
-                type_ = type_.split('?')[-1]
-
-            if type_ in self.base_types:
-                byte_len = self.base_types.get(type_)
-                if byte_len:  # is not None
-                    if type_ == 'Bool':
-                        if data[i:i + byte_len] == b'\xb5ur\x99':
-                            result[field] = True
-                        elif data[i:i + byte_len] == b'7\x97y\xbc':
-                            result[field] = False
-                    elif type_ in ('int128', 'int256'):
-                        result[field] = data[i:i + byte_len].hex()
-                    else:
-                        result[field] = int.from_bytes(data[i:i + byte_len], 'little', signed=True)
-                    i += byte_len
-                else:
-                    if type_ in ('bytes', 'string'):
-                        if data[i:i+1] == b'\xFE':
-                            # b'\xFE' means data len took more than one byte
-                            byte_len = int.from_bytes(data[i+1:i+4], 'little')
-                            attach_len = 4
-                            i += 4
-                        else:
-                            attach_len = 1
-                            byte_len = int.from_bytes(data[i:i+1], 'little')
-                            i += 1
-                        if ((not self._auto_deserialize) or
-                                (schema is not None and
-                                 schema.name in self.untouchables
-                                 and field in self.untouchables[schema.name])):
-                            result[field] = data[i:i + byte_len]
-                        else:
-                            temp, j = self.deserialize(data[i:i+byte_len])
-                            if j < byte_len:
-                                while j < byte_len:
-                                    if field not in result:
-                                        result[field] = [temp]
-                                    temp, jj = self.deserialize(data[i + j:i + byte_len])
-                                    j += jj
-                                    if jj == 0:
-                                        result[field] = data[i:i+byte_len]
-                                        break
-                                    result[field].append(temp)
-                            else:
-                                result[field] = temp
-                        i += byte_len
-                        if (byte_len + attach_len) % 4:
-                            i += 4 - (byte_len + attach_len) % 4
-                        if type_ == 'string':
-                            result[field] = result[field].decode()
+            result = []
+            sub_op, _, sub_arg = arg
+            if sub_op == TL_BARE:
+                plan = self.get_plan(sub_arg)
+                for _ in range(length):
+                    value, i = self._deserialize_fields(data, i, plan, None, zero_copy)
+                    result.append(value)
             else:
-                # stucks when errors # TODO
-                if type_.startswith('('):
-                    subtype = type_.split()[1][:-1]
-                    sch = self.get_by_name(subtype)
-                    if 'vector' in type_:
-                        length = int.from_bytes(data[i:i + 4], 'little', signed=False)
-                        i += 4
-                        result[field] = []
-                        for _ in range(length):
-                            if sch:
-                                deser, j = self.deserialize(data[i:], False, sch.args)
-                            else:
-                                deser, j = self.deserialize(data[i:], True)
-
-                            result[field].append(deser)
-                            i += j
-                else:
-                    sch = self.get_by_name(type_)
-                    if sch:
-                        result[field], j = self.deserialize(data[i:], False, sch.args)
-                        result[field]['@type'] = sch.name
-                    else:
-                        result[field], j = self.deserialize(data[i:], True)
-                    # result[field], j = self.deserialize(data[i:], False, sch.args)
-                    i += j
+                for _ in range(length):
+                    value, i = self._deserialize_value(data, i, arg, schema, field, zero_copy)
+                    result.append(value)
+            return result, i
+        if op == TL_BARE:
+            value, i = self._deserialize_fields(data, i, self.get_plan(arg), None, zero_copy)
+            value['@type'] = arg.name
+            return value, i
+        return self._deserialize_boxed(data, i, zero_copy)  # TL_BOXED
+
+    def _deserialize_fields(self, data: memoryview, i: int, plan: typing.List[tuple],
+                            schema: typing.Optional[TlSchema], zero_copy: bool,
+                            result: typing.Optional[dict] = None) -> typing.Tuple[dict, int]:
+        if result is None:
+            result = {}
+        for field, op, byte_len, arg, flag_field, flag_bit in plan:
+            if flag_field is not None and not (result.get(flag_field, 0) >> flag_bit) & 1:
+                continue
+            value, i = self._deserialize_value(data, i, (op, byte_len, arg), schema, field, zero_copy)
+            if value is not NOT_SET:
+                result[field] = value
         return result, i
 
+    def _deserialize_boxed(self, data: memoryview, i: int, zero_copy: bool) -> typing.Tuple[typing.Union[dict, bytes, memoryview], int]:
+        schema = self.get_by_id(bytes(data[i:i + 4]), 'little')
+        if not schema:  # is None, return the rest as is
+            return data[i:] if zero_copy else bytes(data[i:]), len(data)
+        return self._deserialize_fields(data, i + 4, self.get_plan(schema), schema, zero_copy, {'@type': schema.name})
+
+    def deserialize(self, data: bytes, boxed: bool = True, args=None, zero_copy: bool = False
+                    ) -> typing.Tuple[typing.Union[dict, bytes], int]:
+        """
+        Deserializes TL object from one buffer by offsets, nested objects and vector elements are not copied.
+        :param data: bytes, bytearray or memoryview
+        :param boxed: whether data starts with TL id
+        :param args: fields to deserialize if data is not boxed
+        :param zero_copy: return memoryview slices of data for bytes fields instead of bytes copies
+        :return: (deserialized object, bytes consumed)
+        """
+        mv = memoryview(data)
+        if boxed:
+            schema = self.get_by_id(bytes(mv[:4]), 'little')
+            if not schema:  # is None
+                return data, len(data)
+            return self._deserialize_fields(mv, 4, self.get_plan(schema), schema, zero_copy, {'@type': schema.name})
+        return self._deserialize_fields(mv, 0, self.compile_args(args), None, zero_copy)
+
+    def set_trace(self, hook: typing.Optional[typing.Callable[[TlTraceEvent], None]]) -> None:
+        """
+        Calls hook with TlTraceEvent after every object (including nested ones) is serialized or deserialized,
+        e.g. schemas.set_trace(log_trace); set_trace(None) disables tracing.
+        Traced codec methods are set on the instance only while a hook is set, so untraced calls cost nothing.
+        Event depth is tracked per thread, so the instance may be shared by threads while traced.
+        """
+        self._trace = hook
+        if hook is None:
+            self.__dict__.pop('_serialize_schema', None)
+            self.__dict__.pop('_deserialize_fields', None)
+        else:
+            self._serialize_schema = self._traced_serialize_schema
+            self._deserialize_fields = self._traced_deserialize_fields
+
+    def _traced_serialize_schema(self, result: bytearray, schema: TlSchema, data: dict, boxed: bool) -> None:
+        local = self._trace_local
+        depth, start = getattr(local, 'depth', 0), len(result)
+        local.depth = depth + 1
+        t = time.perf_counter()
+        try:
+            TlSchemas._serialize_schema(self, result, schema, data, boxed)
+        finally:
+            local.depth = depth
+        self._trace(TlTraceEvent('serialize', schema.name, len(result) - start, time.perf_counter() - t, depth))
+
+    def _traced_deserialize_fields(self, data: memoryview, i: int, plan: typing.List[tuple],
+                                   schema: typing.Optional[TlSchema], zero_copy: bool,
+                                   result: typing.Optional[dict] = None) -> typing.Tuple[dict, int]:
+        local = self._trace_local
+        depth = getattr(local, 'depth', 0)
+        local.depth = depth + 1
+        t = time.perf_counter()
+        try:
+            value, j = TlSchemas._deserialize_fields(self, data, i, plan, schema, zero_copy, result)
+        finally:
+            local.depth = depth
+        seconds = time.perf_counter() - t
+        if schema is not None:  # boxed, i is after TL id
+            self._trace(TlTraceEvent('deserialize', schema.name, j - i + 4, seconds, depth))
+        else:
+            self._trace(TlTraceEvent('deserialize', self._plan_names.get(id(plan)), j - i, seconds, depth))
+        return value, j
+
     def __repr__(self):
         return '[' + '\n'.join([i.__repr__() for i in self.list]) + ']'
 
@@ -394,25 +544,109 @@ class TlRegistrator:
 
 
 class TlGenerator:
-    def __init__(self, path: str, registrator: typing.Optional[TlRegistrator] = None) -> None:
+
+    _cache_version = 1  # bump when the cache file format changes
+    _memory_cache: typing.Dict[str, list] = {}  # {cache key: [(id, name, class_name, args), ...]}
+
+    def __init__(self, path: str, registrator: typing.Optional[TlRegistrator] = None,
+                 cache_dir: typing.Optional[str] = None) -> None:
+        """
+        :param path: .tl file or directory with .tl files
+        :param registrator: TlRegistrator to parse schemas with
+        :param cache_dir: directory for parsed schemas cache, keyed by the schema files hashes,
+            e.g. TlGenerator.user_cache_dir(). None (default) to keep the cache in memory only
+        """
         self._path = os.path.normpath(path)
         if registrator is None:
             registrator = TlRegistrator()
         self._registrator = registrator
+        self._cache_dir = cache_dir
 
     @classmethod
-    def with_default_schemas(cls) -> "TlGenerator":
+    def with_default_schemas(cls, cache_dir: typing.Optional[str] = None) -> "TlGenerator":
         path = os.path.join(os.path.dirname(__file__), './schemas')
-        return cls(path)
+        return cls(path, cache_dir=cache_dir)
 
-    def generate(self):
-        result = []
+    @staticmethod
+    def user_cache_dir() -> str:
+        """
+        :return: $XDG_CACHE_HOME/pytoniq_core/tl, ~/.cache/pytoniq_core/tl if XDG_CACHE_HOME is not set
+        """
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        return os.path.join(base, 'pytoniq_core', 'tl')
+
+    def _files(self) -> typing.List[str]:
         if os.path.isdir(self._path):
-            for f in os.listdir(self._path):
-                result += self.from_file(os.path.join(self._path, f))
-        else:
-            result = self.from_file(self._path)
-        return TlSchemas(result)
+            return [os.path.join(self._path, f) for f in sorted(os.listdir(self._path))]
+        return [self._path]
+
+    def cache_key(self, files: typing.List[str]) -> str:
+        h = hashlib.sha256(f'{self._cache_version}:{type(self._registrator).__qualname__}'.encode())
+        for file_path in files:
+            with open(file_path, 'rb') as f:
+                h.update(os.path.basename(file_path).encode() + b'\x00' + hashlib.sha256(f.read()).digest())
+        return h.hexdigest()
+
+    @staticmethod
+    def _parse_cache(data: bytes) -> typing.Optional[list]:
+        """
+        :return: records from the cache file or None if it is not valid, the file is not trusted
+        """
+        try:
+            records = json.loads(data)
+            result = []
+            for id_, name, class_name, args in records:
+                if not (isinstance(name, str) and isinstance(class_name, str) and isinstance(args, dict)
+                        and all(isinstance(k, str) and isinstance(v, str) for k, v in args.items())):
+                    return None
+                id_ = bytes.fromhex(id_)
+                if len(id_) != 4:
+                    return None
+                result.append((id_, name, class_name, args))
+        except (ValueError, TypeError):  # includes JSONDecodeError, UnicodeDecodeError and wrong records shape
+            return None
+        return result
+
+    def _load_cache(self, key: str) -> typing.Optional[list]:
+        if key in self._memory_cache:
+            return self._memory_cache[key]
+        if self._cache_dir is None:
+            return None
+        try:
+            with open(os.path.join(self._cache_dir, key + '.json'), 'rb') as f:
+                records = self._parse_cache(f.read())
+        except OSError:
+            return None
+        if records is None:
+            logger.debug(f'ignoring invalid TL schemas cache file in {self._cache_dir}')
+            return None
+        self._memory_cache[key] = records
+        return records
+
+    def _save_cache(self, key: str, records: list) -> None:
+        self._memory_cache[key] = records
+        if self._cache_dir is None:
+            return
+        try:
+            os.makedirs(self._cache_dir, exist_ok=True)
+            temp_path = os.path.join(self._cache_dir, f'{key}.{os.getpid()}.tmp')
+            with open(temp_path, 'w') as f:
+                json.dump([(id_.hex(), name, class_name, args) for id_, name, class_name, args in records], f)
+            os.replace(temp_path, os.path.join(self._cache_dir, key + '.json'))
+        except OSError as e:  # read-only fs etc., cache is optional
+            logger.debug(f'failed to write TL schemas cache: {e}')
+
+    def generate(self):
+        files = self._files()
+        key = self.cache_key(files)
+        records = self._load_cache(key)
+        if records is None:
+            result = []
+            for f in files:
+                result += self.from_file(f)
+            self._save_cache(key, [(i.id, i.name, i.class_name, i.args) for i in result])
+            return TlSchemas(result)
+        return TlSchemas([TlSchema(id_, name, class_name, dict(args)) for id_, name, class_name, args in records])
 
     def from_file(self, file_path: str):
         result = []
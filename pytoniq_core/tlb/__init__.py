@@ -5,5 +5,7 @@ from .tlb import TlbError, TlbScheme
 from .transaction import TransactionError, Transaction, TransactionDescr, TransactionOrdinary, TransactionStorage, TrStoragePhase, TrActionPhase, TrComputePhase, TrBouncePhase, TrCreditPhase, TransactionTickTock, InMsg, OutMsg, InternalMsgInfo, ExternalMsgInfo, ExternalOutMsgInfo, MessageAny
 from .vm_stack import VmError, VmStack, VmStackList, VmStackValue, VmSaveList, VmCont, VmTuple, VmTupleRef, VmCellSlice, VmControlData
 from .utils import MerkleUpdate, HashUpdate, deserialize_shard_hashes
+from .fees import FeeError, FeeEstimator
+from .shards import ShardError, ShardTopology
 
 from .custom import *
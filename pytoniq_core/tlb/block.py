@@ -504,9 +504,8 @@ class DepthBalanceInfo(TlbScheme):
         self.split_depth = split_depth
         self.balance = balance
 
-    @classmethod
-    def serialize(cls, *args):
-        pass
+    def serialize(self) -> Cell:
+        return Builder().store_uint(self.split_depth, 5).store_cell(self.balance.serialize()).end_cell()
 
     @classmethod
     def deserialize(cls, cell_slice: Slice):
@@ -537,9 +536,11 @@ class McStateExtra(TlbScheme):
                  after_key_block: bool,
                  last_key_block: typing.Optional[ExtBlkRef],
                  block_create_stats: typing.Optional["BlockCreateStats"],
-                 global_balance: CurrencyCollection
+                 global_balance: CurrencyCollection,
+                 shard_hashes_cell: typing.Optional[Cell] = None
                  ):
         self.shard_hashes = shard_hashes
+        self.shard_hashes_cell = shard_hashes_cell  # raw ShardHashes root, see ShardTopology
         self.config = config
         self.flags = flags
         self.validator_info = validator_info
@@ -560,6 +561,7 @@ class McStateExtra(TlbScheme):
         tag = cell_slice.load_bytes(2)
         if tag != b'\xcc&':
             raise BlockError(f'McStateExtra deserialization error unknown prefix tag: {tag}')
+        shard_hashes_cell = cell_slice.preload_maybe_ref()
         shard_hashes = deserialize_shard_hashes(cell_slice)
         config = ConfigParams.deserialize(cell_slice)
         ref = cell_slice.load_ref().begin_parse()
@@ -575,7 +577,7 @@ class McStateExtra(TlbScheme):
         if bin(flags)[-1] == '1':
             block_create_stats = BlockCreateStats.deserialize(ref)
         global_balance = CurrencyCollection.deserialize(cell_slice)
-        return cls(shard_hashes, config, flags, validator_info, prev_blocks, after_key_block, last_key_block, block_create_stats, global_balance)
+        return cls(shard_hashes, config, flags, validator_info, prev_blocks, after_key_block, last_key_block, block_create_stats, global_balance, shard_hashes_cell)
 
 
 class McBlockExtra(TlbScheme):
@@ -599,10 +601,12 @@ class McBlockExtra(TlbScheme):
                  prev_blk_signatures: dict,
                  recover_create_msg: typing.Optional[Cell],
                  mint_msg: typing.Optional[Cell],
-                 config: typing.Optional["ConfigParams"]
+                 config: typing.Optional["ConfigParams"],
+                 shard_hashes_cell: typing.Optional[Cell] = None
                  ):
         self.key_block = key_block
         self.shard_hashes = shard_hashes
+        self.shard_hashes_cell = shard_hashes_cell
         self.shard_fees = shard_fees
         self.prev_blk_signatures = prev_blk_signatures
         self.recover_create_msg = recover_create_msg
@@ -621,6 +625,7 @@ class McBlockExtra(TlbScheme):
         if tag != b'\xcc\xa5':
             raise BlockError(f'McBlockExtra deserialization error unknown prefix tag: {tag}')
         key_block = cell_slice.load_bit()
+        shard_hashes_cell = cell_slice.preload_maybe_ref()
         shard_hashes = deserialize_shard_hashes(cell_slice)
         shard_fees = cell_slice.load_maybe_ref()
         ref = cell_slice.load_ref().begin_parse()
@@ -631,17 +636,79 @@ class McBlockExtra(TlbScheme):
         if key_block:
             config = ConfigParams.deserialize(cell_slice)
 
-        return cls(key_block, shard_hashes, shard_fees, prev_blk_signatures, recover_create_msg, mint_msg, config)
+        return cls(key_block, shard_hashes, shard_fees, prev_blk_signatures, recover_create_msg, mint_msg, config, shard_hashes_cell)
 
 
 class ConfigParams(TlbScheme):
     """
     _ config_addr:bits256 config:^(Hashmap 32 ^Cell) = ConfigParams;
+
+    Params are kept as raw cells and decoded only on access:
+        config_params[34] -> ConfigParam34
+        config_params.get(100) -> None
+        config_params.cells[34] -> Cell
+    Decoded params are memoized process-wide by their cell hash (see ConfigParam.decode),
+    so params not changed between blocks are decoded once.
+
+    If the config dict is pruned (e.g. in block proofs) pruned is True and accessing params raises ConfigError,
+    only hash is available then.
     """
 
-    def __init__(self, config_addr: str, config: dict):
+    def __init__(self, config_addr: str, config: typing.Optional[dict], cells: typing.Optional[typing.Dict[int, Cell]] = None,
+                 root: typing.Optional[Cell] = None, pruned: bool = False):
         self.config_addr = config_addr
-        self.config = config
+        self.config = config  # {param: Slice}, None if pruned
+        if cells is None:
+            cells = {k: v.to_cell() for k, v in (config or {}).items()}
+        self.cells = cells  # {param: Cell}
+        self.root = root  # config dict cell
+        self.pruned = pruned
+
+    @property
+    def hash(self) -> typing.Optional[bytes]:
+        """
+        :return: hash of the config dict cell, it changes iff any param changes
+        """
+        return self.root.hash if self.root is not None else None
+
+    def _check_pruned(self) -> None:
+        if self.pruned:
+            from .config import ConfigError  # config.py depends on this module
+            raise ConfigError('config params are pruned')
+
+    def get(self, param: int, default=None):
+        """
+        :return: decoded ConfigParam <param>, raw Cell if there is no scheme for the param or default if it is absent
+        """
+        self._check_pruned()
+        cell = self.cells.get(param)
+        if cell is None:
+            return default
+        from .config import ConfigParam  # config.py depends on this module
+        if param not in ConfigParam.params:
+            return cell
+        return ConfigParam.decode(param, cell)
+
+    def __getitem__(self, param: int):
+        self._check_pruned()
+        if param not in self.cells:
+            raise KeyError(param)
+        return self.get(param)
+
+    def __contains__(self, param: int) -> bool:
+        self._check_pruned()
+        return param in self.cells
+
+    def __iter__(self):
+        self._check_pruned()
+        return iter(self.cells)
+
+    def __len__(self) -> int:
+        self._check_pruned()
+        return len(self.cells)
+
+    def __bool__(self) -> bool:
+        return True  # config is present even if it is pruned or has no params
 
     @classmethod
     def serialize(cls, *args):
@@ -649,8 +716,12 @@ class ConfigParams(TlbScheme):
 
     @classmethod
     def deserialize(cls, cell_slice: Slice):
-        return cls(config_addr=cell_slice.load_bytes(32).hex(),
-                   config=cell_slice.load_ref().begin_parse().load_hashmap(32, key_deserializer=lambda src: Builder().store_bits(src).to_slice().load_int(32), value_deserializer=lambda src: src.load_ref().begin_parse()))
+        config_addr = cell_slice.load_bytes(32).hex()
+        root = cell_slice.load_ref()
+        cells = root.begin_parse().load_hashmap(32, key_deserializer=lambda src: Builder().store_bits(src).to_slice().load_int(32), value_deserializer=lambda src: src.load_ref())
+        if cells is None:  # pruned in proofs
+            return cls(config_addr=config_addr, config=None, cells={}, root=root, pruned=True)
+        return cls(config_addr=config_addr, config={k: v.begin_parse() for k, v in cells.items()}, cells=cells, root=root)
 
 
 class ValidatorInfo(TlbScheme):
@@ -1,4 +1,5 @@
 import typing
+from collections import OrderedDict
 
 from .block import CurrencyCollection, ExtraCurrencyCollection, GlobalVersion
 from .tlb import TlbScheme, TlbError
@@ -1800,6 +1801,32 @@ class ConfigParam(TlbScheme):
         82: ConfigParam82
     }
 
+    cache_size = 1024
+    _cache: typing.Dict[typing.Tuple[int, bytes], TlbScheme] = OrderedDict()  # {(param, cell hash): decoded param}
+
+    @classmethod
+    def decode(cls, param: int, cell: Cell) -> TlbScheme:
+        """
+        Decodes ConfigParam <param> from its cell. Results are memoized process-wide by (param, cell hash),
+        so returned objects are shared between callers and should not be modified.
+        """
+        key = (param, cell.hash)
+        result = cls._cache.get(key)
+        if result is not None:
+            try:
+                cls._cache.move_to_end(key)
+            except KeyError:  # evicted meanwhile
+                pass
+            return result
+        scheme = cls.params.get(param)
+        if scheme is None:
+            raise ConfigError(f'unknown config param: {param}')
+        result = scheme.deserialize(cell.begin_parse())
+        cls._cache[key] = result
+        while len(cls._cache) > cls.cache_size:
+            cls._cache.popitem(last=False)
+        return result
+
     @classmethod
     def serialize(cls, *args):
         ...
@@ -0,0 +1,138 @@
+import typing
+
+from .tlb import TlbError
+from .block import ConfigParams
+from .config import GasLimitsPrices, MsgForwardPrices, StoragePrices
+from ..boc import Cell
+from ..boc.storage_stat import compute_storage_stat
+
+
+class FeeError(TlbError):
+    pass
+
+
+def _cells_bits(tree: typing.Union[Cell, typing.Tuple[int, int]], skip_root: bool = False) -> typing.Tuple[int, int]:
+    if isinstance(tree, Cell):
+        stat = compute_storage_stat(tree, skip_root=skip_root)
+        return stat.bits, stat.cells
+    return tree
+
+
+class FeeEstimator:
+    """
+    Computes forward, gas and storage fees for batches of messages with price tables precomputed
+    from config params 18 (storage), 20 / 21 (gas) and 24 / 25 (forwarding).
+
+    Usage:
+        estimator = FeeEstimator(config_params)
+        estimator.forward_fees([msg_cell, (bits, cells)]) -> [fee, fee]
+        estimator.gas_fees([gas_used, ...], masterchain=True)
+        estimator.update(new_config_params)  # tables are rebuilt only if the config has changed
+
+    Messages and cell trees may be given either as Cell or as already counted (bits, cells) pairs.
+    All fees are in nanotons.
+    """
+
+    def __init__(self, config: ConfigParams):
+        self.config_hash: typing.Optional[bytes] = None
+        self.update(config)
+
+    def update(self, config: ConfigParams) -> bool:
+        """
+        :return: True if the price tables were rebuilt
+        """
+        config_hash = config.hash
+        if config_hash is not None and config_hash == self.config_hash:
+            return False
+        self._gas = (self._gas_table(config, 21), self._gas_table(config, 20))  # indexed by masterchain flag
+        self._fwd = (self._fwd_table(config, 25), self._fwd_table(config, 24))
+        self._storage = self._storage_table(config)
+        self.config_hash = config_hash
+        return True
+
+    @staticmethod
+    def _gas_table(config: ConfigParams, param: int) -> typing.Tuple[int, int, int]:
+        """
+        :return: (flat_gas_limit, flat_gas_price, gas_price)
+        """
+        prices: GasLimitsPrices = config.get(param)
+        if prices is None:
+            raise FeeError(f'config param {param} is missing')
+        if prices.type_ == 'gas_flat_pfx':
+            return prices.flat_gas_limit, prices.flat_gas_price, prices.other.gas_price
+        return 0, 0, prices.gas_price
+
+    @staticmethod
+    def _fwd_table(config: ConfigParams, param: int) -> typing.Tuple[int, int, int, int, int]:
+        """
+        :return: (lump_price, bit_price, cell_price, ihr_price_factor, first_frac)
+        """
+        prices: MsgForwardPrices = config.get(param)
+        if prices is None:
+            raise FeeError(f'config param {param} is missing')
+        return prices.lump_price, prices.bit_price, prices.cell_price, prices.ihr_price_factor, prices.first_frac
+
+    @staticmethod
+    def _storage_table(config: ConfigParams) -> typing.List[typing.Tuple[int, int, int, int, int]]:
+        """
+        :return: [(utime_since, bit_price_ps, cell_price_ps, mc_bit_price_ps, mc_cell_price_ps), ...] sorted by utime_since
+        """
+        prices: typing.Dict[int, StoragePrices] = config.get(18)
+        if not prices:
+            return []
+        return sorted((i.utime_since, i.bit_price_ps, i.cell_price_ps, i.mc_bit_price_ps, i.mc_cell_price_ps)
+                      for i in prices.values())
+
+    def forward_fees(self, messages: typing.Iterable[typing.Union[Cell, typing.Tuple[int, int]]],
+                     masterchain: bool = False) -> typing.List[int]:
+        """
+        :param messages: message cells (root cell is not counted) or (bits, cells) of messages without root
+        :return: msg_fwd_fees for each message
+        """
+        lump_price, bit_price, cell_price, _, _ = self._fwd[masterchain]
+        result = []
+        for msg in messages:
+            bits, cells = _cells_bits(msg, skip_root=True)
+            result.append(lump_price + ((bit_price * bits + cell_price * cells + 0xffff) >> 16))
+        return result
+
+    def action_fees(self, fwd_fees: typing.Iterable[int], masterchain: bool = False) -> typing.List[int]:
+        """
+        :return: part of forward fees collected by validators at the action phase, the rest is paid on delivery
+        """
+        first_frac = self._fwd[masterchain][4]
+        return [(i * first_frac) >> 16 for i in fwd_fees]
+
+    def ihr_fees(self, fwd_fees: typing.Iterable[int], masterchain: bool = False) -> typing.List[int]:
+        ihr_price_factor = self._fwd[masterchain][3]
+        return [(i * ihr_price_factor + 0xffff) >> 16 for i in fwd_fees]
+
+    def gas_fees(self, gas_used: typing.Iterable[int], masterchain: bool = False) -> typing.List[int]:
+        flat_gas_limit, flat_gas_price, gas_price = self._gas[masterchain]
+        return [flat_gas_price if i <= flat_gas_limit else
+                flat_gas_price + ((gas_price * (i - flat_gas_limit) + 0xffff) >> 16) for i in gas_used]
+
+    def storage_fees(self, trees: typing.Iterable[typing.Union[Cell, typing.Tuple[int, int]]], last_paid: int, now: int,
+                     masterchain: bool = False) -> typing.List[int]:
+        """
+        :param trees: account state cells or their (bits, cells)
+        :param last_paid: unixtime storage was paid last time
+        :param now: unixtime to compute fees up to
+        :return: storage fees due for each tree
+        """
+        # storage prices are piecewise constant over time, so the period is integrated once for all trees
+        bit_time = cell_time = 0
+        for j, (since, bit_price, cell_price, mc_bit_price, mc_cell_price) in enumerate(self._storage):
+            upto = self._storage[j + 1][0] if j + 1 < len(self._storage) else now
+            start, end = max(since, last_paid), min(upto, now)
+            if end <= start:
+                continue
+            if masterchain:
+                bit_price, cell_price = mc_bit_price, mc_cell_price
+            bit_time += bit_price * (end - start)
+            cell_time += cell_price * (end - start)
+        result = []
+        for tree in trees:
+            bits, cells = _cells_bits(tree)
+            result.append((bits * bit_time + cells * cell_time + 0xffff) >> 16)
+        return result
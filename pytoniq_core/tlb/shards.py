@@ -0,0 +1,186 @@
+import bisect
+import typing
+
+from .tlb import TlbError
+from .block import ShardDescr
+from ..boc import Cell, Slice, Address, HashMap
+
+
+MASTERCHAIN = -1
+MASTER_SHARD = 1 << 63
+
+
+class ShardError(TlbError):
+    pass
+
+
+def shard_from_prefix(prefix: int, prefix_len: int) -> int:
+    """
+    :return: unsigned shard id of account ids starting with prefix_len bits prefix
+    """
+    return (prefix << (64 - prefix_len)) | (1 << (63 - prefix_len))
+
+
+class ShardTopology:
+    """
+    Shards of all workchains decoded once from ShardHashes of a masterchain block:
+    _ (HashmapE 32 ^(BinTree ShardDescr)) = ShardHashes;
+
+    Shard prefixes are taken from the BinTree paths, ShardDescr's are decoded only when requested.
+    For every workchain the prefix trie is flattened into a table indexed by the first bits of account id
+    (or into sorted ranges if shards are too deep), so routing a batch is one pass over it.
+    BinTree subtrees pruned in proofs are not shards, routing an account into one raises ShardError.
+
+    Usage:
+        topology = ShardTopology.from_mc_extra(mc_state_extra)
+        topology.route(account_ids, workchain=0)  # -> [shard, ...]
+        topology.route_addresses(['EQ...', Address(...)])  # -> [(workchain, shard), ...]
+        topology.descr(0, shard)  # -> ShardDescr
+    """
+
+    max_table_bits = 16
+
+    def __init__(self, shards: typing.Dict[int, typing.List[typing.Tuple[int, int, typing.Optional[Slice]]]],
+                 pruned: typing.Optional[typing.Dict[int, typing.List[typing.Tuple[int, int]]]] = None):
+        """
+        :param shards: {workchain: [(prefix, prefix_len, ShardDescr slice or None), ...]}
+        :param pruned: {workchain: [(prefix, prefix_len), ...]} of pruned BinTree subtrees
+        """
+        if pruned is None:
+            pruned = {}
+        self._leaves = {}
+        self._pruned: typing.Dict[int, typing.Set[int]] = {}  # {workchain: {pseudo shard id of pruned subtree}}
+        self._descrs: typing.Dict[typing.Tuple[int, int], typing.Optional[ShardDescr]] = {}
+        self._tables = {}
+        for wc in set(shards) | set(pruned):
+            leaves = sorted(shards.get(wc, ()), key=lambda i: i[0] << (64 - i[1]))
+            self._leaves[wc] = {shard_from_prefix(p, l): cs for p, l, cs in leaves}
+            ranges = [(p, l, None) for p, l in pruned.get(wc, ())]
+            self._pruned[wc] = {shard_from_prefix(p, l) for p, l, _ in ranges}
+            self._tables[wc] = self._build_table(sorted(leaves + ranges, key=lambda i: i[0] << (64 - i[1])))
+
+    @classmethod
+    def _build_table(cls, leaves: list) -> tuple:
+        depth = max(l for _, l, _ in leaves)
+        if depth <= cls.max_table_bits:
+            table = [0] * (1 << depth)
+            for p, l, _ in leaves:
+                start = p << (depth - l)
+                table[start: start + (1 << (depth - l))] = [shard_from_prefix(p, l)] * (1 << (depth - l))
+            return depth, table, None
+        starts = [p << (256 - l) for p, l, _ in leaves]
+        return depth, [shard_from_prefix(p, l) for p, l, _ in leaves], starts
+
+    @classmethod
+    def from_cell(cls, shard_hashes: typing.Optional[typing.Union[Cell, Slice]]) -> "ShardTopology":
+        """
+        :param shard_hashes: root cell of ShardHashes dictionary (None for empty one)
+        """
+        if isinstance(shard_hashes, Slice):
+            shard_hashes = shard_hashes.load_maybe_ref()
+        shards = {}
+        pruned = {}
+        if shard_hashes is None:
+            return cls(shards)
+        workchains = HashMap.parse(shard_hashes.begin_parse(), 32)
+        if workchains is None:
+            raise ShardError('ShardHashes dictionary is pruned')
+        for key, value in workchains.items():
+            wc = key - (1 << 32) if key >> 31 else key
+            leaves = shards[wc] = []
+            stack = [(value.load_ref().begin_parse(), 0, 0)]
+            while stack:
+                cs, prefix, prefix_len = stack.pop()
+                if cs.is_special():  # pruned subtree, its shards are unknown
+                    pruned.setdefault(wc, []).append((prefix, prefix_len))
+                elif cs.load_bit():  # bt_fork
+                    if prefix_len >= 60:
+                        raise ShardError(f'shard prefix of workchain {wc} is too long')
+                    stack.append((cs.load_ref().begin_parse(), prefix << 1, prefix_len + 1))
+                    stack.append((cs.load_ref().begin_parse(), (prefix << 1) | 1, prefix_len + 1))
+                else:  # bt_leaf
+                    leaves.append((prefix, prefix_len, cs))
+        return cls(shards, pruned)
+
+    @classmethod
+    def from_mc_extra(cls, extra) -> "ShardTopology":
+        """
+        :param extra: McStateExtra or McBlockExtra
+        """
+        return cls.from_cell(extra.shard_hashes_cell)
+
+    @property
+    def workchains(self) -> typing.List[int]:
+        return list(self._leaves)
+
+    def shards(self, workchain: int) -> typing.List[int]:
+        """
+        :return: unsigned shard ids of the workchain in account id order
+        """
+        if workchain == MASTERCHAIN and workchain not in self._leaves:
+            return [MASTER_SHARD]
+        if workchain not in self._leaves:
+            raise ShardError(f'unknown workchain {workchain}')
+        return list(self._leaves[workchain])
+
+    def descr(self, workchain: int, shard: int) -> typing.Optional[ShardDescr]:
+        """
+        :return: ShardDescr of the shard or None if it was not given to the constructor
+        """
+        key = (workchain, shard)
+        if key not in self._descrs:
+            leaves = self._leaves.get(workchain, {})
+            if shard not in leaves:
+                raise ShardError(f'no shard {shard:016x} in workchain {workchain}')
+            cs = leaves[shard]
+            self._descrs[key] = ShardDescr.deserialize(cs.copy()) if cs is not None else None
+        return self._descrs[key]
+
+    def route(self, account_ids: typing.Iterable[int], workchain: int = 0) -> typing.List[int]:
+        """
+        :param account_ids: 256-bit account ids (address hash parts as int)
+        :return: unsigned shard id for each account
+        """
+        if workchain == MASTERCHAIN and workchain not in self._tables:
+            return [MASTER_SHARD for _ in account_ids]
+        if workchain not in self._tables:
+            raise ShardError(f'unknown workchain {workchain}')
+        depth, table, starts = self._tables[workchain]
+        pruned = self._pruned[workchain]
+        if pruned:
+            account_ids = list(account_ids)
+        if starts is None:
+            shift = 256 - depth
+            result = [table[i >> shift] for i in account_ids]
+        else:
+            result = [table[bisect.bisect_right(starts, i) - 1] for i in account_ids]
+        if pruned:
+            for account_id, shard in zip(account_ids, result):
+                if shard in pruned:
+                    raise ShardError(f'account {account_id:064x} of workchain {workchain} is in a pruned shard subtree')
+        return result
+
+    def shard_of(self, account_id: int, workchain: int = 0) -> int:
+        return self.route((account_id,), workchain)[0]
+
+    def route_addresses(self, addresses: typing.Iterable[typing.Union[Address, str]]) -> typing.List[typing.Tuple[int, int]]:
+        """
+        :return: (workchain, unsigned shard id) for each address
+        """
+        groups: typing.Dict[int, typing.Tuple[list, list]] = {}
+        count = 0
+        for n, address in enumerate(addresses):
+            if not isinstance(address, Address):
+                address = Address(address)
+            positions, ids = groups.setdefault(address.wc, ([], []))
+            positions.append(n)
+            ids.append(int.from_bytes(address.hash_part, 'big'))
+            count += 1
+        result = [None] * count
+        for wc, (positions, ids) in groups.items():
+            for n, shard in zip(positions, self.route(ids, wc)):
+                result[n] = (wc, shard)
+        return result
+
+    def __repr__(self):
+        return f'<ShardTopology {", ".join(f"{wc}: {len(i)} shards" for wc, i in self._leaves.items())}>'
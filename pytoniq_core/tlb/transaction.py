@@ -1374,9 +1374,8 @@ class ImportFees(TlbScheme):
         self.fees_collected = fees_collected
         self.value_imported = value_imported
 
-    @classmethod
-    def serialize(cls, *args):
-        ...
+    def serialize(self) -> Cell:
+        return Builder().store_coins(self.fees_collected).store_cell(self.value_imported.serialize()).end_cell()
 
     @classmethod
     def deserialize(cls, cell_slice: Slice):
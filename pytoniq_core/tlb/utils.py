@@ -35,6 +35,26 @@ class MerkleUpdate(TlbScheme):
         new = deserializer(cell_slice.load_ref().begin_parse())
         return cls(cell, old_hash, new_hash, old, new)
 
+    def apply(self, old_root: Cell) -> Cell:
+        """
+        :param old_root: old state root, its hash must be equal to old_hash
+        :return: new state root with subtrees unchanged by the update shared with old_root
+        """
+        from ..proof.merkle_update import apply_merkle_update
+        return apply_merkle_update(self.cell, old_root)
+
+    @classmethod
+    def create(cls, old_root: Cell, new_root: Cell, deserializer: typing.Optional[typing.Callable] = None) -> "MerkleUpdate":
+        """
+        Builds update between two states, .cell is the MERKLE_UPDATE cell.
+        If deserializer is not given, .old and .new are the raw side cells.
+        """
+        from ..proof.merkle_update import create_merkle_update
+        cell = create_merkle_update(old_root, new_root)
+        if deserializer is not None:
+            return cls.deserialize(cell, deserializer)
+        return cls(cell, old_root.hash, new_root.hash, cell.refs[0], cell.refs[1])
+
 
 class HashUpdate(TlbScheme):
     """
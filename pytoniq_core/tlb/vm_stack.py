@@ -1,4 +1,4 @@
-import copy
+import typing
 
 from .tlb import TlbScheme, TlbError
 from ..boc.slice import Slice
@@ -19,7 +19,7 @@ class VmStack(TlbScheme):
     def serialize(cls, data: list) -> "Cell":
         result = Builder()
         result.store_uint(len(data), 24)  # depth
-        return result.store_cell(VmStackList.serialize(data.copy())).end_cell()
+        return result.store_cell(VmStackList.serialize(data)).end_cell()
 
     @classmethod
     def deserialize(cls, cell_slice: Slice):
@@ -34,19 +34,19 @@ class VmStackList(TlbScheme):
     """
     @classmethod
     def serialize(cls, data: list) -> Cell:
-        builder = Builder()
-        if len(data) == 0:
-            return builder.end_cell()
-        value = data.pop()
-        builder.store_ref(cls.serialize(data))
-        return builder.store_cell(VmStackValue.serialize(value)).end_cell()
+        cell = Builder().end_cell()  # vm_stk_nil
+        for value in data:  # the last value is the top of stack and goes to the root cell
+            cell = Builder().store_ref(cell).store_cell(VmStackValue.serialize(value)).end_cell()
+        return cell
 
     @classmethod
     def deserialize(cls, cell_slice: Slice, n_p_1: int):  # n_p_1 stands for n plus 1 or n + 1
-        if n_p_1 == 0:
-            return []
-        result = cls.deserialize(cell_slice.load_ref().begin_parse(), n_p_1 - 1)
-        return result + [VmStackValue.deserialize(cell_slice)]
+        slices = []
+        for _ in range(n_p_1):
+            rest = cell_slice.load_ref()
+            slices.append(cell_slice)
+            cell_slice = rest.begin_parse()
+        return [VmStackValue.deserialize(i) for i in reversed(slices)]
 
 
 class VmStackValue(TlbScheme):
@@ -64,6 +64,27 @@ class VmStackValue(TlbScheme):
 
     @classmethod
     def serialize(cls, value) -> Cell:
+        if not isinstance(value, VmTuple):
+            return cls._serialize(value)
+        # nested tuples (e.g. lisp-style lists) are serialized bottom-up without recursion
+        stack = [(value, [])]  # (tuple, its serialized items)
+        while True:
+            tuple_, cells = stack[-1]
+            while len(cells) < len(tuple_):
+                item = tuple_[len(cells)]
+                if isinstance(item, VmTuple):
+                    stack.append((item, []))
+                    break
+                cells.append(cls._serialize(item))
+            else:
+                stack.pop()
+                cell = Builder().store_bytes(b'\x07').store_uint(len(tuple_), 16).store_cell(VmTuple.from_cells(cells)).end_cell()
+                if not stack:
+                    return cell
+                stack[-1][1].append(cell)
+
+    @classmethod
+    def _serialize(cls, value) -> Cell:
         builder = Builder()
         if value is None:
             builder.store_bytes(b'\x00')
@@ -92,44 +113,65 @@ class VmStackValue(TlbScheme):
             builder.store_bytes(b'\x06')
             builder.store_cell(VmCont.serialize(value))
         elif isinstance(value, VmTuple):
-            builder.store_bytes(b'\x07')
-            builder.store_uint(len(value), 16)
-            builder.store_cell(VmTuple.serialize(value))
+            return cls.serialize(value)
         return builder.end_cell()
 
     @classmethod
     def deserialize(cls, cell_slice: Slice):
+        value, cells = cls._deserialize(cell_slice)
+        if cells is None:
+            return value
+        # tuple items are filled in depth-first order without recursion
+        stack = [(value, iter(cells))]
+        while stack:
+            tuple_, items = stack[-1]
+            for cell in items:
+                item, item_cells = cls._deserialize(cell.begin_parse())
+                tuple_.append(item)
+                if item_cells is not None:
+                    stack.append((item, iter(item_cells)))
+                    break
+            else:
+                stack.pop()
+        return value
+
+    @classmethod
+    def _deserialize(cls, cell_slice: Slice) -> typing.Tuple[typing.Any, typing.Optional[typing.List[Cell]]]:
+        """
+        :return: (value, None) or (empty VmTuple, cells of its items) for tuples
+        """
         tag = cell_slice.preload_bits(15).to01()
         if tag == '000000100000000':  # #0201_
             cell_slice.load_bits(15)
-            return cell_slice.load_int(257)
+            return cell_slice.load_int(257), None
 
         tag = cell_slice.preload_bytes(2)
         if tag[:1] == b'\x00':
             cell_slice.load_bytes(1)
-            return None
+            return None, None
         elif tag[:1] == b'\x01':
             cell_slice.load_bytes(1)
-            return cell_slice.load_int(64)
+            return cell_slice.load_int(64), None
         elif tag == b'\x02\xff':
             cell_slice.load_bytes(2)
-            return None
+            return None, None
         elif tag[:1] == b'\x03':
             cell_slice.load_bytes(1)
-            return cell_slice.load_ref()
+            return cell_slice.load_ref(), None
         elif tag[:1] == b'\x05':
             cell_slice.load_bytes(1)
-            return cell_slice.load_ref().to_builder()
+            return cell_slice.load_ref().to_builder(), None
         elif tag[:1] == b'\x04':
             cell_slice.load_bytes(1)
-            return VmCellSlice.deserialize(cell_slice)
+            return VmCellSlice.deserialize(cell_slice), None
         elif tag[:1] == b'\x06':
             cell_slice.load_bytes(1)
-            return VmCont.deserialize(cell_slice)
+            return VmCont.deserialize(cell_slice), None
         elif tag[:1] == b'\x07':
             cell_slice.load_bytes(1)
             tuple_len = cell_slice.load_uint(16)
-            return VmTuple.deserialize(cell_slice, tuple_len)
+            return VmTuple([]), VmTuple.item_cells(cell_slice, tuple_len)
+        return None, None
 
 
 class VmTuple(TlbScheme):
@@ -170,22 +212,48 @@ class VmTuple(TlbScheme):
     def pop(self, index: int = -1):
         return self.list.pop(index)
 
+    @staticmethod
+    def from_cells(cells: typing.List[Cell]) -> Cell:
+        """
+        :param cells: serialized VmStackValue items
+        :return: VmTuple len(cells) cell
+        """
+        if len(cells) == 0:
+            return Cell.empty()
+        if len(cells) == 1:
+            return Builder().store_ref(cells[0]).end_cell()
+        result = Builder().store_ref(cells[0]).store_ref(cells[1]).end_cell()
+        for cell in cells[2:]:
+            result = Builder().store_ref(result).store_ref(cell).end_cell()
+        return result
+
+    @staticmethod
+    def item_cells(cell_slice: Slice, length: int) -> typing.List[Cell]:
+        """
+        :return: cells of VmStackValue items of VmTuple length
+        """
+        tails = []
+        while length > 0:
+            if length == 1:
+                tails.append(cell_slice.load_ref())
+                break
+            head = cell_slice.load_ref()
+            tails.append(cell_slice.load_ref())
+            if length == 2:
+                tails.append(head)
+                break
+            cell_slice = head.begin_parse()
+            length -= 1
+        tails.reverse()
+        return tails
+
     @classmethod
     def serialize(cls, values: "VmTuple") -> Cell:
-        if len(values) == 0:
-            return Cell.empty()
-        builder = Builder()
-        value = values.pop()
-        builder.store_cell(VmTupleRef.serialize(values))
-        builder.store_ref(VmStackValue.serialize(value))
-        return builder.end_cell()
+        return cls.from_cells([VmStackValue.serialize(i) for i in values.list])
 
     @classmethod
     def deserialize(cls, cell_slice: Slice, length: int) -> "VmTuple":
-        if length == 0:
-            return VmTuple([])
-
-        return VmTupleRef.deserialize(cell_slice, length - 1).append(VmStackValue.deserialize(cell_slice.load_ref().begin_parse()))
+        return VmTuple([VmStackValue.deserialize(i.begin_parse()) for i in cls.item_cells(cell_slice, length)])
 
 
 class VmTupleRef(TlbScheme):
@@ -0,0 +1,37 @@
+import hashlib
+
+from pytoniq_core.crypto.ciphers import Client, Server, AdnlChannel, create_aes_ctr_sipher_from_key_n_data, aes_ctr_encrypt
+
+
+def make_channels():
+    a, b = Client(bytes([1]) * 32), Client(bytes([2]) * 32)
+    a_id, b_id = a.get_key_id(), b.get_key_id()
+    ab = AdnlChannel(a, Server('', 0, b.ed25519_public.encode()), a_id, b_id)
+    ba = AdnlChannel(b, Server('', 0, a.ed25519_public.encode()), b_id, a_id)
+    return ab, ba
+
+
+def test_adnl_channel_codec():
+    ab, ba = make_channels()
+    data = bytes(range(256)) * 3
+
+    packet = ab.encrypt(data)
+    checksum = hashlib.sha256(data).digest()
+    old_cipher = create_aes_ctr_sipher_from_key_n_data(ab.enc_key, checksum)
+    assert packet == ab.client_aes_key_id + checksum + aes_ctr_encrypt(old_cipher, data)
+    assert packet[:32] == ba.server_aes_key_id
+    assert ba.decrypt(packet[64:], packet[32:64]) == data
+
+    out = bytearray(10 + len(packet))
+    assert ab.encrypt_into(memoryview(data), out, offset=10) == len(packet)
+    assert out[10:] == packet
+    plain = bytearray(len(data))
+    assert ba.decrypt_into(memoryview(out)[74:], packet[32:64], plain) == len(data)
+    assert plain == data
+
+    packets = [data[:i] for i in (0, 1, 100, 768)]
+    buffer = bytearray(4096)
+    views = ab.encrypt_many(packets, buffer)
+    assert [bytes(i) for i in views] == [ab.encrypt(i) for i in packets]
+    assert views[0].obj is buffer
+    assert ab.encrypt_many(packets, bytearray(8))[3].tobytes() == ab.encrypt(packets[3])
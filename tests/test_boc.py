@@ -0,0 +1,83 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from pytoniq_core.boc import begin_cell, Cell, Boc, BocReader, BocError, BocIncompleteError
+
+
+def make_tree(depth: int = 8) -> Cell:
+    cells = [begin_cell().store_uint(i, 32).end_cell() for i in range(2 ** depth)]
+    while len(cells) > 1:
+        cells = [begin_cell().store_uint(len(cells), 16).store_ref(a).store_ref(b).end_cell()
+                 for a, b in zip(cells[::2], cells[1::2])]
+    return cells[0]
+
+
+def test_deserialize_async():
+    root = make_tree()
+    boc = root.to_boc(has_idx=True, hash_crc32=True)
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        task = asyncio.create_task(ticker())
+        await asyncio.sleep(0)
+        cells = await Boc(boc).deserialize_async(chunk_cells=50)
+        task.cancel()
+        return cells, ticks
+
+    cells, ticks = asyncio.run(main())
+    assert cells[0].hash == root.hash
+    assert ticks > 2 * 511 // 50  # event loop ran while both passes over 511 cells were in progress
+
+    async def offload():
+        with ThreadPoolExecutor(1) as executor:
+            return await Boc(boc).deserialize_async(executor=executor)
+
+    assert asyncio.run(offload())[0].hash == root.hash
+
+
+@pytest.mark.parametrize('kwargs', [{}, {'has_idx': True, 'hash_crc32': True}])
+def test_boc_reader(kwargs):
+    root = make_tree()
+    boc = root.to_boc(**kwargs)
+
+    reader = BocReader()
+    assert reader.missing is None
+    for i in range(0, len(boc), 7):
+        assert not reader.complete
+        with pytest.raises(BocIncompleteError):
+            reader.deserialize()
+        reader.feed(boc[i: i + 7])
+        assert reader.missing in (None, len(boc) - min(i + 7, len(boc)))  # None until the header is fed
+    assert reader.complete and reader.missing == 0
+    assert reader.deserialize()[0].hash == root.hash
+    assert asyncio.run(reader.deserialize_async(chunk_cells=10))[0].hash == root.hash
+
+    with pytest.raises(BocError):
+        reader.feed(b'\x00')
+
+
+def test_boc_reader_errors():
+    boc = make_tree(3).to_boc(hash_crc32=True)
+
+    reader = BocReader()
+    with pytest.raises(BocError):
+        reader.feed(boc[:-1] + bytes([boc[-1] ^ 1]))
+    with pytest.raises(BocError, match='failed'):  # reader can't be reused after an error
+        reader.feed(b'')
+    with pytest.raises(BocError, match='failed'):
+        reader.deserialize()
+
+    with pytest.raises(BocError):
+        asyncio.run(Boc(boc).deserialize_async(chunk_cells=0))
+
+    with pytest.raises(BocError):
+        BocReader().feed(b'\x00' * 10)
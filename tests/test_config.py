@@ -0,0 +1,49 @@
+import pytest
+
+from pytoniq_core.boc import Builder, HashMap, CellTypes
+from pytoniq_core.tlb.block import ConfigParams
+from pytoniq_core.tlb.config import ConfigError, ConfigParam, ConfigParam0, ConfigParam1
+
+
+def make_config_params(config_addr: bytes) -> ConfigParams:
+    config = HashMap(32, value_serializer=lambda src, dest: dest.store_ref(src))
+    config.set_int_key(0, Builder().store_bytes(config_addr).end_cell())
+    config.set_int_key(1, Builder().store_bytes(b'\x02' * 32).end_cell())
+    config.set_int_key(1000, Builder().store_uint(7, 8).end_cell())
+    cs = Builder().store_bytes(b'\x01' * 32).store_ref(config.serialize()).end_cell().begin_parse()
+    return ConfigParams.deserialize(cs)
+
+
+def test_lazy_config_params(monkeypatch):
+    ConfigParam._cache.clear()
+    calls = []
+    deserialize = ConfigParam1.deserialize.__func__
+    monkeypatch.setattr(ConfigParam1, 'deserialize', classmethod(lambda cls, cs: calls.append(1) or deserialize(cls, cs)))
+
+    params = make_config_params(b'\x01' * 32)
+    assert set(params) == {0, 1, 1000} and 34 not in params
+    assert params.config[1].load_bytes(32) == b'\x02' * 32  # raw slices are still available
+    assert not calls
+
+    assert params[1].elector_addr == b'\x02' * 32
+    assert isinstance(params.get(0), ConfigParam0)
+    assert params.get(1000).begin_parse().load_uint(8) == 7  # no scheme for the param
+    assert params.get(34) is None
+
+    other = make_config_params(b'\x03' * 32)  # another block, param 1 not changed
+    assert other[1] is params[1]
+    assert other[0].config_addr == b'\x03' * 32
+    assert len(calls) == 1
+    assert other.hash != params.hash
+
+
+def test_pruned_config_params():
+    pruned = Builder(type_=CellTypes.pruned_branch).store_uint(1, 8).store_uint(1, 8).store_bytes(bytes(32)).store_uint(0, 16).end_cell()
+    params = ConfigParams.deserialize(Builder().store_bytes(b'\x01' * 32).store_ref(pruned).end_cell().begin_parse())
+    assert params.pruned and params.config is None
+    assert bool(params)  # `if extra.config:` works for proof blocks
+    assert bool(ConfigParams(config_addr='00' * 32, config={}))
+    assert params.hash == pruned.hash
+    for access in (lambda: params.get(34), lambda: params[34], lambda: 34 in params, lambda: len(params)):
+        with pytest.raises(ConfigError):
+            access()
@@ -0,0 +1,50 @@
+from pytoniq_core.boc import Builder, Cell, HashMap
+from pytoniq_core.tlb.block import ConfigParams
+from pytoniq_core.tlb.fees import FeeEstimator
+
+
+def gas_prices(flat_limit: int, flat_price: int, gas_price: int) -> Cell:
+    builder = Builder().store_uint(0xd1, 8).store_uint(flat_limit, 64).store_uint(flat_price, 64).store_uint(0xde, 8)
+    for i in (gas_price, 1000000, 1000000, 1000000, 10000000, 100000000, 1000000000):
+        builder.store_uint(i, 64)
+    return builder.end_cell()
+
+
+def fwd_prices(lump: int, bit: int, cell: int) -> Cell:
+    return Builder().store_uint(0xea, 8).store_uint(lump, 64).store_uint(bit, 64).store_uint(cell, 64) \
+        .store_uint(98304, 32).store_uint(21845, 16).store_uint(21845, 16).end_cell()
+
+
+def make_config(lump: int = 400000) -> ConfigParams:
+    storage = HashMap(32, value_serializer=lambda src, dest: dest.store_uint(0xcc, 8).store_uint(src[0], 32)
+                      .store_uint(src[1], 64).store_uint(src[2], 64).store_uint(src[3], 64).store_uint(src[4], 64))
+    storage.set_int_key(0, (0, 1, 500, 1000, 500000))
+    storage.set_int_key(1, (100, 2, 1000, 2000, 1000000))
+    config = HashMap(32, value_serializer=lambda src, dest: dest.store_ref(src))
+    config.set_int_key(18, Builder().store_cell(storage.serialize()).end_cell())
+    config.set_int_key(20, gas_prices(100, 1000000, 655360000))
+    config.set_int_key(21, gas_prices(100, 40000, 26214400))
+    config.set_int_key(24, fwd_prices(10000000, 655360000, 65536000000))
+    config.set_int_key(25, fwd_prices(lump, 26214400, 2621440000))
+    cs = Builder().store_bytes(bytes(32)).store_ref(config.serialize()).end_cell().begin_parse()
+    return ConfigParams.deserialize(cs)
+
+
+def test_fees():
+    estimator = FeeEstimator(make_config())
+
+    shared = Builder().store_uint(1, 32).end_cell()
+    msg = Builder().store_uint(0, 8).store_ref(shared).store_ref(Builder().store_ref(shared).end_cell()).end_cell()
+
+    assert estimator.forward_fees([(0, 0), (1023, 1), msg]) == [400000, 400000 + 409200 + 40000, 400000 + 12800 + 80000]
+    assert estimator.action_fees([400000]) == [133331]
+    assert estimator.gas_fees([0, 100, 1000]) == [40000, 40000, 400000]
+    assert estimator.gas_fees([1000], masterchain=True) == [1000000 + 9000000]
+
+    # prices change at 100: 50 seconds with (1, 500) then 50 seconds with (2, 1000)
+    assert estimator.storage_fees([(65536, 0), (0, 65536), msg], last_paid=50, now=150) == \
+           [50 * 1 + 50 * 2, 50 * 500 + 50 * 1000, (40 * 150 + 3 * 75000 + 0xffff) >> 16]
+
+    assert not estimator.update(make_config())  # same config
+    assert estimator.update(make_config(lump=1))
+    assert estimator.forward_fees([(0, 0)]) == [1]
@@ -1,4 +1,9 @@
+import random
+
 from pytoniq_core.boc import HashMap, Builder, Address
+from pytoniq_core.boc.hashmap import dict_get, dict_set, dict_delete, DictCursor, dict_diff, HashMapAug
+from pytoniq_core.boc.hashmap.parse import parse_hashmap_aug
+from pytoniq_core.tlb.block import DepthBalanceInfo, CurrencyCollection
 
 
 def test_ser():
@@ -20,3 +25,138 @@ def test_parse():
         .set(key=Address('EQCD39VS5jcptHL8vMjEXrzGaRcCVYto7HUn4bpAOg8xqB2N'), value=10)
 
     assert hashmap.serialize().begin_parse().load_hashmap(267, value_deserializer=lambda i: i.load_coins()) == {118621468258109555883414559823777639640406072296410285331234498098430527437346690: 15, 118630747841378569603204119301805376564831504145530059638093173869611524683674024: 10}
+
+
+def test_persistent_set_delete():
+
+    random.seed(1)
+    serializer = lambda src, dest: dest.store_uint(src, 16)
+    keys = random.sample(range(2 ** 16), 200) + [0, 2 ** 16 - 1]
+    expected = {}
+    root = None
+    for i, key in enumerate(keys):
+        root = dict_set(root, key, 16, Builder().store_uint(i, 16))
+        expected[key] = i
+    assert root.hash == HashMap(16, map_=dict(expected), value_serializer=serializer).serialize().hash
+
+    old_root = root
+    root = dict_set(root, keys[5], 16, Builder().store_uint(7, 16))  # overwrite
+    assert dict_get(root, keys[5], 16).load_uint(16) == 7
+    assert dict_get(old_root, keys[5], 16).load_uint(16) == 5
+    assert root.refs[1 - (keys[5] >> 15)] is old_root.refs[1 - (keys[5] >> 15)]  # other half is reused
+    expected[keys[5]] = 7
+
+    for key in keys[::3]:
+        root = dict_delete(root, key, 16)
+        del expected[key]
+    assert root.hash == HashMap(16, map_=dict(expected), value_serializer=serializer).serialize().hash
+    assert dict_delete(root, keys[0], 16) is root  # no such key
+    assert dict_get(root, keys[0], 16) is None
+
+    for key in list(expected):
+        root = dict_delete(root, key, 16)
+    assert root is None
+
+
+def test_dict_cursor():
+
+    random.seed(2)
+    keys = sorted(random.sample(range(2 ** 12), 300))
+    root = HashMap(12, map_={k: k * 3 for k in keys}, value_serializer=lambda src, dest: dest.store_uint(src, 16)).serialize()
+    cursor = DictCursor(root, 12)
+
+    assert [(k, v.load_uint(16)) for k, v in cursor] == [(k, k * 3) for k in keys]
+    assert cursor.min()[0] == keys[0] and cursor.max()[0] == keys[-1]
+    assert cursor.next(keys[10])[0] == keys[11] and cursor.next(keys[10], inclusive=True)[0] == keys[10]
+    assert cursor.prev(keys[10])[0] == keys[9] and cursor.prev(keys[0]) is None
+    assert cursor.next(keys[-1]) is None
+    assert [k for k, _ in cursor.range(1000, 2000)] == [k for k in keys if 1000 <= k < 2000]
+    assert [k for k, _ in cursor.range(1000, 2000, reverse=True)] == [k for k in keys if 1000 <= k < 2000][::-1]
+    assert [k for k, _ in cursor.prefix(0b101, 3)] == [k for k in keys if k >> 9 == 0b101]
+    assert DictCursor(None, 12).min() is None
+
+
+def test_dict_diff():
+
+    random.seed(3)
+    serializer = lambda src, dest: dest.store_uint(src, 16)
+    for _ in range(20):
+        old = {k: random.randrange(4) for k in random.sample(range(2 ** 10), random.randrange(1, 60))}
+        new = dict(old)
+        for k in random.sample(list(old), random.randrange(len(old) + 1)):
+            if random.random() < 0.5:
+                del new[k]
+            else:
+                new[k] = random.randrange(4)
+        for k in random.sample(range(2 ** 10), random.randrange(10)):
+            new[k] = random.randrange(4)
+
+        old_root = HashMap(10, map_=old, value_serializer=serializer).serialize()
+        new_root = HashMap(10, map_=dict(new), value_serializer=serializer).serialize()
+        diff = [(k, a.load_uint(16) if a else None, b.load_uint(16) if b else None)
+                for k, a, b in dict_diff(old_root, new_root, 10)]
+        expected = [(k, old.get(k), new.get(k)) for k in sorted(set(old) | set(new)) if old.get(k) != new.get(k)]
+        assert diff == expected
+
+    assert list(dict_diff(old_root, old_root, 10)) == []
+    assert [k for k, _, _ in dict_diff(None, old_root, 10)] == sorted(old)
+
+
+def test_hashmap_aug():
+
+    random.seed(2)
+    kwargs = dict(value_serializer=lambda src, dest: dest.store_uint(src, 32),
+                  extra_serializer=lambda src, dest: dest.store_cell(src.serialize()),
+                  aggregate=lambda a, b: DepthBalanceInfo(0, CurrencyCollection(a.balance.grams + b.balance.grams)))
+    keys = random.sample(range(2 ** 20), 300)
+    expected = {key: i for i, key in enumerate(keys)}
+    aug = HashMapAug(20, map_={k: (v, DepthBalanceInfo(0, CurrencyCollection(v))) for k, v in expected.items()}, **kwargs)
+    root = aug.serialize()
+    assert aug.extra.balance.grams == sum(expected.values())
+
+    values, extras = parse_hashmap_aug(root.begin_parse(), 20, lambda cs: cs.load_uint(32), DepthBalanceInfo.deserialize)
+    assert values == expected
+    assert len(extras) == 2 * len(keys) - 1  # leaves and forks
+    fork_cs = root.begin_parse()
+    fork_cs.skip_bits(2)  # empty short label
+    fork_cs.load_ref()
+    fork_cs.load_ref()
+    assert DepthBalanceInfo.deserialize(fork_cs).balance.grams == sum(expected.values())
+
+    def full():
+        return HashMapAug(20, map_={k: (v, DepthBalanceInfo(0, CurrencyCollection(v))) for k, v in expected.items()},
+                          **kwargs).serialize()
+
+    # incremental updates give the same cells as building from scratch
+    for key in keys[:20]:
+        expected[key] += 1000
+        aug.set(key, expected[key], DepthBalanceInfo(0, CurrencyCollection(expected[key])))
+    for key in random.sample(range(2 ** 20), 20):
+        expected[key] = 1
+        aug.set(key, 1, DepthBalanceInfo(0, CurrencyCollection(1)))
+    for key in keys[20:60]:
+        del expected[key]
+        aug.delete(key)
+    assert aug.serialize().hash == full().hash
+    assert aug.extra.balance.grams == sum(expected.values())
+
+    # extras of replaced cells are dropped, the cache stays bounded
+    for i in range(1000):
+        key = keys[60 + i % 20]
+        expected[key] = i
+        aug.set(key, i, DepthBalanceInfo(0, CurrencyCollection(i)))
+    assert len(aug._extras) <= 4 * (2 * len(expected) - 1) + 1024 + 20
+    assert aug.serialize().hash == full().hash
+    assert aug.extra.balance.grams == sum(expected.values())
+
+    # existing cells with extras read back from them
+    loaded = HashMapAug.from_cell(aug.serialize(), 20, DepthBalanceInfo.deserialize, **kwargs)
+    loaded.set(keys[0], 5, DepthBalanceInfo(0, CurrencyCollection(5)))
+    expected[keys[0]] = 5
+    assert loaded.serialize().hash == full().hash
+    assert loaded.extra.balance.grams == sum(expected.values())
+
+    empty = HashMapAug(20, **kwargs).serialize_e(DepthBalanceInfo(0, CurrencyCollection(0)))
+    assert empty.begin_parse().load_bit() == 0
+    cs = aug.serialize_e().begin_parse()
+    assert cs.load_bit() == 1 and cs.load_ref().hash == aug.serialize().hash
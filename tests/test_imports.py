@@ -0,0 +1,24 @@
+import importlib
+import subprocess
+import sys
+import types
+
+import pytoniq_core
+
+
+def test_lazy_names_match_subpackages():
+    for module, names in pytoniq_core._lazy_names.items():
+        mod = importlib.import_module(f'pytoniq_core.{module}')
+        exported = {n for n in dir(mod) if not n.startswith('_') and not isinstance(getattr(mod, n), types.ModuleType)}
+        assert exported - set(dir(pytoniq_core.boc)) == set(names), module
+        for name in names:
+            assert getattr(pytoniq_core, name) is getattr(mod, name)
+
+
+def test_lazy_import():
+    code = 'import sys, pytoniq_core; pytoniq_core.Cell; ' \
+           'print(sorted(m for m in sys.modules if m.split(".")[0] in ("nacl", "Cryptodome", "x25519") ' \
+           'or m == "asyncio" or m.startswith(("pytoniq_core.tl", "pytoniq_core.proof"))))'
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+    assert out.strip() == '[]'
+    assert 'Block' in dir(pytoniq_core)
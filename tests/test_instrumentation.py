@@ -0,0 +1,44 @@
+from pytoniq_core.boc import Builder, Cell, HashMap, Slice
+from pytoniq_core.instrumentation import instrument
+from pytoniq_core.tlb import CurrencyCollection
+from pytoniq_core.tl import TlGenerator
+
+
+def test_counters():
+    hashmap = HashMap(32, value_serializer=lambda src, dest: dest.store_uint(src, 8))
+    for i in range(4):
+        hashmap.set_int_key(i, i)
+    root = hashmap.serialize()
+
+    with instrument() as stats:
+        Builder().store_uint(1, 8).store_ref(Cell.empty()).end_cell()
+        root.begin_parse().load_bits(5)
+        HashMap.parse(root.begin_parse(), 32)
+        CurrencyCollection.deserialize(Builder().store_coins(5).store_bit(0).end_cell().begin_parse())
+
+    result = stats.snapshot()
+    assert result['cells'] == 3
+    assert result['hashes'] >= result['cells']
+    assert result['bits_copied'] >= 13
+    assert result['dict_nodes'] == 7  # 4 leaves and 3 forks
+    assert result['tl_objects'] == 0
+    assert set(result['tlb']) == {'CurrencyCollection', 'ExtraCurrencyCollection'}
+    assert result['tlb']['CurrencyCollection'][0] == 1
+
+    Cell.empty()
+    assert stats.snapshot() == result  # frozen after exit
+
+
+def test_uninstall_and_nesting():
+    init, deserialize = Cell.__init__, CurrencyCollection.deserialize
+    schemas = TlGenerator.with_default_schemas().generate()
+    data = schemas.serialize(schemas.get_by_name('dht.ping'), {'random_id': 1})
+    with instrument() as outer:
+        assert Cell.__init__ is not init
+        with instrument() as inner:
+            schemas.deserialize(data)
+        Cell.empty()
+        assert inner.snapshot()['tl_objects'] == 1 and inner.snapshot()['cells'] == 0
+    assert outer.snapshot()['tl_objects'] == 1 and outer.snapshot()['cells'] == 1
+    assert Cell.__init__ is init and CurrencyCollection.deserialize == deserialize
+    assert isinstance(Slice.preload_bits, type(init))
@@ -0,0 +1,20 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from pytoniq_core.crypto.keys import mnemonic_new_many, mnemonic_to_wallet_key_many, mnemonic_to_wallet_key, \
+    mnemonic_is_valid, words
+
+
+def test_mnemonic_many():
+    mnemonics = mnemonic_new_many(3, workers=1)
+    assert len(mnemonics) == 3
+    assert all(len(i) == 24 and mnemonic_is_valid(i) and set(i) <= set(words) for i in mnemonics)
+    assert len(mnemonic_new_many(2, words_count=12, workers=2)[1]) == 12
+
+    keys = mnemonic_to_wallet_key_many(mnemonics, workers=2)
+    assert keys == [mnemonic_to_wallet_key(i) for i in mnemonics]
+    assert mnemonic_to_wallet_key_many(mnemonics[:1], workers=1) == keys[:1]
+
+    with ProcessPoolExecutor(2) as pool:
+        assert mnemonic_to_wallet_key_many(mnemonics, executor=pool) == keys
+        with_password = mnemonic_new_many(2, password='secret', executor=pool)
+    assert len(with_password) == 2 and all(len(i) == 24 for i in with_password)
@@ -0,0 +1,88 @@
+import pytest
+
+from pytoniq_core.boc import Builder, Cell, CellTypes
+from pytoniq_core.boc.hashmap import dict_set, dict_delete
+from pytoniq_core.proof import MerkleUpdateError, apply_merkle_update, create_merkle_update
+from pytoniq_core.tlb import MerkleUpdate
+
+
+def make_state(n: int, shift: int = 0):
+    root = None
+    for i in range(n):
+        root = dict_set(root, i * 7, 32, Builder().store_uint(i + shift, 64).end_cell())
+    return Builder().store_uint(0xcafe, 16).store_ref(root).end_cell()
+
+
+def ordinary_cells(cell: Cell) -> int:
+    stack, seen = [cell], set()
+    while stack:
+        c = stack.pop()
+        if c.type_ == CellTypes.ordinary and c.hash not in seen:
+            seen.add(c.hash)
+            stack.extend(c.refs)
+    return len(seen)
+
+
+def test_create_apply():
+    old = make_state(200)
+    accounts = old[0]
+    accounts = dict_set(accounts, 7 * 5, 32, Builder().store_uint(1, 64).end_cell())
+    accounts = dict_set(accounts, 100_000, 32, Builder().store_uint(2, 64).end_cell())
+    accounts = dict_delete(accounts, 7 * 150, 32)
+    new = Builder().store_uint(0xcafe, 16).store_ref(accounts).end_cell()
+
+    update = create_merkle_update(old, new)
+    assert update.type_ == CellTypes.merkle_update
+    assert update.level_mask.mask == 0
+    update = Cell.one_from_boc(update.to_boc())
+    assert ordinary_cells(update[1]) < ordinary_cells(new) // 10  # only changed paths are included
+
+    result = apply_merkle_update(update, old)
+    assert result.hash == new.hash
+    old_cells = {}
+    stack = [old]
+    while stack:
+        c = stack.pop()
+        old_cells[c.hash] = c
+        stack.extend(c.refs)
+    stack, shared = [result], 0
+    while stack:
+        c = stack.pop()
+        if old_cells.get(c.hash) is c:  # unchanged subtrees are taken from the old state
+            shared += 1
+            continue
+        stack.extend(c.refs)
+    assert shared > 10
+
+    mu = MerkleUpdate.deserialize(update, lambda cs: cs)
+    assert (mu.old_hash, mu.new_hash) == (old.hash, new.hash)
+    assert mu.apply(old).hash == new.hash
+    assert MerkleUpdate.create(old, new).apply(old).hash == new.hash
+
+
+def test_create_apply_edge_cases():
+    old = make_state(10)
+    assert apply_merkle_update(create_merkle_update(old, old), old).hash == old.hash
+    other = make_state(10, shift=1)  # every leaf changed
+    assert apply_merkle_update(create_merkle_update(old, other), old).hash == other.hash
+    moved = Builder().store_ref(old[0]).store_ref(old).end_cell()  # old subtrees at new positions
+    update = create_merkle_update(old, moved)
+    assert apply_merkle_update(update, old).hash == moved.hash
+    assert ordinary_cells(update[1]) == 1
+
+
+def test_apply_errors():
+    old, new = make_state(10), make_state(11)
+    update = create_merkle_update(old, new)
+    with pytest.raises(MerkleUpdateError):
+        apply_merkle_update(update, new)
+    with pytest.raises(MerkleUpdateError):
+        apply_merkle_update(old, old)
+
+    # update with forged new_hash
+    cs = update.begin_parse()
+    forged = Builder(type_=CellTypes.merkle_update).store_bits(cs.load_bits(8 + 256)).store_bytes(b'\x00' * 32)
+    cs.skip_bits(256)
+    forged = forged.store_slice(cs).end_cell()
+    with pytest.raises(MerkleUpdateError):
+        apply_merkle_update(forged, old)
@@ -0,0 +1,94 @@
+import pytest
+
+from pytoniq_core.boc import Builder, Cell, HashMap, CellTypes
+from pytoniq_core.proof.navigator import StateNavigator, PrunedBranchError
+
+
+def prune(cell: Cell) -> Cell:
+    return Builder(type_=CellTypes.pruned_branch).store_uint(1, 8).store_uint(1, 8).store_bytes(cell.hash).store_uint(cell.get_depth(0), 16).end_cell()
+
+
+def replace(cell: Cell, ref_path: list, new: Cell) -> Cell:
+    if not ref_path:
+        return new
+    refs = cell.refs.copy()
+    refs[ref_path[0]] = replace(refs[ref_path[0]], ref_path[1:], new)
+    return Cell(cell.bits.copy(), refs, cell.type_)
+
+
+def shard_descr(seq_no: int) -> Cell:
+    builder = Builder().store_uint(0xb, 4).store_uint(seq_no, 32).store_uint(1, 32).store_uint(0, 64).store_uint(0, 64)
+    builder.store_bytes(bytes(32)).store_bytes(bytes(32)).store_uint(0, 5).store_uint(0, 3)
+    builder.store_uint(0, 32).store_uint(0, 64).store_uint(0, 32).store_uint(0, 32).store_bit(0)
+    return builder.store_coins(1).store_bit(0).store_coins(2).store_bit(0).end_cell()
+
+
+def make_state():
+    accounts = HashMap(256, value_serializer=lambda src, dest: dest.store_uint(0, 5).store_coins(src).store_bit(0)
+                       .store_ref(Builder().store_bit(0).end_cell()).store_bytes(bytes(32)).store_uint(src, 64))
+    accounts.set_int_key(1, 10).set_int_key(2 ** 255, 20).set_int_key(2 ** 255 + 1, 30)
+
+    bin_tree = Builder().store_bit(1) \
+        .store_ref(Builder().store_bit(0).store_cell(shard_descr(1)).end_cell()) \
+        .store_ref(Builder().store_bit(0).store_cell(shard_descr(2)).end_cell()).end_cell()
+    shard_hashes = HashMap(32, value_serializer=lambda src, dest: dest.store_ref(src)).set_int_key(0, bin_tree)
+
+    config = HashMap(32, value_serializer=lambda src, dest: dest.store_ref(src))
+    config.set_int_key(0, Builder().store_bytes(b'\x01' * 32).end_cell())
+    config.set_int_key(34, Builder().store_uint(34, 32).end_cell())
+
+    custom = Builder().store_bytes(b'\xcc&').store_dict(shard_hashes.serialize()) \
+        .store_bytes(b'\x01' * 32).store_ref(config.serialize()) \
+        .store_ref(Cell.empty()).store_coins(0).store_bit(0).end_cell()
+
+    return Builder().store_bytes(b'\x90#\xaf\xe2').store_int(-239, 32) \
+        .store_uint(0, 2).store_uint(0, 6).store_int(-1, 32).store_uint(2 ** 63, 64) \
+        .store_uint(1, 32).store_uint(0, 32).store_uint(0, 32).store_uint(0, 64).store_uint(0, 32) \
+        .store_ref(Cell.empty()).store_bit(0) \
+        .store_ref(Builder().store_dict(accounts.serialize()).end_cell()) \
+        .store_ref(Cell.empty()).store_maybe_ref(custom).end_cell()
+
+
+def test_navigate_full_state():
+    state = make_state()
+    proof = Builder(type_=CellTypes.merkle_proof).store_uint(3, 8).store_bytes(state.hash).store_uint(state.get_depth(0), 16).store_ref(state).end_cell()
+    nav = StateNavigator(proof)
+
+    assert nav.resolve('accounts', 2 ** 255).last_trans_lt == 20
+    assert nav.resolve('accounts', 3) is None
+    assert [i.seq_no for i in nav.resolve('custom', 'shard_hashes', 0)] == [1, 2]
+    assert nav.resolve('custom', 'shard_hashes', 1) is None
+    assert nav.resolve('custom', 'config', 34).begin_parse().load_uint(32) == 34
+    assert nav.resolve('custom', 'config', 1) is None
+
+
+def test_pruned_lookup():
+    state = make_state()
+    accounts_root = state[1][0]
+    pruned_subtree = accounts_root[1]  # keys with the highest bit set
+    nav = StateNavigator(replace(state, [1, 0, 1], prune(pruned_subtree)))
+
+    assert nav.get_account(1).last_trans_lt == 10  # other side is still available
+
+    with pytest.raises(PrunedBranchError) as e:
+        nav.get_account(2 ** 255 + 1)
+    assert e.value.hash == pruned_subtree.hash
+    assert e.value.path == ('accounts', 2 ** 255 + 1)
+    assert e.value.key_prefix == '1'
+
+    bin_tree = state[3][0][0]
+    nav = StateNavigator(replace(state, [3, 0, 0, 1], prune(bin_tree[1])))
+    with pytest.raises(PrunedBranchError) as e:
+        nav.get_shard_descrs(0)
+    assert e.value.hash == bin_tree[1].hash
+    assert e.value.key_prefix == '1'
+    assert nav.get_config_param(0) is not None
+
+
+def test_pruned_account_kept():
+    state = make_state()
+    leaf = state[1][0][1][1]
+    nav = StateNavigator(replace(state, [1, 0, 1, 1, 0], prune(leaf[0])))
+    shard_account = nav.get_account(2 ** 255 + 1)
+    assert shard_account.account is None
+    assert shard_account.cell[0].get_hash(0) == leaf[0].hash
@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+from pytoniq_core.boc import Builder, Cell, HashMap, Address
+from pytoniq_core.proof.merkle_update import prune
+from pytoniq_core.tlb import ShardTopology, ShardIdent, ShardError
+from pytoniq_core.tlb.utils import deserialize_shard_hashes
+
+
+def shard_descr(seq_no: int) -> Cell:
+    return Builder() \
+        .store_uint(0xb, 4).store_uint(seq_no, 32).store_uint(0, 32) \
+        .store_uint(0, 64).store_uint(0, 64).store_bytes(bytes(32)).store_bytes(bytes(32)) \
+        .store_uint(0, 8).store_uint(0, 32).store_uint(0, 64).store_uint(0, 32).store_uint(0, 32) \
+        .store_bit_int(0) \
+        .store_coins(0).store_bit_int(0).store_coins(0).store_bit_int(0) \
+        .end_cell()
+
+
+def bin_tree(prefixes: list, prefix: str = '') -> Cell:
+    """
+    :param prefixes: shard prefixes as bit strings
+    """
+    if prefix in prefixes:
+        return Builder().store_bit_int(0).store_cell(shard_descr(len(prefix))).end_cell()
+    return Builder().store_bit_int(1).store_ref(bin_tree(prefixes, prefix + '0')).store_ref(bin_tree(prefixes, prefix + '1')).end_cell()
+
+
+def shard_hashes(trees: dict) -> Cell:
+    return HashMap(32, map_={wc & 0xffffffff: Builder().store_ref(tree).end_cell() for wc, tree in trees.items()}).serialize()
+
+
+def naive_shard(prefixes: list, account_id: int) -> int:
+    bits = format(account_id, '0256b')
+    prefix = next(p for p in prefixes if bits.startswith(p))
+    return ShardIdent(len(prefix), 0, int(prefix, 2) << (64 - len(prefix)) if prefix else 0).calculate_shard()
+
+
+def test_shard_topology():
+    random.seed(3)
+    prefixes = ['00', '010', '011', '10', '110', '1110', '1111']
+    cell = shard_hashes({0: bin_tree(prefixes), 7: bin_tree([''])})
+    topology = ShardTopology.from_cell(cell)
+    assert sorted(topology.workchains) == [0, 7]
+    assert topology.shards(7) == [1 << 63]
+    assert topology.shards(-1) == [1 << 63]
+    assert [format(i >> (64 - len(p)), f'0{len(p)}b') for i, p in zip(topology.shards(0), prefixes)] == prefixes
+
+    decoded = deserialize_shard_hashes(Builder().store_maybe_ref(cell).end_cell().begin_parse())
+    assert [topology.descr(0, i).seq_no for i in topology.shards(0)] == [i.seq_no for i in decoded[0].list]
+
+    ids = [random.getrandbits(256) for _ in range(1000)]
+    expected = [naive_shard(prefixes, i) for i in ids]
+    assert topology.route(ids) == expected
+    assert topology.shard_of(ids[0]) == expected[0]
+
+    ShardTopology.max_table_bits, old = 2, ShardTopology.max_table_bits  # ranges instead of the table
+    try:
+        deep = ShardTopology({0: [(int(p, 2), len(p), None) for p in prefixes]})
+    finally:
+        ShardTopology.max_table_bits = old
+    assert deep.route(ids) == expected
+
+    addresses = [Address((0, i.to_bytes(32, 'big'))) for i in ids[:10]] + [Address((-1, bytes(32)))]
+    assert topology.route_addresses(addresses) == [(0, i) for i in expected[:10]] + [(-1, 1 << 63)]
+
+
+def test_pruned_shard_topology():
+    prefixes = ['0', '10', '11']
+    tree = Builder().store_bit_int(1).store_ref(bin_tree(prefixes, '0')).store_ref(prune(bin_tree(prefixes, '1'))).end_cell()
+    topology = ShardTopology.from_cell(shard_hashes({0: tree}))
+    assert topology.shards(0) == [1 << 62]  # only the known shard
+    assert topology.route([1, 2 ** 255 - 1]) == [1 << 62, 1 << 62]
+    with pytest.raises(ShardError):
+        topology.route([1, 2 ** 255])
+    with pytest.raises(ShardError):
+        topology.route_addresses([Address((0, b'\xff' * 32))])
+    with pytest.raises(ShardError):
+        topology.descr(0, 3 << 62)
+
+    with pytest.raises(ShardError):
+        ShardTopology.from_cell(prune(shard_hashes({0: tree})))
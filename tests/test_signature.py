@@ -0,0 +1,45 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from nacl.signing import SigningKey
+
+from pytoniq_core.crypto.signature import Signer, sign_message, verify_sign, verify_many, get_verify_key
+from pytoniq_core.crypto.ciphers import Client, get_signature
+
+
+def test_signer():
+    seed = bytes(range(32))
+    key = SigningKey(seed)
+    messages = [i.to_bytes(4, 'big') * 8 for i in range(300)]
+    expected = [key.sign(m).signature for m in messages]
+
+    signer = Signer(seed)
+    assert signer.public_key == key.verify_key.encode()
+    assert signer.sign(messages[0]) == expected[0]
+    assert Signer(seed + signer.public_key).sign(messages[1]) == expected[1]
+    assert signer.sign_many(messages) == expected
+    with ThreadPoolExecutor(2) as pool:
+        assert signer.sign_many(messages, executor=pool) == expected
+
+    assert sign_message(messages[0], seed + signer.public_key) == expected[0]
+    assert get_signature(key, messages[0]) == expected[0]
+    assert Client(seed).sign(messages[0]) == expected[0]
+    assert verify_sign(signer.public_key, messages[0], expected[0])
+
+
+def test_verify_many():
+    signers = [Signer(bytes([i]) * 32) for i in range(4)]
+    items = []
+    for i in range(200):
+        signer = signers[i % 4]
+        message = i.to_bytes(2, 'big') * 16
+        items.append((signer.public_key, message, signer.sign(message)))
+    items[7] = (items[7][0], b'other', items[7][2])
+    items[8] = (items[8][0], items[8][1], items[8][2][:63])
+    items[9] = (items[9][0][:31], items[9][1], items[9][2])
+    expected = [i not in (7, 8, 9) for i in range(200)]
+
+    assert verify_many(items) == expected
+    with ThreadPoolExecutor(2) as pool:
+        assert verify_many(items, executor=pool) == expected
+    assert [verify_sign(*i) for i in items[:8]] == expected[:8]
+    assert get_verify_key.cache_info().hits > 0
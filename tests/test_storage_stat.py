@@ -0,0 +1,42 @@
+from pytoniq_core.boc import Builder, CellStorageStat, compute_storage_stat
+
+
+def test_storage_stat():
+    shared = Builder().store_uint(1, 32).end_cell()
+    msg = Builder().store_uint(0, 8).store_ref(shared).store_ref(Builder().store_ref(shared).end_cell()).end_cell()
+
+    stat = compute_storage_stat(msg)
+    assert (stat.cells, stat.bits) == (3, 40)
+    stat = compute_storage_stat(msg, skip_root=True)
+    assert (stat.cells, stat.bits) == (2, 32)
+
+    assert compute_storage_stat(msg, limit=3).limit_exceeded is False
+    assert compute_storage_stat(msg, limit=2).limit_exceeded is True
+    assert compute_storage_stat(msg, bits_limit=39).limit_exceeded is True
+
+
+def test_storage_stat_update():
+    leaves = [Builder().store_uint(i, 16).end_cell() for i in range(4)]
+    left = Builder().store_ref(leaves[0]).store_ref(leaves[1]).end_cell()
+    right = Builder().store_ref(leaves[2]).store_ref(leaves[3]).end_cell()
+    root = Builder().store_ref(left).store_ref(right).end_cell()
+
+    stat = CellStorageStat()
+    stat.add(root)
+    assert (stat.cells, stat.bits) == (7, 64)
+
+    new_right = Builder().store_ref(leaves[2]).store_ref(leaves[0]).end_cell()  # leaves[0] is shared now
+    new_root = Builder().store_ref(left).store_ref(new_right).end_cell()
+    stat.replace(root, new_root)
+    expected = compute_storage_stat(new_root)
+    assert (stat.cells, stat.bits) == (expected.cells, expected.bits) == (6, 48)
+    assert leaves[3] not in stat and leaves[0] in stat
+
+    # limit applies to the new tree only, failed replace leaves the stat unchanged
+    stat = CellStorageStat(limit=6)
+    stat.add(Builder().store_ref(left).end_cell())
+    assert stat.replace(Builder().store_ref(left).end_cell(), new_root)  # 6 cells fit
+    bigger = Builder().store_ref(left).store_ref(right).store_uint(1, 1).end_cell()  # 7 cells
+    assert not stat.replace(new_root, bigger)
+    assert (stat.cells, stat.bits) == (6, 48) and new_root in stat and bigger not in stat
+    assert stat.replace(new_root, root) is False and not stat.limit_exceeded
@@ -1,4 +1,6 @@
-from pytoniq_core.tl import TlGenerator
+import threading
+
+from pytoniq_core.tl import TlGenerator, TlClassGenerator
 
 
 def get_schemas(auto_deser: bool = True):
@@ -74,3 +76,112 @@ def test_adnl_ser():
     assert len_ == len(ser)
 
     assert deser['@type'] == 'overlay.broadcast'
+
+
+def test_base_type_fields():
+    schemas = get_schemas()
+
+    data = {'mode': 0, 'id': {'workchain': -1, 'shard': -2 ** 63, 'seqno': 5, 'root_hash': 'aa' * 32, 'file_hash': 'bb' * 32},
+            'param_list': [1, 2, 34]}
+    ser = schemas.serialize('liteServer.getConfigParams', data)
+    deser, len_ = schemas.deserialize(ser)
+    assert len_ == len(ser)
+    assert deser['param_list'] == [1, 2, 34]
+
+    ser = schemas.serialize('liteServer.error', {'code': 5, 'message': 'hello'})
+    assert schemas.deserialize(ser) == ({'@type': 'liteServer.error', 'code': 5, 'message': 'hello'}, len(ser))
+
+
+def test_zero_copy_deser():
+    schemas = get_schemas(auto_deser=False)
+    data = {'id': {'workchain': -1, 'shard': -2 ** 63, 'seqno': 5, 'root_hash': 'aa' * 32, 'file_hash': 'bb' * 32},
+            'data': b'\x01' * 300}
+    ser = schemas.serialize('liteServer.blockData', data)
+
+    deser, _ = schemas.deserialize(ser)
+    assert type(deser['data']) is bytes and deser['data'] == b'\x01' * 300
+
+    deser, len_ = schemas.deserialize(ser, zero_copy=True)
+    assert len_ == len(ser)
+    assert isinstance(deser['data'], memoryview) and deser['data'].obj is ser
+    assert deser['data'] == b'\x01' * 300
+
+
+def test_schemas_cache(tmp_path, monkeypatch):
+    TlGenerator._memory_cache.clear()
+    parsed = TlGenerator.with_default_schemas(cache_dir=str(tmp_path)).generate()
+    assert len(list(tmp_path.iterdir())) == 1
+
+    TlGenerator._memory_cache.clear()
+    cached = TlGenerator.with_default_schemas(cache_dir=str(tmp_path)).generate()
+    assert [(i.id, i.name, i.class_name, i.args) for i in cached.list] == \
+           [(i.id, i.name, i.class_name, i.args) for i in parsed.list]
+    assert len(cached.get_by_class_name('liteServer.BlockHeader')) == len(parsed.get_by_class_name('liteServer.BlockHeader'))
+
+    # tampered cache file is a cache miss
+    cache_file = next(tmp_path.iterdir())
+    cache_file.write_text('[["zz", 1, null, []]]')
+    TlGenerator._memory_cache.clear()
+    reparsed = TlGenerator.with_default_schemas(cache_dir=str(tmp_path)).generate()
+    assert [(i.id, i.name) for i in reparsed.list] == [(i.id, i.name) for i in parsed.list]
+
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    assert TlGenerator.user_cache_dir() == str(tmp_path / 'pytoniq_core' / 'tl')
+
+
+def test_typed_classes():
+    schemas = get_schemas(auto_deser=False)
+    classes = TlClassGenerator(schemas).build(['liteServer.blockTransactions', 'liteServer.getConfigParams'])
+    assert set(classes.BY_NAME) == {'liteServer.blockTransactions', 'liteServer.transactionId', 'tonNode.blockIdExt',
+                                    'liteServer.getConfigParams'}
+
+    block_id = {'workchain': -1, 'shard': -2 ** 63, 'seqno': 5, 'root_hash': 'aa' * 32, 'file_hash': 'bb' * 32}
+    tx = {'mode': 7, 'account': '11' * 32, 'lt': 1, 'hash': '22' * 32}
+    data = {'id': block_id, 'req_count': 2, 'incomplete': True, 'ids': [tx, {'mode': 1, 'account': '33' * 32}], 'proof': b'\x01' * 300}
+    ser = schemas.serialize('liteServer.blockTransactions', data)
+
+    obj, len_ = classes.deserialize(ser)
+    assert len_ == len(ser)
+    assert obj.id.seqno == 5 and obj.id.root_hash == b'\xaa' * 32
+    assert obj.incomplete is True and obj.proof == b'\x01' * 300
+    assert obj.ids[0].lt == 1 and obj.ids[1].lt is None  # flag bit is not set
+    assert obj.serialize() == ser
+    assert obj.to_dict()['id'] == schemas.deserialize(ser)[0]['id']
+
+    obj = classes.liteServer_getConfigParams(mode=0, id=obj.id, param_list=[1, 2, 34])
+    assert obj.serialize() == schemas.serialize('liteServer.getConfigParams', {'mode': 0, 'id': block_id, 'param_list': [1, 2, 34]})
+
+
+def test_trace():
+    schemas = get_schemas(auto_deser=False)
+    block_id = {'workchain': -1, 'shard': -2 ** 63, 'seqno': 5, 'root_hash': 'aa' * 32, 'file_hash': 'bb' * 32}
+    data = {'mode': 0, 'id': block_id, 'param_list': [1, 2, 34]}
+    ser = schemas.serialize('liteServer.getConfigParams', data)
+    expected = schemas.deserialize(ser)
+
+    events = []
+    schemas.set_trace(events.append)
+    assert schemas.serialize('liteServer.getConfigParams', data) == ser
+    assert schemas.deserialize(ser) == expected
+    assert [(e.op, e.schema, e.size, e.depth) for e in events] == [
+        ('serialize', 'tonNode.blockIdExt', 80, 1),
+        ('serialize', 'liteServer.getConfigParams', len(ser), 0),
+        ('deserialize', 'tonNode.blockIdExt', 80, 1),
+        ('deserialize', 'liteServer.getConfigParams', len(ser), 0),
+    ]
+    assert all(e.seconds >= 0 for e in events)
+
+    events.clear()
+    threads = [threading.Thread(target=lambda: [schemas.deserialize(ser) for _ in range(200)]) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(events) == 4 * 200 * 2
+    assert {(e.schema, e.depth) for e in events} == {('tonNode.blockIdExt', 1), ('liteServer.getConfigParams', 0)}
+
+    schemas.set_trace(None)
+    assert '_deserialize_fields' not in schemas.__dict__ and '_serialize_schema' not in schemas.__dict__
+    events.clear()
+    schemas.deserialize(ser)
+    assert not events
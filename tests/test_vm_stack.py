@@ -0,0 +1,30 @@
+from pytoniq_core.boc import Builder
+from pytoniq_core.tlb.vm_stack import VmStack, VmTuple
+
+
+def test_vm_stack_round_trip():
+    cell = Builder().store_uint(5, 10).end_cell()
+    tuple_ = VmTuple([1, VmTuple([2 ** 100, VmTuple([None, cell])]), VmTuple([])])
+    stack = [1, -5, None, cell, tuple_]
+
+    result = VmStack.deserialize(VmStack.serialize(stack).begin_parse())
+    assert len(tuple_) == 3  # serialization does not consume the values
+    assert result[:4] == [1, -5, None, cell]
+    assert result[4][0] == 1 and result[4][1][0] == 2 ** 100 and result[4][1][1][1] == cell
+    assert len(result[4][2]) == 0
+
+
+def test_vm_stack_deep():
+    stack = [VmTuple(list(range(i % 20))) for i in range(255)]
+    result = VmStack.deserialize(VmStack.serialize(stack).begin_parse())
+    assert [i.list for i in result] == [i.list for i in stack]
+
+    lisp_list = VmTuple([0])
+    for i in range(1, 1000):
+        lisp_list = VmTuple([i, lisp_list])
+    item = VmStack.deserialize(VmStack.serialize([lisp_list]).begin_parse())[0]
+    count = 1
+    while len(item) == 2:
+        item = item[1]
+        count += 1
+    assert count == 1000